@@ -2,33 +2,246 @@
 
 from enum import Enum, auto
 import math
+import time
+from config import AI_DECISION_BUDGET, GOAL_ARC_RADIUS_M
+from physics import compute_target_for_player
+from features import compute_features, goal_centers, lane_pressure
+from passing import best_pass
+
 
 class ActionType(Enum):
     SCORE_GOAL = auto()
-    DEFEND     = auto()
-    FORMATION  = auto()
+    DEFEND = auto()
+    FORMATION = auto()
+    PASS = auto()
+    DRIBBLE = auto()
+    MARK = auto()
+    COVER_GOAL = auto()
+    BLOCK_LANE = auto()
+
 
 class Action:
-    def __init__(self, type: ActionType, target=None):
-        self.type   = type
-        self.target = target  # e.g. a (x,y) tuple for DEFEND
+    def __init__(self, type: ActionType, target=None, utility=0.0, dive=None, receiver=None):
+        self.type = type
+        self.target = target      # (x,y) to swim toward; the receiver's position for PASS
+        self.utility = utility    # score that won the decision
+        self.dive = dive          # True = dive, False = surface, None = leave it to physiology
+        self.receiver = receiver  # unique_id of the teammate for PASS
+
+
+# --------------------
+# Utility weights
+# --------------------
+FORMATION_UTILITY = 0.35   # baseline every other action has to beat
+FORMATION_WITH_PUCK = 0.5  # holding shape matters more when we're attacking
+
+
+def _clamp_to_pool(snap, x, y):
+    r = snap.config.player_radius
+    x = max(snap.pool_left + r, min(snap.pool_right - r, x))
+    y = max(snap.pool_top + r, min(snap.pool_bottom - r, y))
+    return x, y
+
+
+def score_actions(player, snap, table):
+    """
+    Utility of every action open to `player` this tick, highest first.
+    Returns a list of (utility, ActionType, receiver-or-None).
+    """
+    pool_len = snap.pool_bottom - snap.pool_top
+    scale = snap.config.scale
+    scores = []
+
+    # 1) Each team's chaser always goes for the puck
+    if player is snap.chaser or player is snap.blue_chaser:
+        return [(1.0, ActionType.DEFEND, None)]
+
+    # 2) With the puck: shoot, carry it, or move it on
+    if snap.possessing_player is player:
+        pressure = lane_pressure(table, player)
+        closeness = 1.0 - table.get(player, "dist_opp_goal") / pool_len
+        scores.append((0.5 + 0.5 * closeness - 0.4 * pressure, ActionType.SCORE_GOAL, None))
+        scores.append((0.4 + 0.5 * pressure * (1.0 - 0.5 * closeness), ActionType.DRIBBLE, None))
+        option = best_pass(player, snap, table)
+        if option is not None and option.score > 0:
+            receiver = table.players[table.row[option.receiver_id]]
+            scores.append((0.3 + 0.6 * pressure * option.score, ActionType.PASS, receiver))
+
+    # 3) Without it: hold shape, or defend against the possessor
+    else:
+        base = FORMATION_WITH_PUCK if table.get(player, "team_has_puck") else FORMATION_UTILITY
+        scores.append((base, ActionType.FORMATION, None))
+
+        if table.get(player, "opp_has_puck"):
+            carrier = snap.possessing_player
+            threat = 1.0 - table.get(carrier, "dist_opp_goal") / pool_len
+            mark_d = table.get(player, "nearest_opp_dist")
+            to_carrier = table.distance(player, carrier)
+            scores.append((0.3 + 0.4 * max(0.0, 1.0 - mark_d / (6 * scale)),
+                           ActionType.MARK, None))
+            scores.append((0.2 + 0.6 * threat * (1.0 - table.get(player, "depth_norm") * 0.3)
+                           * (1.0 if table.get(player, "goal_side") else 0.3),
+                           ActionType.COVER_GOAL, None))
+            scores.append((0.3 + 0.4 * max(0.0, 1.0 - to_carrier / (8 * scale))
+                           * table.get(player, "goal_side"),
+                           ActionType.BLOCK_LANE, None))
+
+    scores.sort(key=lambda s: s[0], reverse=True)
+    return scores
+
+
+def decide_dive(player, table) -> bool:
+    """DIVE vs SURFACE: go down near the puck while breath lasts, come up when it runs low."""
+    breath = table.get(player, "breath_frac")
+    closeness = max(0.0, 1.0 - table.get(player, "dist_puck") / table.config.ai_dive_range)
+    u_dive = closeness * min(1.0, breath * 2) + 0.3 * table.get(player, "has_puck")
+    u_surface = (1.0 - breath) * 0.8
+    return u_dive > u_surface
+
+
+def _dribble_target(player, snap, table, agx, agy):
+    """Head for goal, bent away from the nearest opponent."""
+    gx, gy = agx - player.x, agy - player.y
+    g = math.hypot(gx, gy) or 1.0
+    dx, dy = gx / g, gy / g
+    opp = table.nearest_opp[table.row[player.unique_id]]
+    if opp is not None:
+        ax, ay = player.x - opp.x, player.y - opp.y
+        a = math.hypot(ax, ay) or 1.0
+        dx += 0.8 * ax / a
+        dy += 0.8 * ay / a
+    scale = snap.config.scale
+    return _clamp_to_pool(snap, player.x + dx * 2 * scale, player.y + dy * 2 * scale)
+
+
+def _target_for(action_type, player, snap, table, receiver=None):
+    """Where `player` should swim to carry out `action_type`."""
+    (ogx, ogy), (agx, agy) = goal_centers(snap, player.color)
+    scale = snap.config.scale
 
-def decide_action(player, game):
+    if action_type == ActionType.SCORE_GOAL:
+        goal_y = agy + snap.puck_radius if agy == snap.pool_top else agy - snap.puck_radius
+        return agx, goal_y
+
+    if action_type == ActionType.DEFEND:
+        return snap.puck_x, snap.puck_y
+
+    if action_type == ActionType.PASS:
+        return receiver.x, receiver.y
+
+    if action_type == ActionType.DRIBBLE:
+        return _dribble_target(player, snap, table, agx, agy)
+
+    if action_type == ActionType.MARK:
+        # goal-side of the nearest opponent
+        opp = table.nearest_opp[table.row[player.unique_id]]
+        vx, vy = ogx - opp.x, ogy - opp.y
+        v = math.hypot(vx, vy) or 1.0
+        r = snap.config.player_radius
+        return _clamp_to_pool(snap, opp.x + vx / v * 1.5 * r, opp.y + vy / v * 1.5 * r)
+
+    if action_type == ActionType.COVER_GOAL:
+        # on the line from our goal to the puck, just outside the goal arc
+        vx, vy = snap.puck_x - ogx, snap.puck_y - ogy
+        v = math.hypot(vx, vy) or 1.0
+        r = min(v, GOAL_ARC_RADIUS_M * scale)
+        return _clamp_to_pool(snap, ogx + vx / v * r, ogy + vy / v * r)
+
+    if action_type == ActionType.BLOCK_LANE:
+        # between the carrier and their closest teammate
+        carrier = snap.possessing_player
+        mate = table.nearest_mate[table.row[carrier.unique_id]]
+        if mate is None:
+            return carrier.x, carrier.y
+        return _clamp_to_pool(snap, (carrier.x + mate.x) / 2, (carrier.y + mate.y) / 2)
+
+    # FORMATION: fall back into the JSON-driven formation
+    if player.color == "green":
+        form_name = snap.green_form
+        formation = snap.free_green.get(form_name, {})
+        anchor_x, anchor_y = snap.ref_x, snap.ref_y
+    else:
+        form_name = snap.blue_form
+        formation = snap.free_blue.get(form_name, {})
+        anchor_x, anchor_y = snap.puck_x, snap.puck_y
+
+    return compute_target_for_player(
+        player,
+        form_name,
+        formation,
+        anchor_x, anchor_y,
+        snap.pool_left, snap.pool_right,
+        snap.pool_top, snap.pool_bottom,
+        scale
+    )
+
+
+def action_for(kind, player, snap, table, receiver=None, utility=0.0):
+    """An Action of type `kind` for `player`, with its target and dive choice."""
+    return Action(
+        kind,
+        target=_target_for(kind, player, snap, table, receiver),
+        utility=utility,
+        dive=decide_dive(player, table),
+        receiver=receiver.unique_id if receiver is not None else None,
+    )
+
+
+def decide_action(player, snap, table=None):
+    """
+    Score every action for `player` from this tick's feature table and
+    return the winner as an Action with a concrete target and dive choice.
+    """
+    if table is None:
+        table = compute_features(snap)
+    utility, kind, receiver = score_actions(player, snap, table)[0]
+    return action_for(kind, player, snap, table, receiver, utility)
+
+
+def candidate_actions(player, snap, table=None):
     """
-    - If this player has the puck → SCORE_GOAL
-    - Elif this player is the designated chaser → DEFEND toward the puck
-    - Else → FORMATION (fall back to your formation logic)
+    Every Action open to `player` this tick, best first (the first is what
+    decide_action picks). Going for the puck is always among them.
     """
-    # 1) Possessor should go score
-    if game.possessing_player is player:
-        return Action(ActionType.SCORE_GOAL)
+    if table is None:
+        table = compute_features(snap)
+    scores = score_actions(player, snap, table)
+    if snap.possessing_player is not player and all(k != ActionType.DEFEND for _, k, _ in scores):
+        scores.append((0.0, ActionType.DEFEND, None))
+    return [action_for(kind, player, snap, table, receiver, utility)
+            for utility, kind, receiver in scores]
 
-    # 2) Only the one chaser should chase
-    if game.chaser is player:
-        x1, y1, x2, y2 = game.canvas.coords(game.puck)
-        puck_x = (x1 + x2) / 2
-        puck_y = (y1 + y2) / 2
-        return Action(ActionType.DEFEND, target=(puck_x, puck_y))
 
-    # 3) Everyone else just slots back into formation
-    return Action(ActionType.FORMATION)
+def plan_actions(snap, budget: float = AI_DECISION_BUDGET, table=None):
+    """
+    Decide an Action for every AI player from one shared feature table
+    (`table`, built from `snap` if not given).
+
+    Players nearest the puck decide first. Once `budget` seconds are used
+    up, the rest skip utility scoring and simply hold formation, so the
+    cost per tick stays bounded however many players there are. A budget
+    of None never cuts anyone short, so the plan depends only on `snap`.
+
+    `snap` is a planner.SimSnapshot (or anything with the same fields),
+    so this can run off the main thread. Returns unique_id → Action.
+    """
+    deadline = time.perf_counter() + budget if budget is not None else math.inf
+    if table is None:
+        table = compute_features(snap)
+    dist_puck = table.columns["dist_puck"]
+    order = sorted(snap.players, key=lambda p: dist_puck[table.row[p.unique_id]])
+
+    plan = {}
+    for player in order:
+        if player.unique_id in snap.humans:
+            continue
+        if (time.perf_counter() < deadline
+                or player is snap.chaser or player is snap.blue_chaser):
+            plan[player.unique_id] = decide_action(player, snap, table)
+        else:
+            plan[player.unique_id] = Action(
+                ActionType.FORMATION,
+                target=_target_for(ActionType.FORMATION, player, snap, table),
+                dive=decide_dive(player, table),
+            )
+    return plan
@@ -0,0 +1,232 @@
+# analytics.py
+#
+# Aggregates over telemetry recorded by telemetry.ColumnarSink. Each match
+# is a directory of column files; they are memory-mapped and walked one
+# match at a time, so thousands of matches never have to fit in RAM.
+
+import argparse
+import array
+import json
+import mmap
+import os
+import sys
+from collections import defaultdict
+from itertools import compress
+
+from config import SCALE, POOL_WIDTH, POOL_HEIGHT, POOL_LEFT_PX, POOL_TOP_PX
+
+
+# --------------------
+# One match
+# --------------------
+class MatchTable:
+    """
+    Read-only view of one recorded match. column(name) returns a
+    memoryview over the mapped file, typed by the column's array typecode;
+    category columns hold codes into categories[name].
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "schema.json")) as f:
+            schema = json.load(f)
+        if schema["byteorder"] != sys.byteorder:
+            raise ValueError(f"{directory} was recorded on a {schema['byteorder']}-endian machine")
+        self.rows = schema["rows"]
+        self.types = {c["name"]: c["type"] for c in schema["columns"]}
+        self.categories = schema["categories"]
+        self._maps = {}
+        self._views = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, name: str) -> memoryview:
+        typecode = self.types[name]
+        if self.rows == 0:
+            return memoryview(array.array(typecode))
+        mm = self._maps.get(name)
+        if mm is None:
+            with open(os.path.join(self.directory, f"{name}.col"), "rb") as f:
+                mm = self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)[:self.rows * array.array(typecode).itemsize].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def code(self, name: str, value: str):
+        """Code of `value` in a category column, or None if it never occurs."""
+        try:
+            return self.categories[name].index(value)
+        except ValueError:
+            return None
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
+
+
+def match_dirs(root: str):
+    """Every recorded match under `root` (the root itself may be one)."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if "schema.json" in filenames:
+            yield dirpath
+
+
+def iter_matches(paths):
+    """Open each match in turn, closing it before the next one is mapped."""
+    for path in paths:
+        with MatchTable(path) as table:
+            yield table
+
+
+# --------------------
+# Aggregates
+# --------------------
+def possession_share(tables):
+    """
+    team → formation → fraction of that team's ticks in the formation
+    during which the team held the puck.
+    """
+    ticks = defaultdict(lambda: defaultdict(float))
+    held = defaultdict(lambda: defaultdict(int))
+    for t in tables:
+        team, form, has = t.column("team"), t.column("formation"), t.column("has_puck")
+        teams, forms = t.categories["team"], t.categories["formation"]
+        size = defaultdict(set)
+        for tc, uid in zip(team, t.column("uid")):
+            size[tc].add(uid)
+
+        rows = defaultdict(int)
+        for key in zip(team, form):
+            rows[key] += 1
+        for (tc, fc), n in rows.items():
+            ticks[teams[tc]][forms[fc]] += n / len(size[tc])
+        for tc, fc in compress(zip(team, form), has):
+            held[teams[tc]][forms[fc]] += 1
+
+    return {team: {f: held[team][f] / n for f, n in sorted(by_form.items()) if n}
+            for team, by_form in ticks.items()}
+
+
+def dive_lengths(tables):
+    """
+    Length in seconds of every completed dive: the current_dive_time
+    reached before it falls back. Returns team → list of lengths.
+    """
+    out = defaultdict(list)
+    for t in tables:
+        teams = t.categories["team"]
+        last = {}
+        for uid, tc, dive in zip(t.column("uid"), t.column("team"), t.column("current_dive_time")):
+            prev = last.get(uid, 0.0)
+            if dive < prev:
+                out[teams[tc]].append(prev)
+            last[uid] = dive
+    return dict(out)
+
+
+def average_dive_length(tables):
+    return {team: sum(v) / len(v) for team, v in dive_lengths(tables).items() if v}
+
+
+def stamina_at_goals(tables):
+    """
+    team → (mean short-term stamina, mean long-term stamina, samples) over
+    every player on every tick a goal went in.
+    """
+    acc = defaultdict(lambda: [0.0, 0.0, 0])
+    for t in tables:
+        goal = t.code("event", "goal")
+        if goal is None:
+            continue
+        teams = t.categories["team"]
+        mask = [e == goal for e in t.column("event")]
+        for tc, st, lt in compress(zip(t.column("team"), t.column("short_term_stamina"),
+                                       t.column("long_term_stamina")), mask):
+            a = acc[teams[tc]]
+            a[0] += st
+            a[1] += lt
+            a[2] += 1
+    return {team: (st / n, lt / n, n) for team, (st, lt, n) in acc.items()}
+
+
+class Heatmap:
+    """2D histogram of player positions over the pool, one bin per `bin_m` metres."""
+
+    def __init__(self, bin_m: float = 1.0):
+        self.bin_m = bin_m
+        self.cols = int(-(-POOL_WIDTH // bin_m))
+        self.rows = int(-(-POOL_HEIGHT // bin_m))
+        self.counts = array.array("q", bytes(8 * self.cols * self.rows))
+
+    def add(self, xs, ys):
+        """Count positions given in canvas px (out-of-pool points are clamped in)."""
+        cols, rows, counts = self.cols, self.rows, self.counts
+        k = 1.0 / (SCALE * self.bin_m)
+        for x, y in zip(xs, ys):
+            c = min(cols - 1, max(0, int((x - POOL_LEFT_PX) * k)))
+            r = min(rows - 1, max(0, int((y - POOL_TOP_PX) * k)))
+            counts[r * cols + c] += 1
+
+    def grid(self):
+        """Row-major list of rows, top of the pool first."""
+        return [list(self.counts[r * self.cols:(r + 1) * self.cols]) for r in range(self.rows)]
+
+
+def heatmap(tables, team=None, label=None, bin_m=1.0) -> Heatmap:
+    """Where players spent their ticks, optionally for one team and/or label."""
+    hm = Heatmap(bin_m)
+    for t in tables:
+        xs, ys = t.column("x"), t.column("y")
+        conds = []
+        for name, value in (("team", team), ("label", label)):
+            if value is not None:
+                code = t.code(name, value)
+                if code is None:
+                    break
+                conds.append((t.column(name), code))
+        else:
+            if conds:
+                mask = [all(col[i] == code for col, code in conds) for i in range(t.rows)]
+                xs, ys = list(compress(xs, mask)), list(compress(ys, mask))
+            hm.add(xs, ys)
+    return hm
+
+
+# --------------------
+# Command line
+# --------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarise recorded telemetry.")
+    ap.add_argument("root", help="a match directory, or a directory of them")
+    ap.add_argument("--team", help="heatmap for one team only")
+    ap.add_argument("--heatmap", metavar="CSV", help="write the position heatmap here")
+    ap.add_argument("--bin", type=float, default=1.0, help="heatmap bin size in metres")
+    args = ap.parse_args(argv)
+
+    paths = list(match_dirs(args.root))
+    print(f"{len(paths)} matches")
+    for team, shares in possession_share(iter_matches(paths)).items():
+        for form, share in shares.items():
+            print(f"possession  {team:5} {form:32} {share:6.1%}")
+    for team, avg in average_dive_length(iter_matches(paths)).items():
+        print(f"avg dive    {team:5} {avg:.2f} s")
+    for team, (st, lt, n) in stamina_at_goals(iter_matches(paths)).items():
+        print(f"at goals    {team:5} short-term {st:.1f} s, long-term {lt:.3f} ({n} samples)")
+    if args.heatmap:
+        hm = heatmap(iter_matches(paths), team=args.team, bin_m=args.bin)
+        with open(args.heatmap, "w") as f:
+            for row in hm.grid():
+                f.write(",".join(map(str, row)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# avoidance.py
+#
+# ORCA (optimal reciprocal collision avoidance) for players, after the
+# RVO2 library by van den Berg et al. Velocities are in px per frame.
+
+import math
+
+from config import COLLISION_DEPTH_THRESHOLD, SPRINT_SPEED, PLAYER_RADIUS
+
+AGENT_RADIUS = PLAYER_RADIUS * 0.75  # circle that roughly covers the triangle
+NEIGHBOUR_DIST = PLAYER_RADIUS * 5   # px: agents further apart are ignored
+TIME_HORIZON = 10.0                  # frames of look-ahead against other agents
+MAX_NEIGHBOURS = 8
+_EPS = 1e-5
+
+
+def _det(ax, ay, bx, by):
+    return ax * by - ay * bx
+
+
+def _linear_program1(lines, n, radius, opt, direction_opt):
+    """Best point on line `n` inside the speed circle and left of lines[:n]."""
+    (px, py), (dx, dy) = lines[n]
+    dot = px * dx + py * dy
+    disc = dot * dot + radius * radius - (px * px + py * py)
+    if disc < 0.0:
+        return None
+    sq = math.sqrt(disc)
+    t_left, t_right = -dot - sq, -dot + sq
+
+    for i in range(n):
+        (qx, qy), (ex, ey) = lines[i]
+        denom = _det(dx, dy, ex, ey)
+        numer = _det(ex, ey, px - qx, py - qy)
+        if abs(denom) <= _EPS:
+            if numer < 0.0:
+                return None
+            continue
+        t = numer / denom
+        if denom >= 0.0:
+            t_right = min(t_right, t)
+        else:
+            t_left = max(t_left, t)
+        if t_left > t_right:
+            return None
+
+    if direction_opt:
+        t = t_right if opt[0] * dx + opt[1] * dy > 0.0 else t_left
+    else:
+        t = dx * (opt[0] - px) + dy * (opt[1] - py)
+        t = max(t_left, min(t_right, t))
+    return px + t * dx, py + t * dy
+
+
+def _linear_program2(lines, radius, opt, direction_opt):
+    """Velocity closest to `opt` satisfying every line. Returns (fail index, velocity)."""
+    ox, oy = opt
+    if direction_opt:
+        result = (ox * radius, oy * radius)
+    elif ox * ox + oy * oy > radius * radius:
+        m = math.hypot(ox, oy)
+        result = (ox / m * radius, oy / m * radius)
+    else:
+        result = opt
+
+    for i, ((px, py), (dx, dy)) in enumerate(lines):
+        if _det(dx, dy, px - result[0], py - result[1]) > 0.0:
+            new = _linear_program1(lines, i, radius, opt, direction_opt)
+            if new is None:
+                return i, result
+            result = new
+    return len(lines), result
+
+
+def _linear_program3(lines, begin, radius, result):
+    """Infeasible case: minimise the worst penetration into the remaining lines."""
+    distance = 0.0
+    for i in range(begin, len(lines)):
+        (px, py), (dx, dy) = lines[i]
+        if _det(dx, dy, px - result[0], py - result[1]) <= distance:
+            continue
+        proj = []
+        for j in range(i):
+            (qx, qy), (ex, ey) = lines[j]
+            determinant = _det(dx, dy, ex, ey)
+            if abs(determinant) <= _EPS:
+                if dx * ex + dy * ey > 0.0:
+                    continue
+                point = (0.5 * (px + qx), 0.5 * (py + qy))
+            else:
+                t = _det(ex, ey, px - qx, py - qy) / determinant
+                point = (px + t * dx, py + t * dy)
+            ux, uy = ex - dx, ey - dy
+            m = math.hypot(ux, uy) or 1.0
+            proj.append((point, (ux / m, uy / m)))
+        fail, new = _linear_program2(proj, radius, (-dy, dx), True)
+        if fail >= len(proj):
+            result = new
+        distance = _det(dx, dy, px - result[0], py - result[1])
+    return result
+
+
+def _orca_lines(agent, neighbours, velocities, responsive):
+    """One half-plane per neighbour: the velocities that avoid it for TIME_HORIZON frames."""
+    inv_tau = 1.0 / TIME_HORIZON
+    vx, vy = velocities[agent.unique_id]
+    r = 2 * AGENT_RADIUS
+    lines = []
+    for other in neighbours:
+        ovx, ovy = velocities[other.unique_id]
+        rpx, rpy = other.x - agent.x, other.y - agent.y
+        rvx, rvy = vx - ovx, vy - ovy
+        dist_sq = rpx * rpx + rpy * rpy
+        r_sq = r * r
+
+        if dist_sq > r_sq:
+            # no overlap yet: cut-off circle or one of the cone's legs
+            wx, wy = rvx - inv_tau * rpx, rvy - inv_tau * rpy
+            w_sq = wx * wx + wy * wy
+            dot1 = wx * rpx + wy * rpy
+            if dot1 < 0.0 and dot1 * dot1 > r_sq * w_sq:
+                w_len = math.sqrt(w_sq)
+                ux_, uy_ = wx / w_len, wy / w_len
+                direction = (uy_, -ux_)
+                ux, uy = (r * inv_tau - w_len) * ux_, (r * inv_tau - w_len) * uy_
+            else:
+                leg = math.sqrt(dist_sq - r_sq)
+                if _det(rpx, rpy, wx, wy) > 0.0:
+                    direction = ((rpx * leg - rpy * r) / dist_sq,
+                                 (rpx * r + rpy * leg) / dist_sq)
+                else:
+                    direction = (-(rpx * leg + rpy * r) / dist_sq,
+                                 -(-rpx * r + rpy * leg) / dist_sq)
+                dot2 = rvx * direction[0] + rvy * direction[1]
+                ux, uy = dot2 * direction[0] - rvx, dot2 * direction[1] - rvy
+        else:
+            # already overlapping: get out within one frame
+            wx, wy = rvx - rpx, rvy - rpy
+            w_len = math.hypot(wx, wy) or _EPS
+            ux_, uy_ = wx / w_len, wy / w_len
+            direction = (uy_, -ux_)
+            ux, uy = (r - w_len) * ux_, (r - w_len) * uy_
+
+        # take half the avoidance if the other agent will do its half too
+        share = 0.5 if other.unique_id in responsive else 1.0
+        lines.append(((vx + share * ux, vy + share * uy), direction))
+    return lines
+
+
+def solve_velocities(players, preferred, index, max_speed=SPRINT_SPEED):
+    """
+    Collision-free velocities for every agent in `preferred`, in one pass.
+
+    - players: unique_id → Player (everyone, including non-AI obstacles)
+    - preferred: unique_id → (vx, vy) for the agents being steered
+    - index: a spatial.SpatialHash already rebuilt for this frame
+
+    Players outside `preferred` keep their current velocity and are avoided
+    fully; agents steered here share avoidance 50/50. Only neighbours within
+    COLLISION_DEPTH_THRESHOLD of each other's depth count.
+    Returns unique_id → (vx, vy).
+    """
+    velocities = {uid: (getattr(p, "vx", 0.0), getattr(p, "vy", 0.0))
+                  for uid, p in players.items()}
+    result = {}
+    for uid, pref in preferred.items():
+        agent = players[uid]
+        near = [o for o in index.neighbours(agent, NEIGHBOUR_DIST)
+                if abs(o.depth - agent.depth) < COLLISION_DEPTH_THRESHOLD]
+        near.sort(key=lambda o: (o.x - agent.x) ** 2 + (o.y - agent.y) ** 2)
+        lines = _orca_lines(agent, near[:MAX_NEIGHBOURS], velocities, preferred)
+        fail, v = _linear_program2(lines, max_speed, pref, False)
+        if fail < len(lines):
+            v = _linear_program3(lines, fail, max_speed, v)
+        result[uid] = v
+    return result
@@ -0,0 +1,298 @@
+# checkpoint.py
+#
+# Save a Simulation mid-match, restore it headless, and fork it N ways to
+# ask "what if" from that exact moment instead of replaying from kickoff.
+#
+#   python checkpoint.py save match.ckpt --seed 3 --at 40
+#   python checkpoint.py whatif match.ckpt --seconds 15 --green a.json b.json
+
+import argparse
+import importlib
+import os
+import pickle
+import random
+import sys
+
+from config import (
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+)
+from scheduler import EventScheduler
+
+VERSION = 5
+
+# Player attributes that belong to the window, not the game
+_CANVAS_ATTRS = ("canvas", "polygon", "text", "_drawn", "_drawn_color")
+
+# Simulation attributes copied as they are
+_SIM_ATTRS = ("tick", "puck_x", "puck_y", "scoreboard", "last_call",
+              "pass_frozen", "pass_cooldown", "tackle_locked", "game_paused",
+              "green_form", "blue_form", "actions", "free_green", "free_blue")
+
+# ... and those that point at a player, saved as its unique_id
+_SIM_PLAYERS = ("possessing_player", "chaser", "blue_chaser")
+
+# Handles the sim keeps on its own pending events, so it can cancel them
+_EVENT_HANDLES = ("_pass_anim_event", "_freeze_event", "_cooldown_event", "_tackle_event",
+                  "_period_event", "_timeout_event", "_goal_event", "_restart_event")
+
+
+# --------------------
+# Capture
+# --------------------
+def _uid(p):
+    return p.unique_id if p is not None else None
+
+
+def _event_ref(sim, event):
+    """(target, args) naming an event's callback so it can be looked up again."""
+    cb = event.callback
+    if getattr(cb, "__self__", None) is sim:
+        target = ("sim", cb.__name__)
+    else:
+        target = (cb.__module__, cb.__qualname__)
+    args = tuple(("player", a.unique_id)
+                 if a is sim.players.get(getattr(a, "unique_id", None)) else a
+                 for a in event.args)
+    return target, args
+
+
+def capture(sim) -> dict:
+    """
+    Everything needed to carry on `sim` from this tick, as plain data:
+    every player attribute (position, physiology, AI intent), the puck,
+    possession, flags, the scoreboard, the rule engine, pending scheduler
+    events and both RNG states.
+    """
+    state = {name: getattr(sim, name) for name in _SIM_ATTRS}
+    state.update({name: _uid(getattr(sim, name)) for name in _SIM_PLAYERS})
+    state.update(
+        version=VERSION,
+        config=sim.config,
+        now=sim.scheduler.now,
+        controlled={team: _uid(p) for team, p in sim.controlled.items()},
+        keys={team: set(k) for team, k in sim.keys.items()},
+        pass_hold=dict(sim.pass_hold),
+        players={uid: {k: v for k, v in vars(p).items() if k not in _CANVAS_ATTRS}
+                 for uid, p in sim.players.items()},
+        events=[(e.time, *_event_ref(sim, e)) for e in sim.scheduler.pending()],
+        handles={name: getattr(sim, name).seq for name in _EVENT_HANDLES
+                 if getattr(sim, name) is not None},
+        event_seqs=[e.seq for e in sim.scheduler.pending()],
+        rng=sim.rng.getstate(),
+        global_rng=random.getstate(),  # physiology draws from `random`
+        pass_lanes=dict(sim.pass_lanes),
+        rules=sim.rules.state(),
+    )
+    return pickle.loads(pickle.dumps(state))     # detach from the live sim
+
+
+def save(sim, path: str):
+    """Write a checkpoint of `sim` to `path` (atomically)."""
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(capture(sim), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+
+def load(path: str) -> dict:
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.get("version") != VERSION:
+        raise ValueError(f"{path}: checkpoint version {state.get('version')}, expected {VERSION}")
+    return state
+
+
+# --------------------
+# Restore
+# --------------------
+def restore(state: dict, planner=None, telemetry=None, global_rng=True):
+    """
+    A headless Simulation carrying on exactly where `state` was captured.
+    With `global_rng` the module-level `random` is put back too, so the
+    restored run repeats the original; pass False to keep the caller's.
+    """
+    from sim import Simulation
+    sim = Simulation(green_formations=state["free_green"], blue_formations=state["free_blue"],
+                     planner=planner, telemetry=telemetry, config=state["config"])
+
+    # 1) Players, then everything that refers to them
+    for uid, attrs in state["players"].items():
+        p = sim.players[uid]
+        for k, v in attrs.items():
+            setattr(p, k, v)
+    for name in _SIM_ATTRS:
+        setattr(sim, name, state[name])
+    for name in _SIM_PLAYERS:
+        setattr(sim, name, sim.players.get(state[name]))
+    sim.controlled = {team: sim.players.get(uid) for team, uid in state["controlled"].items()}
+    sim.keys = {team: set(k) for team, k in state["keys"].items()}
+    sim.pass_hold = dict(state["pass_hold"])
+    sim.rules.restore(state["rules"])
+
+    # 2) Pending events, re-queued in their original order
+    sim.scheduler = EventScheduler(state["now"])
+    by_seq = {}
+    for seq, (time, (owner, name), args) in zip(state["event_seqs"], state["events"]):
+        if owner == "sim":
+            callback = getattr(sim, name)
+        else:
+            callback = getattr(importlib.import_module(owner), name)
+        args = tuple(sim.players[a[1]] if isinstance(a, tuple) and a[:1] == ("player",) else a
+                     for a in args)
+        by_seq[seq] = sim.scheduler.schedule_at(time, callback, *args)
+    for name in _EVENT_HANDLES:
+        setattr(sim, name, by_seq.get(state["handles"].get(name)))
+
+    # 3) Randomness, and the AI's lane cache, which outlives a tick
+    sim.rng.setstate(state["rng"])
+    if global_rng:
+        random.setstate(state["global_rng"])
+    sim.pass_lanes.update(state["pass_lanes"])
+    return sim
+
+
+def clone(sim, planner=None):
+    """An independent headless copy of `sim`, in this process."""
+    return restore(capture(sim), planner=planner, global_rng=False)
+
+
+# --------------------
+# Fork
+# --------------------
+def _run_child(sim, fn, variant, w):
+    """In a forked child: detach from the window and threads, run, report."""
+    from planner import Planner
+    try:
+        sim.canvas = None
+        for p in sim.players.values():
+            p.canvas = None
+        sim.planner = Planner()
+        sim.telemetry = None
+        data = pickle.dumps((True, fn(sim, variant)))
+    except BaseException as e:
+        data = pickle.dumps((False, f"{type(e).__name__}: {e}"))
+    with os.fdopen(w, "wb") as f:
+        f.write(data)
+
+
+def fork_map(sim, fn, variants, workers=None) -> list:
+    """
+    [fn(copy_of_sim, v) for v in variants], each call in its own forked
+    process, at most `workers` at a time. A fork shares the parent's
+    memory copy-on-write, so starting one costs next to nothing however
+    far into the match `sim` is, and nothing the children do touches
+    `sim`. Results must be picklable.
+
+    Where os.fork is missing, each variant runs on a clone() in turn.
+    """
+    variants = list(variants)
+    if not hasattr(os, "fork"):
+        return [fn(clone(sim), v) for v in variants]
+
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(variants)
+    running = []                           # (index, pid, read fd)
+
+    def reap():
+        i, pid, r = running.pop(0)
+        with os.fdopen(r, "rb") as f:
+            data = f.read()
+        os.waitpid(pid, 0)
+        if not data:
+            raise RuntimeError(f"fork for variant {variants[i]!r} died without a result")
+        ok, value = pickle.loads(data)
+        if not ok:
+            raise RuntimeError(f"variant {variants[i]!r} failed: {value}")
+        results[i] = value
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for i, variant in enumerate(variants):
+        if len(running) >= workers:
+            reap()
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            try:
+                _run_child(sim, fn, variant, w)
+            finally:
+                os._exit(0)
+        os.close(w)
+        running.append((i, pid, r))
+    while running:
+        reap()
+    return results
+
+
+# --------------------
+# What if
+# --------------------
+def play_on(sim, seconds: float) -> dict:
+    """
+    Run `sim` on for `seconds` (or to full time, if sooner); who scored and
+    how long green held the puck.
+    """
+    dt = sim.config.dt
+    held = {"green": 0, "blue": 0}
+    before = dict(sim.scoreboard.goals)
+    for _ in range(int(seconds / dt)):
+        if sim.scoreboard.finished:
+            break
+        sim.advance(dt)
+        if sim.possessing_player is not None:
+            held[sim.possessing_player.color] += 1
+    goals = {team: n - before[team] for team, n in sim.scoreboard.goals.items()}
+    total = held["green"] + held["blue"]
+    return {"goals": goals, "green_possession": held["green"] / total if total else 0.0}
+
+
+def _try_formations(seconds):
+    def fn(sim, formations):
+        sim.free_green = load_formations(formations)
+        return play_on(sim, seconds)
+    return fn
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Checkpoint a match and replay it N ways.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sv = sub.add_parser("save", help="play a headless match and checkpoint it")
+    sv.add_argument("path")
+    sv.add_argument("--seed", type=int, default=None)
+    sv.add_argument("--at", type=float, default=30.0, help="seconds into the match")
+    sv.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    sv.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+
+    wi = sub.add_parser("whatif", help="play on from a checkpoint with each green formation")
+    wi.add_argument("path")
+    wi.add_argument("--green", nargs="+", required=True, metavar="JSON")
+    wi.add_argument("--seconds", type=float, default=15.0)
+    wi.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "save":
+        from sim import Simulation
+        if args.seed is not None:
+            random.seed(args.seed)
+        sim = Simulation(green_formations=load_formations(args.green),
+                         blue_formations=load_formations(args.blue), seed=args.seed)
+        try:
+            sim.run_until(args.at)
+            save(sim, args.path)
+        finally:
+            sim.planner.close()
+        print(f"saved tick {sim.tick} ({sim.scoreboard.text(sim.time)})", file=sys.stderr)
+        return
+
+    sim = restore(load(args.path))
+    results = fork_map(sim, _try_formations(args.seconds), args.green, args.workers)
+    for path, r in zip(args.green, results):
+        g = r["goals"]
+        print(f"{path}: green {g['green']} – blue {g['blue']}, "
+              f"green possession {r['green_possession']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
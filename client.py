@@ -0,0 +1,289 @@
+# client.py
+#
+# Match client for server.py. Sends its key state every tick, keeps the
+# snapshots it receives as delta bases, and predicts its own player
+# locally so steering feels immediate; each snapshot then reconciles the
+# prediction with the server's authoritative position.
+#
+#   python client.py --role blue --gui       # play blue in a window
+#   python client.py --role spectator        # headless, prints stats
+#   python client.py --role green --bot      # scripted input, for testing
+
+import argparse
+import asyncio
+import random
+import threading
+from collections import OrderedDict, deque
+
+from config import (
+    DEFAULT_CONFIG,
+    UPDATE_INTERVAL,
+    PUCK_RADIUS_PX,
+    POOL_LEFT_PX, POOL_RIGHT_PX,
+    POOL_TOP_PX, POOL_BOTTOM_PX,
+)
+import physics
+import snapcodec
+from server import ROLES, SNAPSHOT_HISTORY, _HELLO, _WELCOME, _INPUT, \
+    keys_to_mask, read_message, write_message
+from scoreboard import PHASES, describe
+from sim import GREEN_ORDER, BLUE_ORDER
+
+LABELS = dict(GREEN_ORDER + BLUE_ORDER)
+
+
+class _Body:
+    """Stand-in player for prediction: just what physics.human_move touches."""
+    __slots__ = ("x", "y", "angle")
+
+    def __init__(self, x, y, angle):
+        self.x, self.y, self.angle = x, y, angle
+
+
+class MatchClient:
+    """
+    One connection to a MatchServer. `state` is the newest WorldState;
+    `predicted` is this client's own player (a _Body) after replaying the
+    inputs the server has not processed yet, or None for spectators.
+    """
+
+    def __init__(self, role="spectator"):
+        self.role = role
+        self.state = None
+        self.bases = OrderedDict()  # tick → WorldState, for deltas
+        self.pending = deque()      # (seq, keys) not yet acked by the server
+        self.seq = 0
+        self.predicted = None
+        self.reader = None
+        self.writer = None
+        self.interval = UPDATE_INTERVAL / 1000.0
+        # stats
+        self.snapshots = 0
+        self.full = 0
+        self.bytes_in = 0
+        self.correction = 0.0       # px the last reconcile moved us by
+
+    async def connect(self, host="127.0.0.1", port=5555):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        write_message(self.writer, _HELLO.pack(b"H", ROLES.index(self.role)))
+        _, role, interval_ms = _WELCOME.unpack(await read_message(self.reader))
+        self.role = ROLES[role]       # may have been turned into a spectator
+        self.interval = interval_ms / 1000.0
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    # --- Receiving ---
+    def own_uid(self):
+        if self.state is None or self.role == "spectator":
+            return None
+        uid = self.state.green_human if self.role == "green" else self.state.blue_human
+        return None if uid == snapcodec.NO_PLAYER else uid
+
+    async def receive(self):
+        try:
+            while True:
+                data = await read_message(self.reader)
+                self.on_snapshot(data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def on_snapshot(self, data: bytes):
+        state, input_ack = snapcodec.decode(data, self.bases)
+        self.bases[state.tick] = state
+        while len(self.bases) > SNAPSHOT_HISTORY:
+            self.bases.popitem(last=False)
+        self.state = state
+        self.snapshots += 1
+        self.full += data[:1] == snapcodec.FULL
+        self.bytes_in += len(data)
+        self._reconcile(input_ack)
+
+    def _reconcile(self, input_ack):
+        """Restart from the server's position and replay unacknowledged inputs."""
+        while self.pending and self.pending[0][0] <= input_ack:
+            self.pending.popleft()
+        uid = self.own_uid()
+        if uid is None:
+            self.predicted = None
+            return
+        ps = next(p for p in self.state.players if p.uid == uid)
+        body = _Body(snapcodec.dq_pos(ps.x), snapcodec.dq_pos(ps.y), snapcodec.dq_angle(ps.angle))
+        for _, keys in self.pending:
+            self._predict(body, keys)
+        if self.predicted is not None:
+            self.correction = ((body.x - self.predicted.x) ** 2
+                               + (body.y - self.predicted.y) ** 2) ** 0.5
+        self.predicted = body
+
+    # --- Sending ---
+    @staticmethod
+    def _predict(body, keys):
+        physics.human_move(body, keys, POOL_LEFT_PX, POOL_RIGHT_PX, POOL_TOP_PX, POOL_BOTTOM_PX)
+
+    def send_input(self, keys):
+        """Send this tick's key state and apply it to our own player at once."""
+        self.seq += 1
+        ack = self.state.tick if self.state is not None else 0
+        mask = keys_to_mask(keys) if self.role != "spectator" else 0
+        write_message(self.writer, _INPUT.pack(b"I", self.seq, ack, mask))
+        if self.role != "spectator":
+            keys = frozenset(keys)
+            self.pending.append((self.seq, keys))
+            if self.predicted is not None:
+                self._predict(self.predicted, keys)
+
+    async def run(self, key_source=frozenset, seconds=None):
+        """Send key_source() every tick, receiving in the background."""
+        loop = asyncio.get_running_loop()
+        receiver = asyncio.ensure_future(self.receive())
+        start, n = loop.time(), 0
+        try:
+            while (seconds is None or n * self.interval < seconds) and not receiver.done():
+                self.send_input(key_source())
+                n += 1
+                await asyncio.sleep(max(0.0, start + n * self.interval - loop.time()))
+        finally:
+            receiver.cancel()
+            self.close()
+
+
+# --------------------
+# Drawing
+# --------------------
+class ClientView:
+    """
+    The latest snapshot as enough of a Simulation for a renderer, with
+    our own player at its predicted position. Players are created on first
+    use by `make_player(uid, label, team)` and moved in place afterwards.
+    """
+    config = DEFAULT_CONFIG      # the protocol assumes the server runs the default pool
+
+    def __init__(self, make_player):
+        self.make_player = make_player
+        self.players = {}
+        self.puck_x = self.puck_y = 0.0
+        self.puck_radius = PUCK_RADIUS_PX
+        self.possessing_player = None
+        self.controlled_player = None
+        self.humans = set()
+
+    def is_human(self, player) -> bool:
+        return player.unique_id in self.humans
+
+    def update(self, client):
+        state = client.state
+        if state is None:
+            return False
+        own = client.own_uid()
+        for ps in state.players:
+            p = self.players.get(ps.uid)
+            if p is None:
+                p = self.players[ps.uid] = self.make_player(
+                    ps.uid, LABELS.get(ps.uid, "?"), snapcodec.TEAMS[ps.team])
+            if ps.uid == own and client.predicted is not None:
+                p.x, p.y, p.angle = client.predicted.x, client.predicted.y, client.predicted.angle
+            else:
+                p.x, p.y = snapcodec.dq_pos(ps.x), snapcodec.dq_pos(ps.y)
+                p.angle = snapcodec.dq_angle(ps.angle)
+            p.depth = ps.depth / snapcodec.DEPTH_SCALE
+        self.puck_x, self.puck_y = snapcodec.dq_pos(state.puck_x), snapcodec.dq_pos(state.puck_y)
+        self.possessing_player = self.players.get(state.possessing)
+        self.controlled_player = self.players.get(own)
+        self.humans = {state.green_human, state.blue_human}
+        return True
+
+
+def run_gui(client, host, port):
+    """Play in a Tk window; networking runs on a background asyncio thread."""
+    import render
+    from player import Player
+
+    keys = set()
+
+    class Window:
+        pass
+
+    win = Window()
+    render.setup_window(win)
+    win.root.title(f"Underwater Hockey ({client.role})")
+    view = ClientView(lambda uid, label, team: Player(win.canvas, 0, 0, team, uid, label))
+    renderer = None
+    shown = None
+
+    def net():
+        async def go():
+            await client.connect(host, port)
+            await client.run(lambda: frozenset(keys))
+        asyncio.run(go())
+
+    threading.Thread(target=net, daemon=True).start()
+    win.canvas.bind("<KeyPress>", lambda e: keys.add(e.keysym))
+    win.canvas.bind("<KeyRelease>", lambda e: keys.discard(e.keysym))
+    win.canvas.focus_set()
+
+    def frame():
+        nonlocal renderer, shown
+        if view.update(client):
+            if renderer is None:
+                renderer = render.TkRenderer(win.canvas, view)
+            renderer.draw_frame(view)
+            s = client.state
+            line = describe(s.green_goals, s.blue_goals, s.half, PHASES[s.phase],
+                            s.clock / snapcodec.TIME_SCALE)
+            if line != shown:
+                shown = line
+                win.canvas.itemconfig(win.score_text, text=line)
+        win.root.after(UPDATE_INTERVAL, frame)
+
+    win.root.after(UPDATE_INTERVAL, frame)
+    win.root.mainloop()
+
+
+# --------------------
+# Command line
+# --------------------
+def bot_keys(rng=None):
+    """Scripted input for tests: swim forward, turning now and then."""
+    rng = rng or random.Random()
+    turn = [None, 0]
+
+    def keys():
+        if turn[1] <= 0:
+            turn[0], turn[1] = rng.choice([None, "Left", "Right"]), rng.randint(5, 30)
+        turn[1] -= 1
+        return frozenset(k for k in ("Up", turn[0]) if k)
+    return keys
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Connect to a match server.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=5555)
+    ap.add_argument("--role", choices=ROLES, default="spectator")
+    ap.add_argument("--gui", action="store_true", help="play in a Tk window")
+    ap.add_argument("--bot", action="store_true", help="send scripted input (headless)")
+    ap.add_argument("--seconds", type=float, default=None)
+    args = ap.parse_args(argv)
+
+    client = MatchClient(args.role)
+    if args.gui:
+        run_gui(client, args.host, args.port)
+        return
+
+    async def go():
+        await client.connect(args.host, args.port)
+        await client.run(bot_keys() if args.bot else frozenset, args.seconds)
+
+    try:
+        asyncio.run(go())
+    except KeyboardInterrupt:
+        pass
+    n = max(1, client.snapshots)
+    print(f"{client.role}: {client.snapshots} snapshots ({client.full} full), "
+          f"{client.bytes_in / n:.0f} bytes/snapshot")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,16 @@
 import json
 import os
 
+
 # --------------------
 # Paths
 # --------------------
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "data")
 GREEN_FORMATIONS_FILE = os.path.join(DATA_DIR, "green_formations.json")
-BLUE_FORMATIONS_FILE  = os.path.join(DATA_DIR, "blue_formations.json")
+BLUE_FORMATIONS_FILE = os.path.join(DATA_DIR, "blue_formations.json")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")    # generated artefacts, e.g. the court image
+
 
 # --------------------
 # JSON Loader
@@ -22,61 +25,246 @@ def load_formations(path: str) -> dict:
     with open(path, 'r') as f:
         return json.load(f)
 
+
 # --------------------
 # Timing & Scaling
 # --------------------
-SCALE                   = 25       # pixels per meter
-UPDATE_INTERVAL         = 50       # ms between frames
-FORMATION_THRESHOLD     = 3        # px tolerance for formation alignment
+SCALE = 25               # pixels per meter
+UPDATE_INTERVAL = 50     # ms between frames
+FORMATION_THRESHOLD = 3  # px tolerance for formation alignment
+RENDER_LOD_PX = 1.0      # px a player must move before it is redrawn
+COSMETIC_INTERVAL = 4    # frames between depth shading / gauge / debug refreshes
+
+
+# --------------------
+# Match
+# --------------------
+HALF_LENGTH = 15 * 60.0    # s of play in each half
+HALVES = 2
+HALFTIME_BREAK = 3 * 60.0  # s between halves
+TIMEOUT_LENGTH = 60.0      # s a timeout stops play for
+TIMEOUTS_PER_HALF = 1      # per team
+
 
 # --------------------
 # Player & Physics
 # --------------------
-SPRINT_SPEED_FACTOR         = 0.05    # fraction of pool height per frame
-SPRINT_SPEED                = 3.125   # px/frame when sprinting
-MAX_DEPTH                   = 2.0     # maximum dive depth (m)
-DEPTH_STEP                  = 0.1     # m per frame for dive/resurface
-PASS_FREEZE                 = 0.3     # s freeze after a pass
-COLLISION_DEPTH_THRESHOLD   = 0.4     # m difference for collision check
+SPRINT_SPEED_FACTOR = 0.05            # fraction of pool height per frame
+SPRINT_SPEED = 3.125                  # px/frame when sprinting
+MAX_DEPTH = 2.0                       # maximum dive depth (m)
+DEPTH_STEP = 0.1                      # m per frame for dive/resurface
+PASS_FREEZE = 0.3                     # s freeze after a pass
+PASS_COOLDOWN = 0.5                   # s before the puck can be picked up after a pass
+PASS_ANIM_STEPS = 20                  # puck moves per pass animation
+PASS_ANIM_INTERVAL = 0.025            # s between pass animation steps
+GOAL_RESET_DELAY = 3.0                # s the "Goal!" banner shows before the reset
+COLLISION_DEPTH_THRESHOLD = 0.4       # m difference for collision check
+PUCK_REACH_M = 0.2                    # m above the floor a player can still touch the puck
+TACKLE_COOLDOWN = 1.0                 # s after a change of possession before the next tackle
+CARRIER_ADVANTAGE = 1.5               # carrier's weight multiplier when a tackle is contested
+PLAYER_RADIUS = (1.82 * SCALE) / 1.5  # px from a player's centre to the tip of their triangle
 
 # radians per update when pivoting
-PIVOT_STEP               = 0.45
+PIVOT_STEP = 0.45
+
+# s the sim waits each frame for the AI planner before reusing its last plan
+AI_PLAN_BUDGET = 0.010
+# s of utility scoring per tick before the remaining AI players just hold formation
+AI_DECISION_BUDGET = 0.004
+
+
+# --------------------
+# Navigation (flow fields)
+# --------------------
+NAV_CELL_M = 1.0         # m per navigation grid cell
+NAV_OCCUPIED_COST = 4.0  # extra cost to cross a cell holding a player
+NAV_WALL_COST = 1.0      # extra cost along the pool walls
+
 
 # --------------------
 # Pool Dimensions (meters)
 # --------------------
-POOL_WIDTH   = 15       # horizontal length (m)
-POOL_HEIGHT  = 25       # vertical length (m)
-MARGIN       = 25       # px around the pool
+POOL_WIDTH = 15   # horizontal length (m)
+POOL_HEIGHT = 25  # vertical length (m)
+MARGIN = 25       # px around the pool
+WALL_ZONE_M = 4   # m from a side wall where formations switch to their wall variants
+
 
 # --------------------
 # Goal & Arc Dimensions
 # --------------------
-GOAL_WIDTH_M         = 3        # m
-GOAL_WIDTH_PX        = GOAL_WIDTH_M * SCALE
-GOAL_THICKNESS_PX    = 10       # px
-GOAL_ARC_RADIUS_M    = 2        # m
-PENALTY_ARC_RADIUS_M = 3        # m
-PENALTY_SPOT_M       = 6        # m
+GOAL_WIDTH_M = 3          # m
+GOAL_WIDTH_PX = GOAL_WIDTH_M * SCALE
+GOAL_THICKNESS_PX = 10    # px
+GOAL_ARC_RADIUS_M = 2     # m
+PENALTY_ARC_RADIUS_M = 3  # m
+PENALTY_SPOT_M = 6        # m
+
+
+# --------------------
+# Derived Pool Geometry (pixels)
+# --------------------
+POOL_LEFT_PX = MARGIN
+POOL_TOP_PX = MARGIN
+POOL_RIGHT_PX = MARGIN + POOL_WIDTH * SCALE
+POOL_BOTTOM_PX = MARGIN + POOL_HEIGHT * SCALE
+GOAL_X1_PX = POOL_LEFT_PX + (POOL_WIDTH * SCALE - GOAL_WIDTH_PX) / 2
+GOAL_X2_PX = GOAL_X1_PX + GOAL_WIDTH_PX
+PUCK_RADIUS_PX = 0.1 * SCALE
+
 
 # --------------------
 # Bench Dimensions
 # --------------------
-BENCH_LENGTH_M  = 5           # m
+BENCH_LENGTH_M = 5                              # m
 BENCH_LENGTH_PX = BENCH_LENGTH_M * SCALE
-BENCH_OFFSET_M  = 3.5         # m from pool edge
+BENCH_OFFSET_M = 3.5                            # m from pool edge
 BENCH_OFFSET_PX = BENCH_OFFSET_M * SCALE
-BENCH_WIDTH_PX  = int((POOL_WIDTH * SCALE) / 4)  # e.g., a quarter of pool width
+BENCH_WIDTH_PX = int((POOL_WIDTH * SCALE) / 4)  # e.g., a quarter of pool width
+
+# Main canvas: pool, margins and the bench strip on the right
+CANVAS_WIDTH_PX = int(POOL_WIDTH * SCALE + MARGIN * 2 + BENCH_WIDTH_PX)
+CANVAS_HEIGHT_PX = int(POOL_HEIGHT * SCALE + MARGIN * 2)
+STATUS_WIDTH_PX = 300     # breath gauges to the right of the canvas
+
 
 # --------------------
 # Physiology & Dive Settings
 # --------------------
-BASE_MAX_BREATH           = 20.0    # seconds of ideal breath‐hold
-SHORT_TERM_REGEN_RATE     = 0.2     # seconds of stamina recovered per second on surface
-LONG_TERM_PENALTY_RATE    = 0.02    # permanent reduction per dive fraction
-EXTRA_DIVE_PENALTY_FACTOR = 1.5     # extra penalty per second beyond 10s
-MIN_SHORT_TERM            = 5.0     # minimum short‐term stamina (seconds)
-MIN_LONG_TERM             = 0.5     # minimum long‐term multiplier
+BASE_MAX_BREATH = 20.0           # seconds of ideal breath‐hold
+SHORT_TERM_REGEN_RATE = 0.2      # seconds of stamina recovered per second on surface
+LONG_TERM_PENALTY_RATE = 0.02    # permanent reduction per dive fraction
+EXTRA_DIVE_PENALTY_FACTOR = 1.5  # extra penalty per second beyond 10s
+MIN_SHORT_TERM = 5.0             # minimum short‐term stamina (seconds)
+MIN_LONG_TERM = 0.5              # minimum long‐term multiplier
+
+SURFACE_LOCK_DURATION = 3.0         # seconds before a player can dive again after surfacing
+DIVE_THRESHOLD_RANGE = (6.0, 14.0)  # s an AI dive lasts, drawn per dive
+AI_DIVE_RANGE = 150.0               # px: distance within which AI will choose to dive
+
+
+# --------------------
+# Simulation Config
+# --------------------
+class SimConfig:
+    """
+    Every setting a Simulation reads while it runs, plus the geometry and
+    per-tick values derived from them, worked out once here instead of
+    every tick. Frozen: use replace() for a variant.
+
+    A Simulation takes one explicitly (DEFAULT_CONFIG if not given), so a
+    parameter sweep can hand each worker process its own config instead
+    of patching this module. The AI, rules and navigation read it from the
+    sim (or its snapshot) too. `scale` is fixed: player bodies, contact
+    radii and the court are sized from SCALE, so other values are refused.
+
+        cfg = DEFAULT_CONFIG.replace(max_depth=2.5, ai_dive_range=200.0)
+        sim = Simulation(config=cfg)
+    """
+
+    # settings, with their defaults from the constants above
+    DEFAULTS = {
+        "scale": SCALE,
+        "update_interval": UPDATE_INTERVAL,
+        "pool_width": POOL_WIDTH,
+        "pool_height": POOL_HEIGHT,
+        "margin": MARGIN,
+        "goal_width_m": GOAL_WIDTH_M,
+        "goal_thickness_px": GOAL_THICKNESS_PX,
+        "wall_zone_m": WALL_ZONE_M,
+        "max_depth": MAX_DEPTH,
+        "depth_step": DEPTH_STEP,
+        "base_max_breath": BASE_MAX_BREATH,
+        "short_term_regen_rate": SHORT_TERM_REGEN_RATE,
+        "long_term_penalty_rate": LONG_TERM_PENALTY_RATE,
+        "extra_dive_penalty_factor": EXTRA_DIVE_PENALTY_FACTOR,
+        "min_short_term": MIN_SHORT_TERM,
+        "min_long_term": MIN_LONG_TERM,
+        "surface_lock_duration": SURFACE_LOCK_DURATION,
+        "dive_threshold_range": DIVE_THRESHOLD_RANGE,
+        "ai_dive_range": AI_DIVE_RANGE,
+    }
+    DERIVED = (
+        "dt",                                  # s per tick
+        "pool_left", "pool_top", "pool_right", "pool_bottom",
+        "goal_x1", "goal_x2",
+        "goal_top_y1", "goal_top_y2", "goal_bottom_y1", "goal_bottom_y2",
+        "wall_left", "wall_right",             # x inside which the wall formations apply
+        "floor_band_min",                      # m deep a player must be to touch the puck
+        "puck_radius", "player_radius",
+    )
+    __slots__ = tuple(DEFAULTS) + DERIVED
+
+    def __init__(self, **settings):
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError(f"unknown SimConfig settings: {', '.join(sorted(unknown))}")
+        values = {**self.DEFAULTS, **settings}
+        if values["scale"] != SCALE:
+            raise ValueError(f"scale is fixed at {SCALE} px/m; bodies and the court are sized from it")
+        values["dive_threshold_range"] = tuple(values["dive_threshold_range"])
+
+        s = values["scale"]
+        left, top = values["margin"], values["margin"]
+        right = left + values["pool_width"] * s
+        bottom = top + values["pool_height"] * s
+        goal_w, goal_t = values["goal_width_m"] * s, values["goal_thickness_px"]
+        goal_x1 = left + (values["pool_width"] * s - goal_w) / 2
+        values.update(
+            dt=values["update_interval"] / 1000.0,
+            pool_left=left, pool_top=top, pool_right=right, pool_bottom=bottom,
+            goal_x1=goal_x1, goal_x2=goal_x1 + goal_w,
+            goal_top_y1=top, goal_top_y2=top + goal_t,
+            goal_bottom_y1=bottom - goal_t, goal_bottom_y2=bottom,
+            wall_left=left + values["wall_zone_m"] * s,
+            wall_right=right - values["wall_zone_m"] * s,
+            floor_band_min=values["max_depth"] - PUCK_REACH_M,
+            puck_radius=0.1 * s,
+            player_radius=(1.82 * s) / 1.5,
+        )
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SimConfig is frozen; use replace()")
+
+    __delattr__ = __setattr__
+
+    def settings(self) -> dict:
+        """The settings this config was built from (not the derived values)."""
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+    def replace(self, **changes) -> "SimConfig":
+        return SimConfig(**{**self.settings(), **changes})
+
+    def __eq__(self, other):
+        return isinstance(other, SimConfig) and self.settings() == other.settings()
+
+    def __hash__(self):
+        return hash(tuple(self.settings().values()))
+
+    def __reduce__(self):
+        # slots plus a frozen __setattr__ defeat the default pickling
+        return (_sim_config, (self.settings(),))
+
+    def __repr__(self):
+        changed = {k: v for k, v in self.settings().items() if v != self.DEFAULTS[k]}
+        return f"SimConfig({', '.join(f'{k}={v!r}' for k, v in changed.items())})"
+
+
+def _sim_config(settings):
+    return SimConfig(**settings)
+
+
+def parse_settings(pairs) -> dict:
+    """SimConfig settings from NAME=VALUE strings, values in JSON (e.g. "max_depth=2.5")."""
+    out = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"expected NAME=VALUE, got {pair!r}")
+        out[name.strip()] = json.loads(value)
+    return out
+
 
-SURFACE_LOCK_DURATION     = 3.0     # seconds before a player can dive again after surfacing
-AI_DIVE_RANGE             = 150.0   # px: distance within which AI will choose to dive
+DEFAULT_CONFIG = SimConfig()
@@ -0,0 +1,75 @@
+# contact.py
+
+import math
+
+from config import (
+    COLLISION_DEPTH_THRESHOLD,
+    CARRIER_ADVANTAGE,
+    DEFAULT_CONFIG,
+    PLAYER_RADIUS,
+)
+
+
+# --------------------
+# Bodies in (x, y, depth)
+# --------------------
+# Each player is their triangle extruded over a slab of water this thick,
+# centred on player.depth. Two slabs overlap exactly when the depths differ
+# by less than COLLISION_DEPTH_THRESHOLD.
+# The floor (max depth) and breath come from the sim's config.SimConfig.
+BODY_THICKNESS_M = COLLISION_DEPTH_THRESHOLD
+PICKUP_RADIUS = PLAYER_RADIUS * 1.2    # px from body centre to the puck
+
+
+def on_bottom(player, config=DEFAULT_CONFIG) -> bool:
+    """Close enough to the floor to touch the puck, which always lies on it."""
+    return player.depth >= config.floor_band_min
+
+
+def reachers(index, x, y, config=DEFAULT_CONFIG):
+    """
+    Players on the bottom whose body is within pickup reach of (x, y).
+    `index` is a 3D spatial.SpatialHash rebuilt this frame, so only the
+    floor layer around the puck is examined.
+    """
+    near = index.query(x, y, PICKUP_RADIUS, config.floor_band_min, config.max_depth)
+    return [p for p in near
+            if on_bottom(p, config) and math.hypot(p.x - x, p.y - y) <= PICKUP_RADIUS]
+
+
+def contest_weight(player, x, y, config=DEFAULT_CONFIG) -> float:
+    """Fresher and closer players are likelier to come away with the puck."""
+    fresh = max(0.1, min(1.0, player.short_term_stamina / config.base_max_breath))
+    close = 1.0 - 0.5 * min(1.0, math.hypot(player.x - x, player.y - y) / PICKUP_RADIUS)
+    return fresh * close
+
+
+# --------------------
+# Possession
+# --------------------
+def resolve_loose_puck(index, x, y, rng, config=DEFAULT_CONFIG):
+    """Who (if anyone) picks up a loose puck at (x, y). Ties go to a weighted draw."""
+    cands = reachers(index, x, y, config)
+    if not cands:
+        return None
+    if len(cands) == 1:
+        return cands[0]
+    cands.sort(key=lambda p: p.unique_id)   # stable order for a seeded rng
+    weights = [contest_weight(p, x, y, config) for p in cands]
+    return rng.choices(cands, weights=weights)[0]
+
+
+def resolve_tackle(index, carrier, x, y, rng, config=DEFAULT_CONFIG):
+    """
+    Opponents on the bottom within reach of the carried puck challenge for
+    it. Returns the challenger who wins it, or None if the carrier keeps it.
+    """
+    challengers = [p for p in reachers(index, x, y, config) if p.color != carrier.color]
+    if not challengers:
+        return None
+    challengers.sort(key=lambda p: p.unique_id)
+    field = [carrier] + challengers
+    weights = [contest_weight(carrier, x, y, config) * CARRIER_ADVANTAGE]
+    weights += [contest_weight(p, x, y, config) for p in challengers]
+    winner = rng.choices(field, weights=weights)[0]
+    return None if winner is carrier else winner
@@ -0,0 +1,113 @@
+# court.py
+
+import hashlib
+import os
+
+from config import (
+    SCALE,
+    MARGIN,
+    POOL_WIDTH, POOL_HEIGHT,
+    GOAL_THICKNESS_PX,
+    GOAL_ARC_RADIUS_M, PENALTY_ARC_RADIUS_M,
+    PENALTY_SPOT_M,
+    POOL_LEFT_PX, POOL_RIGHT_PX,
+    POOL_TOP_PX, POOL_BOTTOM_PX,
+    GOAL_X1_PX, GOAL_X2_PX,
+    BENCH_LENGTH_PX, BENCH_OFFSET_PX, BENCH_WIDTH_PX,
+    CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX,
+    CACHE_DIR,
+)
+from raster import Framebuffer
+
+COURT_STYLE = 2          # bump when draw_court changes so old cached images are ignored
+BENCH_GAP_PX = 10        # px between the pool edge and the benches
+SPOT_RADIUS_PX = 0.3 * SCALE
+
+
+# --------------------
+# Layout
+# --------------------
+def bench_boxes():
+    """(x1, y1, x2, y2) of the blue (top) and green (bottom) benches."""
+    bx1 = POOL_RIGHT_PX + BENCH_GAP_PX
+    bx2 = bx1 + BENCH_WIDTH_PX
+    top_y1 = POOL_TOP_PX + BENCH_OFFSET_PX
+    bot_y2 = POOL_BOTTOM_PX - BENCH_OFFSET_PX
+    return ((bx1, top_y1, bx2, top_y1 + BENCH_LENGTH_PX),
+            (bx1, bot_y2 - BENCH_LENGTH_PX, bx2, bot_y2))
+
+
+def draw_court(fb: Framebuffer):
+    """
+    Rasterise every static court element into `fb`: pool, goals, arcs,
+    centre lines, spots and benches. Mirrors what render.setup_window used
+    to draw as separate canvas items; bench labels are left to the caller.
+    """
+    L, T = POOL_LEFT_PX, POOL_TOP_PX
+    R, B = POOL_RIGHT_PX, POOL_BOTTOM_PX
+    cx = (GOAL_X1_PX + GOAL_X2_PX) / 2
+
+    # 1) Pool
+    fb.fill_rect(L, T, R, B, "lightblue")
+    fb.rect_outline(L, T, R, B, "black", width=2)
+
+    # 2) Goals
+    for y1, y2 in ((T, T + GOAL_THICKNESS_PX), (B - GOAL_THICKNESS_PX, B)):
+        fb.fill_rect(GOAL_X1_PX, y1, GOAL_X2_PX, y2, "black")
+        fb.rect_outline(GOAL_X1_PX, y1, GOAL_X2_PX, y2, "white", width=2)
+
+    # 3) Goal arcs (solid) & penalty arcs (dashed), bulging into the pool
+    ga_px = GOAL_ARC_RADIUS_M * SCALE
+    pa_px = PENALTY_ARC_RADIUS_M * SCALE
+    for y, start in ((T, 180), (B, 0)):
+        fb.arc(cx, y, ga_px, start, 180, "white", width=2)
+        fb.arc(cx, y, pa_px, start, 180, "white", width=2, dash=(4, 2))
+
+    # 4) Centre lines & spot
+    fb.line(L, (T+B)/2, R, (T+B)/2, "white", dash=(4, 2))
+    fb.line((L+R)/2, T, (L+R)/2, B, "white", dash=(4, 2))
+    fb.circle_outline((L+R)/2, (T+B)/2, SPOT_RADIUS_PX, "white", width=2)
+
+    # 5) Penalty spots
+    ps_px = PENALTY_SPOT_M * SCALE
+    for y in (T + GOAL_THICKNESS_PX + ps_px, B - GOAL_THICKNESS_PX - ps_px):
+        fb.fill_circle(cx, y, SPOT_RADIUS_PX, "white")
+
+    # 6) Benches
+    for x1, y1, x2, y2 in bench_boxes():
+        fb.fill_rect(x1, y1, x2, y2, "lightgreen")
+        fb.rect_outline(x1, y1, x2, y2, "black", width=2)
+
+
+# --------------------
+# On-disk cache
+# --------------------
+def court_key() -> str:
+    """Short hash of everything that changes the court image."""
+    dims = (COURT_STYLE, SCALE, MARGIN, POOL_WIDTH, POOL_HEIGHT,
+            GOAL_X1_PX, GOAL_X2_PX, GOAL_THICKNESS_PX,
+            GOAL_ARC_RADIUS_M, PENALTY_ARC_RADIUS_M, PENALTY_SPOT_M,
+            BENCH_LENGTH_PX, BENCH_OFFSET_PX, BENCH_WIDTH_PX,
+            CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX)
+    return hashlib.sha1(repr(dims).encode()).hexdigest()[:12]
+
+
+def render_court() -> Framebuffer:
+    fb = Framebuffer(CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX, bg="white")
+    draw_court(fb)
+    return fb
+
+
+def court_image_path(cache_dir: str = CACHE_DIR) -> str:
+    """
+    Path of the court PNG for the current config, rendering and writing it
+    first if this geometry has not been cached yet.
+    """
+    path = os.path.join(cache_dir, f"court_{court_key()}.png")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(render_court().to_png())
+        os.replace(tmp, path)     # atomic: a concurrent launch never sees half a file
+    return path
@@ -0,0 +1,281 @@
+# env.py
+#
+# Gym-style environments around the headless Simulation, for training an
+# agent to play one team's human player while the AI plays everyone else.
+#
+#   env = HockeyEnv(team="green")
+#   obs, info = env.reset(seed=0)
+#   obs, reward, terminated, truncated, info = env.step(3)
+#
+# VecEnv steps N of them in one process and writes every observation into
+# one shared float32 block, so nothing is allocated per step.
+#
+#   python env.py --envs 8 --steps 2000      # steps/s on this machine
+
+import argparse
+import array
+import functools
+import math
+import random
+import sys
+import time
+
+from config import (
+    UPDATE_INTERVAL,
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+)
+
+
+# --------------------
+# Spaces
+# --------------------
+# Discrete actions: the keys held down for the step. "space" charges a pass
+# that is released (played) on the first step without it.
+KEY_ACTIONS = (
+    (),
+    ("Up",),
+    ("Up", "Left"),
+    ("Up", "Right"),
+    ("Left",),
+    ("Right",),
+    ("s",),
+    ("Up", "s"),
+    ("Up", "Left", "s"),
+    ("Up", "Right", "s"),
+    ("space",),
+    ("Up", "space"),
+)
+# Continuous actions: (heading, dive). Heading is in radians in the team's
+# own frame (0 = straight at the goal it attacks); dive > 0.5 dives.
+ACTION_MODES = ("keys", "heading")
+
+# Observation: per player (own team first, then opponents, each by
+# unique_id), then the globals. Coordinates are in the team's own frame,
+# scaled to 0‥1 across the pool, so both teams see the same game.
+PLAYER_OBS = ("x", "y", "sin", "cos", "depth", "breath", "own", "me")
+GLOBAL_OBS = ("puck_x", "puck_y", "own_puck", "opp_puck", "time")
+N_PLAYERS = 12
+OBS_SIZE = N_PLAYERS * len(PLAYER_OBS) + len(GLOBAL_OBS)
+
+GOAL_REWARD = 1.0     # +1 when the team scores, −1 when it concedes
+
+
+# --------------------
+# Single environment
+# --------------------
+class HockeyEnv:
+    """
+    One pool. The agent drives `team`'s human player; every other player is
+    the AI's (`planner_factory()` gives each new match its planner, the
+    synchronous AI by default). An episode ends at the first goal
+    (`terminated`) or after `seconds` of play (`truncated`).
+
+    `obs` may be a writable float buffer of OBS_SIZE to fill in place
+    (VecEnv hands out slices of its block); otherwise one is allocated once.
+    Each step advances `frame_skip` ticks with the same action.
+    """
+
+    def __init__(self, team="green", action_mode="keys", seconds=60.0, frame_skip=1,
+                 green_formations=None, blue_formations=None, planner_factory=None, obs=None):
+        if action_mode not in ACTION_MODES:
+            raise ValueError(f"action_mode must be one of {ACTION_MODES}")
+        self.team = team
+        self.opponent = "blue" if team == "green" else "green"
+        self.action_mode = action_mode
+        self.frame_skip = frame_skip
+        self.max_ticks = int(seconds * 1000 / UPDATE_INTERVAL)
+        self.green_formations = (green_formations if green_formations is not None
+                                 else load_formations(GREEN_FORMATIONS_FILE))
+        self.blue_formations = (blue_formations if blue_formations is not None
+                                else load_formations(BLUE_FORMATIONS_FILE))
+        self.planner_factory = planner_factory
+        self.obs = obs if obs is not None else array.array("f", bytes(4 * OBS_SIZE))
+        self.sim = None
+        self.flip = team == "blue"     # blue attacks downwards; mirror its view
+        self._order = ()
+        self._keys = frozenset()
+
+    # --- Gym API ---
+    def reset(self, seed=None):
+        from sim import Simulation
+        if self.sim is not None:
+            self.sim.planner.close()
+        if seed is not None:
+            random.seed(seed)           # physiology draws from `random`
+        planner = self.planner_factory() if self.planner_factory else None
+        self.sim = sim = Simulation(green_formations=self.green_formations,
+                                    blue_formations=self.blue_formations,
+                                    planner=planner, seed=seed)
+        sim.release_human(self.opponent)
+        sim.enable_human(self.team)
+        self._keys = frozenset()
+
+        # fixed player order and the constants of the team's frame, worked out once
+        self._order = tuple(sorted(sim.players.values(),
+                                   key=lambda p: (p.color != self.team, p.unique_id)))
+        self._x0, self._y0 = sim.pool_left, sim.pool_top
+        self._w = sim.pool_right - sim.pool_left
+        self._h = sim.pool_bottom - sim.pool_top
+        self._goals = sim.scoreboard.total
+        self._write_obs()
+        return self.obs, {}
+
+    def step(self, action):
+        sim = self.sim
+        self._apply(action)
+        reward, terminated = 0.0, False
+        for _ in range(self.frame_skip):
+            sim.advance(UPDATE_INTERVAL / 1000.0)
+            board = sim.scoreboard
+            if board.total != self._goals:
+                self._goals = board.total
+                reward = GOAL_REWARD if board.last_scorer == self.team else -GOAL_REWARD
+                terminated = True
+                break
+        truncated = not terminated and sim.tick >= self.max_ticks
+        self._write_obs()
+        return self.obs, reward, terminated, truncated, {}
+
+    def close(self):
+        if self.sim is not None:
+            self.sim.planner.close()
+            self.sim = None
+
+    # --- Actions ---
+    def _apply(self, action):
+        if self.action_mode == "keys":
+            keys = frozenset(KEY_ACTIONS[int(action)])
+        else:
+            heading, dive = action
+            me = self.sim.controlled[self.team]
+            if me is not None:
+                me.update_angle(heading + math.pi if self.flip else heading)
+            keys = frozenset(("Up", "s")) if dive > 0.5 else frozenset(("Up",))
+        # only changes reach the sim, as with a keyboard
+        for k in self._keys - keys:
+            self.sim.release_key(k, self.team)
+        for k in keys - self._keys:
+            self.sim.press_key(k, self.team)
+        self._keys = keys
+
+    # --- Observations ---
+    def _write_obs(self):
+        sim, o, flip = self.sim, self.obs, self.flip
+        cfg = sim.config
+        x0, y0, w, h = self._x0, self._y0, self._w, self._h
+        me = sim.controlled[self.team]
+        team = self.team
+        i = 0
+        for p in self._order:
+            x, y = (p.x - x0) / w, (p.y - y0) / h
+            a = p.angle + math.pi if flip else p.angle
+            if flip:
+                x, y = 1.0 - x, 1.0 - y
+            o[i] = x
+            o[i + 1] = y
+            o[i + 2] = math.sin(a)
+            o[i + 3] = math.cos(a)
+            o[i + 4] = p.depth / cfg.max_depth
+            o[i + 5] = p.short_term_stamina / cfg.base_max_breath
+            o[i + 6] = 1.0 if p.color == team else 0.0
+            o[i + 7] = 1.0 if p is me else 0.0
+            i += 8
+        px, py = (sim.puck_x - x0) / w, (sim.puck_y - y0) / h
+        holder = sim.possessing_player
+        o[i] = 1.0 - px if flip else px
+        o[i + 1] = 1.0 - py if flip else py
+        o[i + 2] = 1.0 if holder is not None and holder.color == team else 0.0
+        o[i + 3] = 1.0 if holder is not None and holder.color != team else 0.0
+        o[i + 4] = sim.tick / self.max_ticks
+
+
+# --------------------
+# Vectorised environments
+# --------------------
+class VecEnv:
+    """
+    N HockeyEnvs stepped together. Observations live in one float32 block
+    (`obs`, N × OBS_SIZE, row i for env i), rewards and done flags in
+    preallocated arrays; step() fills them in place and returns the same
+    objects every time. An env that finishes is reset straight away, so
+    its row already holds the first observation of the next episode.
+    """
+
+    def __init__(self, n, seed=0, **env_kwargs):
+        self.n = n
+        self.obs = array.array("f", bytes(4 * n * OBS_SIZE))
+        self.rewards = array.array("d", bytes(8 * n))
+        self.terminated = array.array("B", bytes(n))
+        self.truncated = array.array("B", bytes(n))
+        view = memoryview(self.obs)
+        self.envs = [HockeyEnv(obs=view[i * OBS_SIZE:(i + 1) * OBS_SIZE], **env_kwargs)
+                     for i in range(n)]
+        self.seed = seed
+        self.episodes = 0
+
+    def reset(self):
+        for i, env in enumerate(self.envs):
+            env.reset(seed=self.seed + i)
+        self.episodes = self.n
+        return self.obs
+
+    def step(self, actions):
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, term, trunc, _ = env.step(action)
+            self.rewards[i] = reward
+            self.terminated[i] = term
+            self.truncated[i] = trunc
+            if term or trunc:
+                env.reset(seed=self.seed + self.episodes)
+                self.episodes += 1
+        return self.obs, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+# --------------------
+# Command line
+# --------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure environment throughput with random actions.")
+    ap.add_argument("--envs", type=int, default=4)
+    ap.add_argument("--steps", type=int, default=1000, help="steps per env")
+    ap.add_argument("--mode", choices=ACTION_MODES, default="keys")
+    ap.add_argument("--frame-skip", type=int, default=1)
+    ap.add_argument("--policy", default=None,
+                    help="AI players' policy: scripted, table:PATH or mlp:PATH (default: the AI planner)")
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    args = ap.parse_args(argv)
+
+    factory = None
+    if args.policy:
+        from policy import PolicyPlanner, load_policy
+        factory = functools.partial(PolicyPlanner, load_policy(args.policy))
+    venv = VecEnv(args.envs, action_mode=args.mode, frame_skip=args.frame_skip,
+                  planner_factory=factory,
+                  green_formations=load_formations(args.green),
+                  blue_formations=load_formations(args.blue))
+    rng = random.Random(0)
+    venv.reset()
+    goals = 0
+    t0 = time.perf_counter()
+    for _ in range(args.steps):
+        if args.mode == "keys":
+            actions = [rng.randrange(len(KEY_ACTIONS)) for _ in range(args.envs)]
+        else:
+            actions = [(rng.uniform(-math.pi, math.pi), rng.random()) for _ in range(args.envs)]
+        _, rewards, _, _ = venv.step(actions)
+        goals += sum(1 for r in rewards if r)
+    dt = time.perf_counter() - t0
+    venv.close()
+    total = args.envs * args.steps
+    print(f"{total} steps in {dt:.2f} s: {total / dt:,.0f} steps/s "
+          f"({total * args.frame_skip / dt:,.0f} sim ticks/s), {goals} goals", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# export.py
+#
+# Offline match export: render a recorded match, or a seeded headless one,
+# to a PNG/PPM sequence or a raw rgb24 stream, with no display needed.
+#
+#   python export.py frames/ --seed 7 --seconds 60
+#   python export.py frames/ --replay match.jsonl --workers 8
+#   python export.py - --seed 7 --format raw | ffmpeg -f rawvideo \
+#       -pix_fmt rgb24 -s 818x675 -r 20 -i - match.mp4
+
+import argparse
+import json
+import os
+import random
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from config import (
+    DEFAULT_CONFIG,
+    UPDATE_INTERVAL,
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+)
+from renderers import SoftwareRenderer, ImageSequenceSink
+
+FPS = 1000 // UPDATE_INTERVAL
+
+
+# --------------------
+# Recorded frames
+# --------------------
+# One frame is a small JSON-able dict; a recording is one per line.
+_PLAYER_FIELDS = ("unique_id", "label", "color", "x", "y", "angle", "depth",
+                  "current_dive_time", "short_term_stamina", "long_term_stamina")
+
+
+class PlayerView(namedtuple("PlayerView", _PLAYER_FIELDS)):
+    """A recorded player, with the attributes the renderers read."""
+    __slots__ = ()
+
+    @property
+    def base_color(self):
+        return self.color
+
+
+class FrameView:
+    """A recorded frame dressed up as enough of a Simulation to draw."""
+    config = DEFAULT_CONFIG      # recordings are of default-config matches (see run_match)
+
+    def __init__(self, frame: dict):
+        self.time = frame["t"]
+        self.players = {row[0]: PlayerView(*row) for row in frame["players"]}
+        self.puck_x, self.puck_y, self.puck_radius = frame["puck"]
+        self.possessing_player = self.players.get(frame["poss"])
+        self.controlled_player = self.players.get(frame["ctrl"])
+        self.humans = set(frame.get("humans", [frame["ctrl"]]))
+
+    def is_human(self, player) -> bool:
+        return player.unique_id in self.humans
+
+
+def snapshot_frame(sim) -> dict:
+    """What a frame of `sim` looks like on screen, rounded to keep files small."""
+    def uid(p):
+        return p.unique_id if p is not None else None
+    return {
+        "t":     round(sim.time, 3),
+        "puck":  [round(sim.puck_x, 2), round(sim.puck_y, 2), sim.puck_radius],
+        "poss":  uid(sim.possessing_player),
+        "ctrl":  uid(sim.controlled_player),
+        "humans": [p.unique_id for p in sim.controlled.values() if p is not None],
+        "players": [
+            [p.unique_id, p.label, p.color, round(p.x, 2), round(p.y, 2),
+             round(p.angle, 4), round(p.depth, 3), round(p.current_dive_time, 2),
+             round(p.short_term_stamina, 2), round(p.long_term_stamina, 4)]
+            for p in sim.players.values()
+        ],
+    }
+
+
+class MatchRecorder:
+    """Appends one JSON line per frame; attach to a live game to record it."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "w")
+
+    def write(self, frame: dict):
+        self.file.write(json.dumps(frame, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def read_recording(path: str):
+    """Yield the frames of a recording one at a time."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def run_match(seconds: float, seed=None, green_formations=None, blue_formations=None):
+    """Yield a frame per UPDATE_INTERVAL of a seeded headless match."""
+    from sim import Simulation
+    if seed is not None:
+        random.seed(seed)           # physiology draws dive thresholds from `random`
+    sim = Simulation(green_formations=green_formations,
+                     blue_formations=blue_formations, seed=seed)
+    try:
+        for _ in range(int(seconds * FPS)):
+            sim.advance(UPDATE_INTERVAL / 1000.0)
+            yield snapshot_frame(sim)
+    finally:
+        sim.planner.close()
+
+
+def tee_recording(frames, path: str):
+    """Pass frames through while saving them as a recording."""
+    rec = MatchRecorder(path)
+    try:
+        for frame in frames:
+            rec.write(frame)
+            yield frame
+    finally:
+        rec.close()
+
+
+# --------------------
+# Parallel rendering
+# --------------------
+_worker = None   # per-process SoftwareRenderer, built on first use
+
+
+def _render_chunk(job):
+    """
+    Render one chunk of frames in a worker process. Image formats are
+    written straight to disk; raw frames come back as bytes, in order.
+    """
+    global _worker
+    start, frames, out, fmt, status = job
+    if _worker is None or _worker.status != status:
+        _worker = SoftwareRenderer(status=status)
+    if fmt == "raw":
+        return [bytes(_worker.draw_frame(FrameView(f)).pixels) for f in frames]
+    sink = ImageSequenceSink(out, fmt, start=start)
+    for f in frames:
+        sink(_worker.draw_frame(FrameView(f)))
+    return len(frames)
+
+
+def _chunks(frames, size):
+    chunk = []
+    for frame in frames:
+        chunk.append(frame)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_frames(frames, out, fmt="png", workers=None, chunk=16, status=True):
+    """
+    Render `frames` (an iterable of frame dicts) to `out`: a directory for
+    "png"/"ppm", or a binary stream for "raw".
+
+    Frames are pulled lazily and at most 2 chunks per worker are in flight,
+    so memory stays flat however long the match is. Returns the frame count.
+    """
+    if fmt not in ("png", "ppm", "raw"):
+        raise ValueError(f"unknown export format {fmt!r}")
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    pending = deque()
+
+    def drain_one():
+        nonlocal written
+        result = pending.popleft().result()
+        if fmt == "raw":
+            for data in result:
+                out.write(data)
+            written += len(result)
+        else:
+            written += result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        start = 0
+        for batch in _chunks(frames, chunk):
+            pending.append(pool.submit(_render_chunk, (start, batch, out if fmt != "raw" else None,
+                                                       fmt, status)))
+            start += len(batch)
+            if len(pending) >= 2 * workers:
+                drain_one()
+        while pending:
+            drain_one()
+    return written
+
+
+# --------------------
+# Command line
+# --------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render a match to images or raw video, headless.")
+    ap.add_argument("out", help="output directory (png/ppm) or file, '-' for stdout (raw)")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--replay", metavar="PATH", help="recording to render")
+    src.add_argument("--seed", type=int, help="seed for a headless match (default)")
+    ap.add_argument("--seconds", type=float, default=60.0, help="length of a headless match")
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    ap.add_argument("--save-recording", metavar="PATH", help="also save the headless match")
+    ap.add_argument("--format", choices=("png", "ppm", "raw"), default="png")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk", type=int, default=16, help="frames per worker job")
+    ap.add_argument("--no-status", action="store_true", help="leave out the breath gauges")
+    args = ap.parse_args(argv)
+
+    if args.replay:
+        frames = read_recording(args.replay)
+    else:
+        frames = run_match(args.seconds, args.seed,
+                           load_formations(args.green), load_formations(args.blue))
+        if args.save_recording:
+            frames = tee_recording(frames, args.save_recording)
+
+    if args.format == "raw":
+        out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    else:
+        out = args.out
+    try:
+        n = export_frames(frames, out, args.format, args.workers, args.chunk,
+                          status=not args.no_status)
+    finally:
+        if args.format == "raw" and out is not sys.stdout.buffer:
+            out.close()
+    print(f"{n} frames ({n / FPS:.1f} s of play)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
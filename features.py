@@ -0,0 +1,140 @@
+# features.py
+
+import math
+from array import array
+
+
+# --------------------
+# Feature columns (one value per player per tick)
+# --------------------
+FEATURES = (
+    "dist_puck",          # px to the puck
+    "dist_own_goal",      # px to the goal this player defends
+    "dist_opp_goal",      # px to the goal this player attacks
+    "nearest_opp_dist",   # px to the closest opponent
+    "nearest_mate_dist",  # px to the closest teammate
+    "breath_left",        # s of dive left before they must surface
+    "breath_frac",        # breath_left as a fraction of the current limit
+    "depth_norm",         # 0 at surface, 1 on the bottom
+    "has_puck",           # 1.0 / 0.0
+    "team_has_puck",      # 1.0 if a teammate (or self) has it
+    "opp_has_puck",       # 1.0 if the other team has it
+    "goal_side",          # 1.0 if between the puck and own goal
+    "puck_in_range",      # 1.0 if within the config's ai_dive_range of the puck
+)
+
+
+class FeatureTable:
+    """
+    Column-major features for every player in one snapshot.
+
+    - columns[name] is an array('d') with one entry per player
+    - row[unique_id] gives that player's index into every column
+    - dist is the full N×N distance matrix (row-major), reused by
+      anything that needs pairwise distances this tick
+    - config is the snapshot's config.SimConfig
+    """
+    __slots__ = ("row", "players", "columns", "dist", "nearest_opp", "nearest_mate", "config")
+
+    def __init__(self, players, config):
+        self.players = players
+        self.config = config
+        self.row = {p.unique_id: i for i, p in enumerate(players)}
+        n = len(players)
+        self.columns = {name: array("d", bytes(8 * n)) for name in FEATURES}
+        self.dist = array("d", bytes(8 * n * n))
+        self.nearest_opp = [None] * n    # PlayerSnapshot or None
+        self.nearest_mate = [None] * n
+
+    def get(self, player, name: str) -> float:
+        return self.columns[name][self.row[player.unique_id]]
+
+    def distance(self, a, b) -> float:
+        n = len(self.players)
+        return self.dist[self.row[a.unique_id] * n + self.row[b.unique_id]]
+
+
+def goal_centers(snap, color):
+    """(own goal, opponent goal) centres for a team. Green defends the bottom."""
+    cx = (snap.pool_left + snap.pool_right) / 2
+    top, bottom = (cx, snap.pool_top), (cx, snap.pool_bottom)
+    return (bottom, top) if color == "green" else (top, bottom)
+
+
+def compute_features(snap) -> FeatureTable:
+    """
+    Build the FeatureTable for `snap` in one pass over all players. Build
+    it once a tick and pass it down, so every decision shares the same
+    numbers; nothing is cached here, so planners on other threads or in
+    other sims can't see each other's tables.
+    """
+    players = snap.players
+    n = len(players)
+    cfg = snap.config
+    table = FeatureTable(players, cfg)
+    cols = table.columns
+    dist = table.dist
+    xs = [p.x for p in players]
+    ys = [p.y for p in players]
+
+    # 1) Pairwise distances, filled symmetrically
+    for i in range(n):
+        xi, yi = xs[i], ys[i]
+        base = i * n
+        for j in range(i + 1, n):
+            d = math.hypot(xs[j] - xi, ys[j] - yi)
+            dist[base + j] = d
+            dist[j * n + i] = d
+
+    possessor = snap.possessing_player
+    goals = {c: goal_centers(snap, c) for c in ("green", "blue")}
+
+    # 2) Per-player columns
+    for i, p in enumerate(players):
+        (ogx, ogy), (agx, agy) = goals[p.color]
+        dp = math.hypot(p.x - snap.puck_x, p.y - snap.puck_y)
+        cols["dist_puck"][i] = dp
+        cols["dist_own_goal"][i] = math.hypot(p.x - ogx, p.y - ogy)
+        cols["dist_opp_goal"][i] = math.hypot(p.x - agx, p.y - agy)
+
+        best_opp = best_mate = None
+        d_opp = d_mate = math.inf
+        base = i * n
+        for j, q in enumerate(players):
+            if j == i:
+                continue
+            d = dist[base + j]
+            if q.color == p.color:
+                if d < d_mate:
+                    d_mate, best_mate = d, q
+            elif d < d_opp:
+                d_opp, best_opp = d, q
+        cols["nearest_opp_dist"][i] = d_opp
+        cols["nearest_mate_dist"][i] = d_mate
+        table.nearest_opp[i] = best_opp
+        table.nearest_mate[i] = best_mate
+
+        # breath: AI players surface at their own threshold, others at their effective max
+        limit = min(p.short_term_stamina, cfg.base_max_breath * p.long_term_stamina)
+        if p.dive_threshold is not None and p.submerging:
+            limit = min(limit, p.dive_threshold)
+        cols["breath_left"][i] = max(0.0, limit - p.current_dive_time)
+        cols["breath_frac"][i] = cols["breath_left"][i] / limit if limit > 0 else 0.0
+        cols["depth_norm"][i] = p.depth / cfg.max_depth
+
+        cols["has_puck"][i] = 1.0 if possessor is p else 0.0
+        team = possessor is not None and possessor.color == p.color
+        cols["team_has_puck"][i] = 1.0 if team else 0.0
+        cols["opp_has_puck"][i] = 1.0 if possessor is not None and not team else 0.0
+
+        # between puck and own goal along the pool's long axis
+        cols["goal_side"][i] = 1.0 if (p.y - snap.puck_y) * (ogy - snap.puck_y) > 0 else 0.0
+        cols["puck_in_range"][i] = 1.0 if dp < cfg.ai_dive_range else 0.0
+
+    return table
+
+
+def lane_pressure(table, player, radius_m: float = 4.0) -> float:
+    """0 when the nearest opponent is `radius_m` or further away, 1 when touching."""
+    d = table.get(player, "nearest_opp_dist")
+    return max(0.0, min(1.0, 1.0 - d / (radius_m * table.config.scale)))
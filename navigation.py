@@ -0,0 +1,127 @@
+# navigation.py
+
+import heapq
+import math
+
+from config import NAV_OCCUPIED_COST, NAV_WALL_COST
+
+# 8-connected neighbourhood: (dcol, drow, step cost)
+_NEIGHBOURS = [(dc, dr, math.hypot(dc, dr))
+               for dc in (-1, 0, 1) for dr in (-1, 0, 1) if dc or dr]
+
+
+class FlowField:
+    """
+    Integrated cost-to-target for every cell of a NavGrid, plus the unit
+    direction to follow out of each cell. Looking up a heading is O(1).
+    """
+    __slots__ = ("grid", "target", "cost", "dir_x", "dir_y")
+
+    def __init__(self, grid, target, cost, dir_x, dir_y):
+        self.grid = grid
+        self.target = target     # (x, y) in px
+        self.cost = cost
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+
+    def direction(self, x: float, y: float):
+        """Unit (dx, dy) to follow from (x, y); (0, 0) in the target cell."""
+        i = self.grid.cell_of(x, y)
+        return self.dir_x[i], self.dir_y[i]
+
+
+class NavGrid:
+    """
+    Coarse grid over the pool for flow-field navigation.
+
+    Every cell costs 1 to cross; cells along the walls and cells holding a
+    player cost more, so fields route around clumps instead of into them.
+    Flow fields are cached per target cell and rebuilt only when the
+    target moves to another cell or the occupancy changes.
+    """
+
+    def __init__(self, left, top, right, bottom, cell_px):
+        self.left, self.top = left, top
+        self.cell = cell_px
+        self.cols = max(1, int(math.ceil((right - left) / cell_px)))
+        self.rows = max(1, int(math.ceil((bottom - top) / cell_px)))
+
+        # static base cost: walls are slightly sticky
+        self.base_cost = [
+            1.0 + (NAV_WALL_COST if c in (0, self.cols - 1) or r in (0, self.rows - 1) else 0.0)
+            for r in range(self.rows) for c in range(self.cols)
+        ]
+        self.cost = list(self.base_cost)
+        self._occupied = ()
+        self._fields = {}   # target cell → FlowField (for the current occupancy)
+
+    def cell_of(self, x: float, y: float) -> int:
+        c = min(self.cols - 1, max(0, int((x - self.left) // self.cell)))
+        r = min(self.rows - 1, max(0, int((y - self.top) // self.cell)))
+        return r * self.cols + c
+
+    def center_of(self, i: int):
+        r, c = divmod(i, self.cols)
+        return (self.left + (c + 0.5) * self.cell,
+                self.top + (r + 0.5) * self.cell)
+
+    def set_occupancy(self, players):
+        """Mark the cells players are in. Call once per tick."""
+        occupied = tuple(sorted(self.cell_of(p.x, p.y) for p in players))
+        if occupied == self._occupied:
+            return
+        self._occupied = occupied
+        self.cost = list(self.base_cost)
+        for i in occupied:
+            self.cost[i] += NAV_OCCUPIED_COST
+        self._fields.clear()
+
+    def flow_field(self, tx: float, ty: float) -> FlowField:
+        """Flow field toward (tx, ty), shared by everyone heading there this tick."""
+        goal = self.cell_of(tx, ty)
+        field = self._fields.get(goal)
+        if field is None:
+            field = self._build(goal, (tx, ty))
+            self._fields[goal] = field
+        else:
+            field.target = (tx, ty)
+        return field
+
+    def _build(self, goal: int, target) -> FlowField:
+        cols, rows, cost = self.cols, self.rows, self.cost
+        n = cols * rows
+        dist = [math.inf] * n
+        dist[goal] = 0.0
+
+        # 1) Dijkstra outward from the target cell
+        heap = [(0.0, goal)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            r, c = divmod(i, cols)
+            for dc, dr, step in _NEIGHBOURS:
+                cc, rr = c + dc, r + dr
+                if 0 <= cc < cols and 0 <= rr < rows:
+                    j = rr * cols + cc
+                    nd = d + step * cost[j]
+                    if nd < dist[j]:
+                        dist[j] = nd
+                        heapq.heappush(heap, (nd, j))
+
+        # 2) Each cell points at its cheapest neighbour
+        dir_x = [0.0] * n
+        dir_y = [0.0] * n
+        for i in range(n):
+            if i == goal:
+                continue
+            r, c = divmod(i, cols)
+            best, best_d = None, dist[i]
+            for dc, dr, step in _NEIGHBOURS:
+                cc, rr = c + dc, r + dr
+                if 0 <= cc < cols and 0 <= rr < rows and dist[rr * cols + cc] < best_d:
+                    best, best_d = (dc / step, dr / step), dist[rr * cols + cc]
+            if best is not None:
+                dir_x[i], dir_y[i] = best
+
+        return FlowField(self, target, dist, dir_x, dir_y)
@@ -0,0 +1,327 @@
+# optimize.py
+#
+# Tune one team's formation offsets by playing headless matches. A
+# separable evolution strategy perturbs the role offsets of the chosen
+# formations, scores each candidate over a fixed set of seeded matches
+# against the other team's unchanged formations, and moves towards the
+# ones that did best.
+#
+# Everything lives in a run directory, so an interrupted run picks up
+# where it stopped:
+#   state.json                  search state after the last generation
+#   evals.jsonl                 one line per match played, keyed by a hash
+#                               of the formations, match length, seed,
+#                               config and EVAL_VERSION
+#   best_<team>_formations.json best formations found so far
+#
+#   python optimize.py --team green --generations 20 --matches 6
+#   python optimize.py --team green --forms "*_wall" center_court
+#   python optimize.py --team green --set max_depth=2.5     # tune for a deeper pool
+
+import argparse
+import copy
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from config import (
+    CACHE_DIR,
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+    DEFAULT_CONFIG,
+    SimConfig,
+    parse_settings,
+)
+
+PARAM_STEP_M = 0.01      # offsets are rounded to this, so near-identical candidates share evaluations
+POSSESSION_WEIGHT = 0.5  # fitness = goal difference per match + this × (possession share − ½)
+SIGMA_RATE = 0.2         # how fast per-offset step sizes adapt
+EVAL_VERSION = 1         # bump when headless matches play differently; old evals are then ignored
+
+
+# --------------------
+# Search space
+# --------------------
+class FormationSpace:
+    """
+    The (x, y) offsets of every role in the formations matching `patterns`
+    (fnmatch-style names), flattened into one parameter vector.
+    """
+
+    def __init__(self, formations: dict, patterns=("*",)):
+        self.base = formations
+        self.slots = [
+            (form, role, axis)
+            for form in sorted(formations)
+            if any(fnmatch.fnmatchcase(form, pat) for pat in patterns)
+            for role in sorted(formations[form])
+            for axis in (0, 1)
+        ]
+        if not self.slots:
+            raise ValueError(f"no formation matches {list(patterns)}")
+
+    def __len__(self):
+        return len(self.slots)
+
+    def vector(self, formations=None) -> list:
+        formations = formations or self.base
+        return [float(formations[form][role][axis]) for form, role, axis in self.slots]
+
+    def formations(self, vector) -> dict:
+        """The base formations with these offsets filled in."""
+        out = copy.deepcopy(self.base)
+        for (form, role, axis), v in zip(self.slots, vector):
+            out[form][role][axis] = round(round(v / PARAM_STEP_M) * PARAM_STEP_M, 6)
+        return out
+
+
+# --------------------
+# Evaluation
+# --------------------
+def _match(job) -> dict:
+    """One seeded headless match in a worker process."""
+    from sim import Simulation
+    from checkpoint import play_on
+    green, blue, seconds, seed, config = job
+    random.seed(seed)
+    sim = Simulation(green_formations=green, blue_formations=blue, seed=seed, config=config)
+    try:
+        return play_on(sim, seconds)
+    finally:
+        sim.planner.close()
+
+
+def eval_key(green: dict, blue: dict, seconds: float, seed: int, config=DEFAULT_CONFIG) -> str:
+    key = [EVAL_VERSION, green, blue, seconds, seed, config.settings()]
+    blob = json.dumps(key, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+class EvalCache:
+    """Match results by eval_key, kept in memory and appended to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.results = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        self.results[row["key"]] = row["result"]
+        self.file = open(path, "a")
+        self.hits = 0
+
+    def get(self, key):
+        result = self.results.get(key)
+        self.hits += result is not None
+        return result
+
+    def put(self, key, result):
+        self.results[key] = result
+        self.file.write(json.dumps({"key": key, "result": result}) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def fitness(team: str, results) -> float:
+    """Mean goal difference, with possession share as a tie-break."""
+    total = 0.0
+    for r in results:
+        other = "blue" if team == "green" else "green"
+        share = r["green_possession"] if team == "green" else 1.0 - r["green_possession"]
+        total += r["goals"][team] - r["goals"][other] + POSSESSION_WEIGHT * (share - 0.5)
+    return total / len(results)
+
+
+class Evaluator:
+    """Scores candidate formations for `team` over `seeds`, across a process pool."""
+
+    def __init__(self, team, opponent, seconds, seeds, cache, pool, config=DEFAULT_CONFIG):
+        self.team, self.opponent = team, opponent
+        self.seconds, self.seeds = seconds, list(seeds)
+        self.cache, self.pool = cache, pool
+        self.config = config
+        self.played = 0
+
+    def _job(self, formations, seed):
+        if self.team == "green":
+            return formations, self.opponent, self.seconds, seed, self.config
+        return self.opponent, formations, self.seconds, seed, self.config
+
+    def score(self, candidates) -> list:
+        """Fitness of each formations dict in `candidates`; cached matches aren't replayed."""
+        keys = [[eval_key(*self._job(c, s)) for s in self.seeds] for c in candidates]
+        todo = {}
+        for c, row in zip(candidates, keys):
+            for s, key in zip(self.seeds, row):
+                if key not in todo and self.cache.get(key) is None:
+                    todo[key] = self._job(c, s)
+        for key, result in zip(todo, self.pool.map(_match, todo.values())):
+            self.cache.put(key, result)
+        self.played += len(todo)
+        return [fitness(self.team, [self.cache.results[k] for k in row]) for row in keys]
+
+
+# --------------------
+# Search
+# --------------------
+class Search:
+    """
+    Separable evolution strategy: a mean vector and one step size per
+    offset. Each generation samples `popsize` candidates around the mean,
+    moves the mean to the weighted average of the best half, and widens or
+    narrows each step size by how far the winners strayed along it.
+    """
+
+    def __init__(self, mean, sigma, popsize=None, seed=None):
+        n = len(mean)
+        self.mean = list(mean)
+        self.sigma = [sigma] * n if isinstance(sigma, (int, float)) else list(sigma)
+        self.popsize = popsize or 4 + int(3 * math.log(n))
+        self.rng = random.Random(seed)
+        self.generation = 0
+        self.best = list(mean)
+        self.best_fitness = -math.inf
+        self.history = []    # best fitness of each generation
+
+        mu = self.popsize // 2
+        w = [math.log(mu + 0.5) - math.log(i + 1) for i in range(mu)]
+        self.weights = [x / sum(w) for x in w]
+
+    def ask(self):
+        """(z, x) pairs: z the standard-normal step, x the candidate."""
+        out = []
+        for _ in range(self.popsize):
+            z = [self.rng.gauss(0.0, 1.0) for _ in self.mean]
+            out.append((z, [m + s * zi for m, s, zi in zip(self.mean, self.sigma, z)]))
+        return out
+
+    def tell(self, population, scores):
+        ranked = sorted(zip(scores, range(len(scores))), reverse=True)
+        if ranked[0][0] > self.best_fitness:
+            self.best_fitness, self.best = ranked[0][0], list(population[ranked[0][1]][1])
+        chosen = [population[i] for _, i in ranked[:len(self.weights)]]
+
+        # 1) mean → weighted average of the winners
+        self.mean = [sum(w * x[d] for w, (_, x) in zip(self.weights, chosen))
+                     for d in range(len(self.mean))]
+        # 2) step sizes: winners far out along a dimension widen it, close in narrow it
+        for d in range(len(self.sigma)):
+            spread = sum(w * z[d] ** 2 for w, (z, _) in zip(self.weights, chosen))
+            self.sigma[d] *= math.exp(0.5 * SIGMA_RATE * (spread - 1.0))
+        self.generation += 1
+        self.history.append(ranked[0][0])
+
+    def state(self) -> dict:
+        version, internal, gauss = self.rng.getstate()
+        return {
+            "generation": self.generation, "mean": self.mean, "sigma": self.sigma,
+            "popsize": self.popsize, "best": self.best, "best_fitness": self.best_fitness,
+            "history": self.history, "rng": [version, list(internal), gauss],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        s = cls(state["mean"], state["sigma"], state["popsize"])
+        s.generation, s.history = state["generation"], state["history"]
+        s.best, s.best_fitness = state["best"], state["best_fitness"]
+        version, internal, gauss = state["rng"]
+        s.rng.setstate((version, tuple(internal), gauss))
+        return s
+
+
+def _write_json(path, data):
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def optimize(team, green, blue, run_dir, patterns=("*",), generations=10, popsize=None,
+             matches=4, seconds=60.0, sigma=0.5, workers=None, seed=0, config=DEFAULT_CONFIG,
+             log=sys.stderr):
+    """
+    Run (or resume) a search in `run_dir`; returns (best formations, fitness).
+    `green`/`blue` are formations dicts; the other team's are never changed.
+    Every match is played under `config` (a SimConfig).
+    """
+    os.makedirs(run_dir, exist_ok=True)
+    space = FormationSpace(green if team == "green" else blue, patterns)
+    opponent = blue if team == "green" else green
+    state_path = os.path.join(run_dir, "state.json")
+    best_path = os.path.join(run_dir, f"best_{team}_formations.json")
+
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            search = Search.from_state(json.load(f))
+        print(f"resuming at generation {search.generation}", file=log)
+    else:
+        search = Search(space.vector(), sigma, popsize, seed)
+
+    cache = EvalCache(os.path.join(run_dir, "evals.jsonl"))
+    seeds = range(seed, seed + matches)      # the same matches for every candidate
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            ev = Evaluator(team, opponent, seconds, seeds, cache, pool, config)
+            if search.generation == 0:
+                baseline = ev.score([space.formations(space.vector())])[0]
+                search.best_fitness = baseline
+                print(f"baseline fitness {baseline:+.3f} over {matches} matches", file=log)
+
+            while search.generation < generations:
+                population = search.ask()
+                scores = ev.score([space.formations(x) for _, x in population])
+                search.tell(population, scores)
+                _write_json(best_path, space.formations(search.best))
+                _write_json(state_path, search.state())
+                print(f"generation {search.generation}: best {max(scores):+.3f}, "
+                      f"overall {search.best_fitness:+.3f}, mean step "
+                      f"{sum(search.sigma) / len(search.sigma):.3f} m, "
+                      f"{ev.played} matches played, {cache.hits} cached", file=log)
+    finally:
+        cache.close()
+    return space.formations(search.best), search.best_fitness
+
+
+# --------------------
+# Command line
+# --------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Optimise a team's formation offsets.")
+    ap.add_argument("--team", choices=("green", "blue"), default="green")
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    ap.add_argument("--forms", nargs="+", default=["*"], metavar="PATTERN",
+                    help="formations to tune, e.g. center_court '*teammate_possession*'")
+    ap.add_argument("--run", metavar="DIR", help="run directory (resumed if it exists)")
+    ap.add_argument("--out", metavar="PATH", help="also write the best formations here")
+    ap.add_argument("--generations", type=int, default=10)
+    ap.add_argument("--popsize", type=int, default=None)
+    ap.add_argument("--matches", type=int, default=4, help="seeded matches per candidate")
+    ap.add_argument("--seconds", type=float, default=60.0, help="length of each match")
+    ap.add_argument("--sigma", type=float, default=0.5, help="initial step size (m)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                    help="override a SimConfig setting for every match, e.g. max_depth=2.5")
+    args = ap.parse_args(argv)
+
+    run_dir = args.run or os.path.join(CACHE_DIR, "optimize", args.team)
+    best, score = optimize(args.team, load_formations(args.green), load_formations(args.blue),
+                           run_dir, args.forms, args.generations, args.popsize, args.matches,
+                           args.seconds, args.sigma, args.workers, args.seed,
+                           SimConfig(**parse_settings(args.set)))
+    if args.out:
+        _write_json(args.out, best)
+    print(f"best fitness {score:+.3f}; formations in {args.out or run_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
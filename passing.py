@@ -0,0 +1,155 @@
+# passing.py
+
+import math
+from collections import namedtuple
+
+from physics import get_triangle_vertices
+
+
+# --------------------
+# Tuning
+# --------------------
+PASS_RANGE_M = 3         # longest pass (plus the receiver's pickup reach)
+LANE_CLEAR_M = 1.0       # opponents further than this from a lane don't threaten it
+CACHE_CELL_M = 0.5       # positions are quantized to this for the cache key
+CACHE_ANGLE_STEP = math.radians(15)
+CACHE_DEPTH_STEP = 0.25  # m
+
+PassOption = namedtuple(
+    "PassOption",
+    "passer_id receiver_id distance clearance risk openness score"
+)
+
+
+# --------------------
+# Geometry
+# --------------------
+def _cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def _segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+    d1 = _cross(cx, cy, dx, dy, ax, ay)
+    d2 = _cross(cx, cy, dx, dy, bx, by)
+    d3 = _cross(ax, ay, bx, by, cx, cy)
+    d4 = _cross(ax, ay, bx, by, dx, dy)
+    return (d1 * d2 < 0) and (d3 * d4 < 0)
+
+
+def _point_segment_dist(px, py, ax, ay, bx, by):
+    vx, vy = bx - ax, by - ay
+    L2 = vx * vx + vy * vy
+    t = 0.0 if L2 == 0 else max(0.0, min(1.0, ((px - ax) * vx + (py - ay) * vy) / L2))
+    return math.hypot(px - (ax + t * vx), py - (ay + t * vy))
+
+
+def _point_in_triangle(px, py, tri):
+    (x1, y1), (x2, y2), (x3, y3) = tri
+    d1 = _cross(x1, y1, x2, y2, px, py)
+    d2 = _cross(x2, y2, x3, y3, px, py)
+    d3 = _cross(x3, y3, x1, y1, px, py)
+    has_neg = d1 < 0 or d2 < 0 or d3 < 0
+    has_pos = d1 > 0 or d2 > 0 or d3 > 0
+    return not (has_neg and has_pos)
+
+
+def segment_triangle_distance(ax, ay, bx, by, tri) -> float:
+    """0 if the segment AB touches the triangle, else the gap between them."""
+    if _point_in_triangle(ax, ay, tri) or _point_in_triangle(bx, by, tri):
+        return 0.0
+    best = math.inf
+    for k in range(3):
+        cx, cy = tri[k]
+        dx, dy = tri[(k + 1) % 3]
+        if _segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+            return 0.0
+        best = min(best,
+                   _point_segment_dist(cx, cy, ax, ay, bx, by),
+                   _point_segment_dist(ax, ay, cx, cy, dx, dy),
+                   _point_segment_dist(bx, by, cx, cy, dx, dy))
+    return best
+
+
+# --------------------
+# Lane evaluation
+# --------------------
+def _config_key(snap, color):
+    """Coarse fingerprint of everything a team's pass table depends on."""
+    cell = CACHE_CELL_M * snap.config.scale
+    return (color,) + tuple(
+        (p.unique_id,
+         int(p.x // cell), int(p.y // cell),
+         int(p.angle // CACHE_ANGLE_STEP), int(p.depth // CACHE_DEPTH_STEP))
+        for p in snap.players
+    )
+
+
+def evaluate_lanes(snap, color, table):
+    """
+    Score every passer → receiver pair on one team.
+
+    Each lane is tested once against every opponent's triangle. An
+    opponent's threat scales with how deep they are, because the puck
+    travels along the bottom and a surfaced player can't reach it.
+    Returns passer_id → [PassOption, …] best first.
+    """
+    cfg = snap.config
+    pass_range = PASS_RANGE_M * cfg.scale + cfg.player_radius * 1.2
+    lane_clear = LANE_CLEAR_M * cfg.scale
+    mates = [p for p in snap.players if p.color == color]
+    opps = [(get_triangle_vertices(q), q.depth / cfg.max_depth)
+            for q in snap.players if q.color != color]
+
+    options = {}
+    for passer in mates:
+        row = []
+        for receiver in mates:
+            if receiver is passer:
+                continue
+            dist = table.distance(passer, receiver)
+            if dist > pass_range:
+                continue
+
+            # 1) Clearance & depth-weighted interception risk along the lane
+            clearance = math.inf
+            risk = 0.0
+            for tri, depth_w in opps:
+                gap = segment_triangle_distance(passer.x, passer.y,
+                                                receiver.x, receiver.y, tri)
+                clearance = min(clearance, gap)
+                if gap < lane_clear:
+                    risk = max(risk, depth_w * (1.0 - gap / lane_clear))
+
+            # 2) How much room the receiver has once it arrives
+            openness = min(1.0, table.get(receiver, "nearest_opp_dist") / (3 * cfg.scale))
+            progress = 1.0 if (table.get(receiver, "dist_opp_goal")
+                               < table.get(passer, "dist_opp_goal")) else 0.5
+            score = openness * progress * (1.0 - risk)
+            row.append(PassOption(passer.unique_id, receiver.unique_id,
+                                  dist, clearance, risk, openness, score))
+        row.sort(key=lambda o: o.score, reverse=True)
+        options[passer.unique_id] = row
+    return options
+
+
+def pass_options(snap, color, table):
+    """
+    evaluate_lanes(), reused across ticks until some player of either team
+    moves to a different cache cell, turns, or changes depth band.
+    The cache is the sim's own (`snap.pass_lanes`: color → (config key,
+    options)), so sims in one process never share lanes.
+    """
+    cache = snap.pass_lanes
+    key = _config_key(snap, color)
+    hit = cache.get(color)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    options = evaluate_lanes(snap, color, table)
+    cache[color] = (key, options)
+    return options
+
+
+def best_pass(player, snap, table):
+    """Best PassOption for `player` this tick, or None if nobody is in range."""
+    row = pass_options(snap, player.color, table).get(player.unique_id)
+    return row[0] if row else None
@@ -1,18 +1,49 @@
 # physics.py
-import random
 import math
-from config import COLLISION_DEPTH_THRESHOLD, FORMATION_THRESHOLD, PIVOT_STEP, SPRINT_SPEED
-from player import PLAYER_RADIUS
-from player import get_triangle_vertices
-from config import SPRINT_SPEED
+from config import PIVOT_STEP, SPRINT_SPEED, PLAYER_RADIUS
 
 
+def get_triangle_vertices(player, center_x=None, center_y=None, angle=None):
+    """
+    Return the three (x,y) vertices of a player's triangle, as Player.draw() shows it.
+
+    If center_x/center_y/angle are omitted, uses the player's current state.
+    """
+    if center_x is None:
+        center_x = player.x
+    if center_y is None:
+        center_y = player.y
+    if angle is None:
+        angle = player.angle
+
+    R = PLAYER_RADIUS
+    fx = math.sin(angle)
+    fy = -math.cos(angle)
+    rx = math.cos(angle)
+    ry = math.sin(angle)
+
+    tip = (
+        center_x + R * fx,
+        center_y + R * fy
+    )
+    bl = (
+        center_x - (R / 2) * fx + (R / 2) * rx,
+        center_y - (R / 2) * fy + (R / 2) * ry
+    )
+    br = (
+        center_x - (R / 2) * fx - (R / 2) * rx,
+        center_y - (R / 2) * fy - (R / 2) * ry
+    )
+
+    return [tip, bl, br]
+
 
 def project_polygon(polygon, axis):
     """Projects all vertices onto the given normalized axis."""
-    projections = [v[0]*axis[0] + v[1]*axis[1] for v in polygon]
+    projections = [v[0] * axis[0] + v[1] * axis[1] for v in polygon]
     return min(projections), max(projections)
 
+
 def polygons_collide(poly1, poly2, epsilon=1.5):
     """
     SAT collision check with margin (epsilon). Returns True if polygons collide.
@@ -37,96 +68,75 @@ def polygons_collide(poly1, poly2, epsilon=1.5):
                 return False
     return True
 
-def is_collision(player, new_x, new_y, all_players):
-    """
-    Returns True if moving `player` to (new_x,new_y) collides
-    with any other player at similar depth.
-    """
-    from player import get_triangle_vertices
-
-    tri1 = get_triangle_vertices(player, center_x=new_x, center_y=new_y, angle=player.angle)
-    for other in all_players.values():
-        if other is player:
-            continue
-        if abs(other.depth - player.depth) >= COLLISION_DEPTH_THRESHOLD:
-            continue
-        tri2 = get_triangle_vertices(other)
-        if polygons_collide(tri1, tri2, epsilon=1.5):
-            return True
-    return False
-
-def move_toward(player, tx, ty, threshold, all_players):
+
+def preferred_velocity(player, tx, ty, threshold, field=None):
     """
-    Pivot toward (tx, ty), then move forward if no collision.
-    If blocked, try sidestepping. If still blocked, try alternate nearby targets.
+    Velocity (px/frame) the player would like this frame to reach (tx, ty).
+
+    With a navigation.FlowField the heading comes from the field (O(1)),
+    which already routes around clumps; within a cell and a half of the
+    target, or without a field, it points straight at the target.
     """
     dx = tx - player.x
     dy = ty - player.y
     dist = math.hypot(dx, dy)
 
     if dist < threshold:
+        return 0.0, 0.0
+
+    speed = min(SPRINT_SPEED, dist)
+    ux, uy = dx / dist, dy / dist
+    if field is not None and dist > field.grid.cell * 1.5:
+        fx, fy = field.direction(player.x, player.y)
+        if fx or fy:
+            ux, uy = fx, fy
+    return ux * speed, uy * speed
+
+
+def steer(player, vx, vy, pool_left, pool_right, pool_top, pool_bottom):
+    """
+    Pivot toward velocity (vx, vy) and move along it, slowed by how far
+    the player still has to turn. Keeps the player inside the pool.
+    """
+    speed = math.hypot(vx, vy)
+    if speed < 1e-6:
         return
 
-    desired = math.atan2(dy, dx) + math.pi / 2
+    desired = math.atan2(vy, vx) + math.pi / 2
     diff = (desired - player.angle + math.pi) % (2 * math.pi) - math.pi
     turn = max(-PIVOT_STEP, min(PIVOT_STEP, diff))
-    new_angle = player.angle + turn
-    player.update_angle(new_angle)
+    player.update_angle(player.angle + turn)
 
-    step = min(SPRINT_SPEED, dist)
-    fx = math.sin(player.angle)
-    fy = -math.cos(player.angle)
+    # can't swim sideways at full speed
+    scale = max(0.0, math.cos(diff - turn))
+    new_x = player.x + vx * scale
+    new_y = player.y + vy * scale
+    new_x = max(pool_left + PLAYER_RADIUS, min(pool_right - PLAYER_RADIUS, new_x))
+    new_y = max(pool_top + PLAYER_RADIUS, min(pool_bottom - PLAYER_RADIUS, new_y))
+    player.update_position(new_x - player.x, new_y - player.y)
 
-    new_x = player.x + fx * step
-    new_y = player.y + fy * step
 
-    if not is_collision(player, new_x, new_y, all_players):
-        player.update_position(fx * step, fy * step)
-        return
+def human_move(player, keys, pool_left, pool_right, pool_top, pool_bottom):
+    """
+    One tick of keyboard control: Left/Right pivot in place, Up swims
+    forward along the facing, clamped inside the pool.
+
+    Only sets .x, .y and .angle, so clients can run it on a stand-in to
+    predict their own player.
+    """
+    # 1) Pivot in place
+    if "Left" in keys:
+        player.angle = player.angle - PIVOT_STEP
+    if "Right" in keys:
+        player.angle = player.angle + PIVOT_STEP
+
+    # 2) Move forward when Up is held
+    if "Up" in keys:
+        dx = math.sin(player.angle) * SPRINT_SPEED
+        dy = -math.cos(player.angle) * SPRINT_SPEED
+        player.x = max(pool_left + PLAYER_RADIUS, min(pool_right - PLAYER_RADIUS, player.x + dx))
+        player.y = max(pool_top + PLAYER_RADIUS, min(pool_bottom - PLAYER_RADIUS, player.y + dy))
 
-    # Try sidestepping ±15°, ±30°, ±45°
-    for sidestep_deg in [15, -15, 30, -30, 45, -45]:
-        offset = math.radians(sidestep_deg)
-        sidestep_angle = player.angle + offset
-        sidestep_dx = math.sin(sidestep_angle) * step
-        sidestep_dy = -math.cos(sidestep_angle) * step
-        sidestep_x = player.x + sidestep_dx
-        sidestep_y = player.y + sidestep_dy
-
-        if not is_collision(player, sidestep_x, sidestep_y, all_players):
-            player.update_angle(sidestep_angle)
-            player.update_position(sidestep_dx, sidestep_dy)
-            return
-
-    # --- Fallback: try nearby clear positions as temporary targets ---
-    fallback_radius = PLAYER_RADIUS * 2
-    fallback_attempts = 6
-    for _ in range(fallback_attempts):
-        angle = random.uniform(0, 2 * math.pi)
-        alt_x = player.x + math.cos(angle) * fallback_radius
-        alt_y = player.y + math.sin(angle) * fallback_radius
-
-        alt_dx = alt_x - player.x
-        alt_dy = alt_y - player.y
-        alt_dist = math.hypot(alt_dx, alt_dy)
-        if alt_dist < 1e-3:
-            continue
-
-        alt_angle = math.atan2(alt_dy, alt_dx) + math.pi / 2
-        fx = math.sin(alt_angle)
-        fy = -math.cos(alt_angle)
-        step = min(SPRINT_SPEED, alt_dist)
-
-        trial_x = player.x + fx * step
-        trial_y = player.y + fy * step
-
-        if not is_collision(player, trial_x, trial_y, all_players):
-            player.update_angle(alt_angle)
-            player.update_position(fx * step, fy * step)
-            return
-
-    # Still stuck? final fallback — small random nudge
-    player.update_angle(player.angle + random.uniform(-0.05, 0.05))
 
 def compute_target_for_player(
     player,
@@ -137,9 +147,6 @@ def compute_target_for_player(
     pool_top, pool_bottom,
     SCALE
 ):
-    import math
-    from player import PLAYER_RADIUS
-
     def get_offside_back_position(player, ref_x, ref_y, defending_side):
         goal_center_x = (pool_left + pool_right) / 2
         goal_center_y = pool_bottom if defending_side == "bottom" else pool_top
@@ -156,16 +163,16 @@ def compute_target_for_player(
     # --- 1) Offside‐backs (only the single back on the wrong side) ---
     if "leftwall" in formation_name:
         # on left wall we only offside the back furthest from the wall
-        if player.color=="green" and player.label=="RB":
+        if player.color == "green" and player.label == "RB":
             return get_offside_back_position(player, ref_x, ref_y, "bottom")
-        if player.color=="blue"  and player.label=="LB":
+        if player.color == "blue" and player.label == "LB":
             return get_offside_back_position(player, ref_x, ref_y, "top")
 
     elif "rightwall" in formation_name:
         # on right wall we only offside the back furthest from the wall
-        if player.color=="green" and player.label=="LB":
+        if player.color == "green" and player.label == "LB":
             return get_offside_back_position(player, ref_x, ref_y, "bottom")
-        if player.color=="blue"  and player.label=="RB":
+        if player.color == "blue" and player.label == "RB":
             return get_offside_back_position(player, ref_x, ref_y, "top")
 
     # --- 2) Everyone else (forwards, center, the other back) just follow JSON offsets ---
@@ -179,7 +186,7 @@ def compute_target_for_player(
     ty = ref_y + offset_y_m * SCALE
 
     # --- 3) Clamp inside pool bounds (so no one ever swims out) ---
-    tx = max(pool_left  + PLAYER_RADIUS, min(pool_right  - PLAYER_RADIUS, tx))
-    ty = max(pool_top   + PLAYER_RADIUS, min(pool_bottom - PLAYER_RADIUS, ty))
+    tx = max(pool_left + PLAYER_RADIUS, min(pool_right - PLAYER_RADIUS, tx))
+    ty = max(pool_top + PLAYER_RADIUS, min(pool_bottom - PLAYER_RADIUS, ty))
 
     return tx, ty
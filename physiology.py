@@ -3,40 +3,41 @@
 import random
 import math
 
-# Constants (you can hoist some of these into config.py if you like)
-MAX_DEPTH               = 2.0               # meters
-DEPTH_STEP              = 0.1               # m per frame
-BASE_MAX_BREATH         = 20.0              # seconds at long_term_stamina=1
-SHORT_TERM_REGEN_RATE   = 0.2               # sec recovered per sec on surface
-LONG_TERM_PENALTY_RATE  = 0.02              # fraction lost per full dive
-EXTRA_DIVE_PENALTY_FACTOR = 1.5
-MIN_SHORT_TERM           = 5.0
-MIN_LONG_TERM            = 0.5
-SURFACE_LOCK_DURATION    = 3.0               # seconds
+# The breath and depth settings (max depth, breath, regeneration, the AI's
+# dive range, ...) come from a config.SimConfig, DEFAULT_CONFIG unless the
+# Simulation passes its own.
+from config import DEFAULT_CONFIG
 
-def init_player_phys(player):
+def init_player_phys(player, config=DEFAULT_CONFIG):
     """Call once when you create each Player."""
     player.depth              = 0.0
     player.submerging         = False
     player.current_dive_time  = 0.0
-    player.short_term_stamina = BASE_MAX_BREATH
+    player.short_term_stamina = config.base_max_breath
     player.long_term_stamina  = 1.0
     player.surface_lock_timer = 0.0
     player.dive_threshold     = None  # assigned later for AI
+    player.dive_intent        = None  # AI planner's dive (True) / surface (False) choice
+
+def release_surface_lock(player):
+    """Scheduler callback: the player may dive again."""
+    player.surface_lock_timer = 0.0
 
 def update_player_breath_hold(player,
                               dt: float,
                               is_controlled: bool,
                               want_to_dive: bool,
-                              canvas=None,
-                              puck=None,
-                              keys_pressed=None,
-                              controlled_player=None):
+                              puck_pos=None,
+                              scheduler=None,
+                              config=DEFAULT_CONFIG):
     """
     - dt: seconds since last frame
     - is_controlled: True if user is controlling this player
     - want_to_dive: for controlled only, True if 's' held
-    - canvas, puck, keys_pressed, controlled_player only needed for AI logic
+    - puck_pos: (x, y) of the puck, only needed for AI logic
+    - scheduler: optional EventScheduler; when given, the surface lock is
+      released by an event instead of being counted down here
+    - config: the SimConfig whose breath and depth settings apply
     """
 
     # 1) Bench players (if you ever tag one with player.role="bench")
@@ -45,7 +46,8 @@ def update_player_breath_hold(player,
 
     # 2) Surface‐lock countdown: force surfaced while >0
     if player.surface_lock_timer > 0:
-        player.surface_lock_timer = max(0.0, player.surface_lock_timer - dt)
+        if scheduler is None:
+            player.surface_lock_timer = max(0.0, player.surface_lock_timer - dt)
         player.submerging = False
     else:
         # 3) Decide submerging
@@ -54,71 +56,71 @@ def update_player_breath_hold(player,
             player.submerging = want_to_dive and player.short_term_stamina > 0
         else:
             # AI: dive if near puck (and have breath)
-            # must pass in canvas, puck, etc. into this call
-            if canvas is None or puck is None:
-                raise RuntimeError("AI breath logic needs canvas & puck")
-            x1,y1,x2,y2 = canvas.coords(puck)
-            puck_x, puck_y = (x1+x2)/2, (y1+y2)/2
+            # must pass in the puck position for this
+            if puck_pos is None:
+                raise RuntimeError("AI breath logic needs puck_pos")
+            puck_x, puck_y = puck_pos
             dist = math.hypot(player.x - puck_x, player.y - puck_y)
-            player.submerging = dist < 150 and player.short_term_stamina > 0
+            if player.dive_intent is not None:
+                # the utility AI has already weighed puck distance against breath
+                player.submerging = player.dive_intent and player.short_term_stamina > 0
+            else:
+                player.submerging = dist < config.ai_dive_range and player.short_term_stamina > 0
 
             # if starting a new dive, give them a random threshold
             if player.submerging and (player.dive_threshold is None or player.current_dive_time == 0):
-                player.dive_threshold = random.uniform(6, 14)
+                player.dive_threshold = random.uniform(*config.dive_threshold_range)
 
     # 4) If submerging → descend & deplete breath
     if player.submerging:
         player.current_dive_time += dt
-        player.depth = min(MAX_DEPTH, player.depth + DEPTH_STEP)
+        player.depth = min(config.max_depth, player.depth + config.depth_step)
         player.short_term_stamina = max(0.0, player.short_term_stamina - dt)
 
         # decide threshold: user uses their effective_max, AI uses own threshold
         if is_controlled:
             threshold = min(player.short_term_stamina,
-                            BASE_MAX_BREATH * player.long_term_stamina)
+                            config.base_max_breath * player.long_term_stamina)
         else:
             threshold = player.dive_threshold
 
         if player.current_dive_time >= threshold:
             # force them to surface
             player.submerging = False
-            player.surface_lock_timer = SURFACE_LOCK_DURATION
+            player.surface_lock_timer = config.surface_lock_duration
+            if scheduler is not None:
+                scheduler.schedule(config.surface_lock_duration, release_surface_lock, player)
             if not is_controlled:
                 # re-roll for next AI dive
-                player.dive_threshold = random.uniform(6, 14)
+                player.dive_threshold = random.uniform(*config.dive_threshold_range)
 
     else:
         # 5) Surfacing behaviour
         # float upward
-        player.depth = max(0.0, player.depth - DEPTH_STEP)
+        player.depth = max(0.0, player.depth - config.depth_step)
 
         # if just surfaced fully after a dive
         if player.depth == 0.0 and player.current_dive_time > 0:
             # extra‐dive penalty
             if player.current_dive_time > 10:
-                penalty = (player.current_dive_time - 10) * EXTRA_DIVE_PENALTY_FACTOR
+                penalty = (player.current_dive_time - 10) * config.extra_dive_penalty_factor
             else:
-                penalty = (player.current_dive_time / 10) * EXTRA_DIVE_PENALTY_FACTOR
+                penalty = (player.current_dive_time / 10) * config.extra_dive_penalty_factor
 
             player.short_term_stamina = max(
-                MIN_SHORT_TERM,
+                config.min_short_term,
                 player.short_term_stamina - penalty
             )
             player.long_term_stamina = max(
-                MIN_LONG_TERM,
+                config.min_long_term,
                 player.long_term_stamina - 
-                  LONG_TERM_PENALTY_RATE * (player.current_dive_time / BASE_MAX_BREATH)
+                  config.long_term_penalty_rate * (player.current_dive_time / config.base_max_breath)
             )
             player.current_dive_time = 0.0
 
         # regen short‐term up to new potential max
-        potential_max = BASE_MAX_BREATH * player.long_term_stamina
+        potential_max = config.base_max_breath * player.long_term_stamina
         player.short_term_stamina = min(
             potential_max,
-            player.short_term_stamina + SHORT_TERM_REGEN_RATE * dt
+            player.short_term_stamina + config.short_term_regen_rate * dt
         )
-
-    # 6) (Optional) update their color/shading if you want here,
-    #     or call player.update_color() back in game.update()
-    if hasattr(player, "update_color"):
-        player.update_color(player.color)
@@ -0,0 +1,141 @@
+# planner.py
+
+from collections import namedtuple
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from ai import plan_actions
+from config import AI_PLAN_BUDGET
+
+
+# --------------------
+# Immutable snapshots of the simulation
+# --------------------
+PlayerSnapshot = namedtuple(
+    "PlayerSnapshot",
+    "unique_id label color x y angle depth "
+    "submerging current_dive_time short_term_stamina long_term_stamina "
+    "surface_lock_timer dive_threshold"
+)
+
+SimSnapshot = namedtuple(
+    "SimSnapshot",
+    [
+        "tick",
+        "players",              # tuple of PlayerSnapshot
+        "possessing_player",    # PlayerSnapshot or None (same object as in players)
+        "chaser",
+        "blue_chaser",
+        "controlled_player",
+        "humans",               # unique_ids of every human-driven player
+        "puck_x", "puck_y", "puck_radius",
+        "green_form", "blue_form",
+        "ref_x", "ref_y",       # green formation anchor
+        "free_green", "free_blue",
+        "pool_left", "pool_right", "pool_top", "pool_bottom",
+        "pass_lanes",           # the sim's pass-lane cache (see passing.pass_options)
+        "config",               # the sim's config.SimConfig
+    ]
+)
+
+
+def take_snapshot(sim, tick, ref_x, ref_y) -> SimSnapshot:
+    """
+    Copy everything the AI reads out of `sim` into plain tuples, so a
+    planner on another thread never sees the live state change under it.
+    """
+    by_id = {
+        uid: PlayerSnapshot(
+            uid, p.label, p.color, p.x, p.y, p.angle, p.depth,
+            p.submerging, p.current_dive_time, p.short_term_stamina,
+            p.long_term_stamina, p.surface_lock_timer, p.dive_threshold
+        )
+        for uid, p in sim.players.items()
+    }
+
+    def snap(p):
+        return by_id[p.unique_id] if p is not None else None
+
+    return SimSnapshot(
+        tick=tick,
+        players=tuple(by_id.values()),
+        possessing_player=snap(sim.possessing_player),
+        chaser=snap(sim.chaser),
+        blue_chaser=snap(sim.blue_chaser),
+        controlled_player=snap(sim.controlled_player),
+        humans=tuple(p.unique_id for p in sim.controlled.values() if p is not None),
+        puck_x=sim.puck_x, puck_y=sim.puck_y, puck_radius=sim.puck_radius,
+        green_form=sim.green_form, blue_form=sim.blue_form,
+        ref_x=ref_x, ref_y=ref_y,
+        free_green=sim.free_green, free_blue=sim.free_blue,
+        pool_left=sim.pool_left, pool_right=sim.pool_right,
+        pool_top=sim.pool_top, pool_bottom=sim.pool_bottom,
+        pass_lanes=sim.pass_lanes,
+        config=sim.config,
+    )
+
+
+# --------------------
+# Planners
+# --------------------
+class Planner:
+    """
+    Synchronous planner: the plan for a snapshot is ready as soon as it is
+    submitted. Deterministic (no wall-clock decision budget), so it is the
+    default for headless runs.
+    """
+
+    def __init__(self):
+        self._plan = {}
+
+    def submit(self, snapshot):
+        """Hand over the state for this tick."""
+        self._plan = plan_actions(snapshot, budget=None)
+
+    def collect(self) -> dict:
+        """Return the newest completed plan: unique_id → Action."""
+        return self._plan
+
+    def close(self):
+        pass
+
+
+class AsyncPlanner(Planner):
+    """
+    Plans on a worker thread (or any concurrent.futures executor).
+
+    submit() starts a job only when the previous one has finished, so an
+    overrunning planner never queues up work. collect() waits at most
+    `budget` seconds for the running job; if it is still busy the last
+    completed plan is returned instead, and the sim keeps its frame rate.
+    """
+
+    def __init__(self, budget: float = AI_PLAN_BUDGET, executor=None):
+        super().__init__()
+        self.budget = budget
+        self._owns_executor = executor is None
+        if executor is None:
+            # imported here so the synchronous planner never loads the thread pool
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-planner")
+        self._executor = executor
+        self._future = None
+        self.overruns = 0    # ticks that fell back to an older plan
+
+    def submit(self, snapshot):
+        if self._future is None:
+            self._future = self._executor.submit(plan_actions, snapshot)
+
+    def collect(self) -> dict:
+        if self._future is None:
+            return self._plan
+        try:
+            self._plan = self._future.result(timeout=self.budget)
+        except FutureTimeout:
+            self.overruns += 1
+            return self._plan
+        self._future = None
+        return self._plan
+
+    def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
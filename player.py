@@ -1,14 +1,15 @@
 # player.py
 
 import math
-import tkinter as tk
-from config import SCALE
+from config import PLAYER_RADIUS
+
 
 # -------------------------------------------------------------------
 # Constants
 # -------------------------------------------------------------------
-# Radius of the triangular player in pixels
-PLAYER_RADIUS = (1.82 * SCALE) / 1.5
+# Smallest turn (radians) worth redrawing the triangle for
+LOD_ANGLE = 0.02
+
 
 # -------------------------------------------------------------------
 # Player Class
@@ -16,11 +17,13 @@ PLAYER_RADIUS = (1.82 * SCALE) / 1.5
 class Player:
     """
     Represents a single player as a colored triangle with a label.
+    With canvas=None the player is headless and never draws; otherwise
+    `canvas` is a tkinter Canvas (or anything with the same item methods).
     """
 
     def __init__(
         self,
-        canvas: tk.Canvas,
+        canvas,
         x: float,
         y: float,
         color: str,
@@ -38,21 +41,43 @@ class Player:
         self.y = y
         self.angle = angle
         self.base_color = color
-        self.color = color
-
+        self.color = color          # team
+        self.fill = color           # what is drawn; shaded by depth in the front end
 
         # Depth (for collision checks); 0 = surface
         self.depth = 0.0
 
-        # Canvas items (created on first draw)
+        # Movement last frame (px/frame), read by local avoidance
+        self.vx = 0.0
+        self.vy = 0.0
+
+        # Canvas items (created on first draw) and what they last showed
         self.polygon = None
         self.text = None
+        self._drawn = None          # (x, y, angle) at the last redraw
+        self._drawn_color = None
 
         # Initial draw
         self.draw()
 
-    def draw(self):
-        """Draw or update the triangle and its label."""
+    def draw(self, min_move: float = 0.0):
+        """
+        Draw or update the triangle and its label.
+
+        Skips the canvas work when the player has moved less than
+        `min_move` px and turned less than LOD_ANGLE since the last redraw.
+        """
+        if self.canvas is None:
+            return
+
+        moved = True
+        if self._drawn is not None:
+            x0, y0, a0 = self._drawn
+            moved = (abs(self.x - x0) > min_move or abs(self.y - y0) > min_move
+                     or abs(self.angle - a0) > LOD_ANGLE)
+        if not moved and self.fill == self._drawn_color:
+            return
+
         R = PLAYER_RADIUS
         fx = math.sin(self.angle)
         fy = -math.cos(self.angle)
@@ -76,72 +101,33 @@ class Player:
 
         if self.polygon:
             # Update existing
-            self.canvas.coords(self.polygon, *points)
-            self.canvas.itemconfig(self.polygon, fill=self.color)
-            self.canvas.coords(self.text, self.x, self.y)
-            self.canvas.itemconfig(self.text, text=self.label)
+            if moved:
+                self.canvas.coords(self.polygon, *points)
+                self.canvas.coords(self.text, self.x, self.y)
+            if self.fill != self._drawn_color:
+                self.canvas.itemconfig(self.polygon, fill=self.fill)
         else:
             # Create new
             self.polygon = self.canvas.create_polygon(
-                points, fill=self.color, outline="black", width=2
+                points, fill=self.fill, outline="black", width=2
             )
             self.text = self.canvas.create_text(
                 self.x, self.y, text=self.label,
                 font=("Helvetica", 12, "bold"), fill="white"
             )
+        if moved:
+            self._drawn = (self.x, self.y, self.angle)
+        self._drawn_color = self.fill
 
     def update_position(self, dx: float, dy: float):
-        """Move the player by (dx, dy) in canvas coordinates."""
+        """Move the player by (dx, dy) in canvas coordinates; shown on the next draw()."""
         self.x += dx
         self.y += dy
-        self.canvas.move(self.polygon, dx, dy)
-        self.canvas.move(self.text, dx, dy)
 
     def update_angle(self, new_angle: float):
-        """Rotate the player to `new_angle` (in radians) and redraw."""
+        """Rotate the player to `new_angle` (in radians); shown on the next draw()."""
         self.angle = new_angle
-        self.draw()
 
     def update_color(self, new_color: str):
-        """Change the player's fill color."""
-        self.color = new_color
-        if self.polygon:
-            self.canvas.itemconfig(self.polygon, fill=new_color)
-
-
-# -------------------------------------------------------------------
-# Helper: Triangle Vertices
-# -------------------------------------------------------------------
-def get_triangle_vertices(player, center_x=None, center_y=None, angle=None):
-    """
-    Return the three (x,y) vertices of a player's triangle, matching `draw()`.
-
-    If center_x/center_y/angle are omitted, uses the player's current state.
-    """
-    if center_x is None:
-        center_x = player.x
-    if center_y is None:
-        center_y = player.y
-    if angle is None:
-        angle = player.angle
-
-    R = PLAYER_RADIUS
-    fx = math.sin(angle)
-    fy = -math.cos(angle)
-    rx = math.cos(angle)
-    ry = math.sin(angle)
-
-    tip = (
-        center_x + R * fx,
-        center_y + R * fy
-    )
-    bl = (
-        center_x - (R / 2) * fx + (R / 2) * rx,
-        center_y - (R / 2) * fy + (R / 2) * ry
-    )
-    br = (
-        center_x - (R / 2) * fx - (R / 2) * rx,
-        center_y - (R / 2) * fy - (R / 2) * ry
-    )
-
-    return [tip, bl, br]
+        """Change the player's fill color (not their team); shown on the next draw()."""
+        self.fill = new_color
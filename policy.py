@@ -0,0 +1,374 @@
+# policy.py
+#
+# Policies decide for every AI player in one call. Each tick the planner
+# builds a Batch: one observation row per AI-controlled player, taken
+# straight from the shared feature table, and the policy answers with one
+# Choice per row. Targets and passes are then worked out as ai.py does.
+#
+# Three kinds ship here:
+#   ScriptedPolicy   the utility scoring in ai.py (what Planner does)
+#   LookupPolicy     a table from binned observations to choices (JSON)
+#   MLPPolicy        a small ReLU network, weights loaded from JSON
+#
+#   python policy.py run --policy mlp:net.json --seconds 60
+#   python policy.py tabulate table.json --seconds 300
+#   python policy.py init-mlp net.json --hidden 32
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter, namedtuple
+from operator import mul
+
+from config import (
+    UPDATE_INTERVAL,
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+)
+from ai import ActionType, action_for, score_actions
+from features import FEATURES, compute_features
+from passing import best_pass
+from planner import Planner
+
+
+# --------------------
+# Observations
+# --------------------
+# One row per AI player: every feature column, then whether it is its
+# team's chaser. Distances are divided by the pool length and capped at 1,
+# breath_left by the config's base_max_breath, so every value is roughly 0‥1.
+OBS = FEATURES + ("is_chaser",)
+OBS_SIZE = len(OBS)
+
+_LENGTHS = frozenset(("dist_puck", "dist_own_goal", "dist_opp_goal",
+                      "nearest_opp_dist", "nearest_mate_dist"))
+_WITH_PUCK = (ActionType.SCORE_GOAL, ActionType.DRIBBLE, ActionType.PASS)
+_WITHOUT_PUCK = tuple(k for k in ActionType if k not in _WITH_PUCK)
+_HAS_PUCK = OBS.index("has_puck")
+
+# What a policy answers for one row. dive None leaves it to ai.decide_dive;
+# receiver None on a PASS means the best open teammate.
+Choice = namedtuple("Choice", "kind dive receiver utility", defaults=(None, None, 0.0))
+
+
+class Batch:
+    """
+    The observations for one tick. `obs` is row-major, `len(players)` rows
+    of OBS_SIZE; `snap` and `table` are there for policies that want more
+    than the numbers.
+    """
+    __slots__ = ("snap", "table", "players", "obs")
+
+    def __init__(self, snap, table, players, obs):
+        self.snap, self.table, self.players, self.obs = snap, table, players, obs
+
+    def __len__(self):
+        return len(self.players)
+
+    def row(self, i):
+        return self.obs[i * OBS_SIZE:(i + 1) * OBS_SIZE]
+
+    def legal(self, i):
+        """The action kinds that make sense for row i."""
+        return _WITH_PUCK if self.obs[i * OBS_SIZE + _HAS_PUCK] else _WITHOUT_PUCK
+
+
+def observe(snap, table, players, buf=None) -> Batch:
+    """
+    Fill `buf` (an array('d'), grown if too short) with one row per player
+    in `players` and wrap it in a Batch.
+    """
+    n = len(players)
+    if buf is None or len(buf) < n * OBS_SIZE:
+        buf = array("d", bytes(8 * n * OBS_SIZE))
+    pool_len = snap.pool_bottom - snap.pool_top
+    scale = [1.0 / pool_len if name in _LENGTHS else
+             1.0 / snap.config.base_max_breath if name == "breath_left" else 1.0
+             for name in FEATURES]
+    cols = [table.columns[name] for name in FEATURES]
+    chasers = (snap.chaser, snap.blue_chaser)
+
+    for i, p in enumerate(players):
+        r = table.row[p.unique_id]
+        base = i * OBS_SIZE
+        for j, (col, s) in enumerate(zip(cols, scale)):
+            buf[base + j] = min(1.0, col[r] * s)
+        buf[base + OBS_SIZE - 1] = 1.0 if p in chasers else 0.0
+    return Batch(snap, table, players, buf)
+
+
+# --------------------
+# Policies
+# --------------------
+class Policy:
+    """act(batch) → one Choice per row of the batch, in the same order."""
+
+    def act(self, batch: Batch) -> list:
+        raise NotImplementedError
+
+
+class ScriptedPolicy(Policy):
+    """The hand-written utilities of ai.score_actions; plays exactly like Planner."""
+
+    def act(self, batch):
+        out = []
+        for p in batch.players:
+            utility, kind, receiver = score_actions(p, batch.snap, batch.table)[0]
+            out.append(Choice(kind, None, receiver, utility))
+        return out
+
+
+class LookupPolicy(Policy):
+    """
+    Bins a few observation columns and looks the bins up in a table.
+    `edges[k]` are the ascending bin edges for `features[k]`; rows whose
+    cell is missing get `default`.
+    """
+
+    def __init__(self, features, edges, table, default=Choice(ActionType.FORMATION)):
+        self.features = tuple(features)
+        self.edges = [tuple(e) for e in edges]
+        self.table = dict(table)      # tuple of bin indices → Choice
+        self.default = default
+        self._cols = [OBS.index(f) for f in self.features]
+
+    def key(self, obs, base=0) -> tuple:
+        return tuple(bisect_right(e, obs[base + c]) for c, e in zip(self._cols, self.edges))
+
+    def act(self, batch):
+        obs, get, default = batch.obs, self.table.get, self.default
+        return [get(self.key(obs, i * OBS_SIZE), default) for i in range(len(batch))]
+
+    @classmethod
+    def fit(cls, samples, features, edges):
+        """The most common kind in each cell of (obs row, Choice) `samples`."""
+        policy = cls(features, edges, {})
+        votes = {}
+        for row, choice in samples:
+            votes.setdefault(policy.key(row), Counter())[choice.kind] += 1
+        policy.table = {k: Choice(c.most_common(1)[0][0]) for k, c in votes.items()}
+        return policy
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        table = {tuple(int(b) for b in k.split(",")): _choice(v)
+                 for k, v in data["table"].items()}
+        return cls(data["features"], data["edges"], table, _choice(data.get("default", "FORMATION")))
+
+    def save(self, path):
+        def dump(c):
+            return [c.kind.name, c.dive]
+        with open(path, "w") as f:
+            json.dump({
+                "features": list(self.features), "edges": [list(e) for e in self.edges],
+                "default": dump(self.default),
+                "table": {",".join(map(str, k)): dump(c) for k, c in sorted(self.table.items())},
+            }, f, indent=1)
+
+
+def _choice(v) -> Choice:
+    """"KIND" or ["KIND", dive] from a table file."""
+    if isinstance(v, str):
+        return Choice(ActionType[v])
+    return Choice(ActionType[v[0]], v[1])
+
+
+class MLPPolicy(Policy):
+    """
+    A fully connected ReLU network over the whole observation row. The
+    last layer has one output per ActionType (the best legal one wins)
+    and one more for diving (> 0 dives). The batch goes through each
+    layer in one pass, rows × weight columns.
+
+    Weights file: {"obs": OBS, "layers": [{"weights": in × out rows,
+    "bias": out}, ...]}.
+    """
+
+    N_OUT = len(ActionType) + 1
+
+    def __init__(self, layers):
+        # store each layer as its weight columns, so an output is one dot product
+        self.layers = []
+        for weights, bias in layers:
+            cols = [array("d", col) for col in zip(*weights)]
+            self.layers.append((cols, array("d", bias)))
+        if len(self.layers[0][0][0]) != OBS_SIZE or len(self.layers[-1][1]) != self.N_OUT:
+            raise ValueError(f"network must map {OBS_SIZE} inputs to {self.N_OUT} outputs")
+
+    def forward(self, batch) -> list:
+        """Output rows for every row of the batch."""
+        xs = [batch.row(i) for i in range(len(batch))]
+        last = len(self.layers) - 1
+        for k, (cols, bias) in enumerate(self.layers):
+            if k < last:
+                xs = [[max(0.0, b + sum(map(mul, x, c))) for c, b in zip(cols, bias)] for x in xs]
+            else:
+                xs = [[b + sum(map(mul, x, c)) for c, b in zip(cols, bias)] for x in xs]
+        return xs
+
+    def act(self, batch):
+        kinds = list(ActionType)
+        out = []
+        for i, y in enumerate(self.forward(batch)):
+            kind = max(batch.legal(i), key=lambda k: y[kinds.index(k)])
+            out.append(Choice(kind, y[-1] > 0.0, None, y[kinds.index(kind)]))
+        return out
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if tuple(data["obs"]) != OBS:
+            raise ValueError(f"{path}: trained on observations {data['obs']}, expected {list(OBS)}")
+        return cls([(layer["weights"], layer["bias"]) for layer in data["layers"]])
+
+    def save(self, path):
+        layers = [{"weights": [list(row) for row in zip(*cols)], "bias": list(bias)}
+                  for cols, bias in self.layers]
+        with open(path, "w") as f:
+            json.dump({"obs": list(OBS), "layers": layers}, f)
+
+    @classmethod
+    def random(cls, hidden=(32,), seed=None):
+        """Untrained weights (He-scaled), as a starting point."""
+        rng = random.Random(seed)
+        sizes = (OBS_SIZE, *hidden, cls.N_OUT)
+        return cls([([[rng.gauss(0.0, math.sqrt(2.0 / n_in)) for _ in range(n_out)]
+                      for _ in range(n_in)], [0.0] * n_out)
+                    for n_in, n_out in zip(sizes, sizes[1:])])
+
+
+def load_policy(spec: str) -> Policy:
+    """"scripted", "table:PATH" or "mlp:PATH"."""
+    kind, _, path = spec.partition(":")
+    if kind == "scripted":
+        return ScriptedPolicy()
+    if kind == "table":
+        return LookupPolicy.load(path)
+    if kind == "mlp":
+        return MLPPolicy.load(path)
+    raise ValueError(f"unknown policy {spec!r}; use scripted, table:PATH or mlp:PATH")
+
+
+# --------------------
+# Planner
+# --------------------
+class PolicyPlanner(Planner):
+    """
+    A synchronous planner that asks `policy` for every AI player at once.
+    Choices that can't be carried out (a pass without the puck, blocking a
+    lane nobody holds) fall back to the nearest thing that can.
+    """
+
+    def __init__(self, policy: Policy):
+        super().__init__()
+        self.policy = policy
+        self._buf = None
+
+    def submit(self, snap):
+        table = compute_features(snap)
+        players = [p for p in snap.players if p.unique_id not in snap.humans]
+        batch = observe(snap, table, players, self._buf)
+        self._buf = batch.obs
+        self._plan = {p.unique_id: self._action(p, c, snap, table)
+                      for p, c in zip(players, self.policy.act(batch))}
+
+    def _action(self, player, choice, snap, table):
+        kind, receiver = choice.kind, choice.receiver
+        mine = snap.possessing_player is player
+        if kind in _WITH_PUCK and not mine:
+            kind = ActionType.FORMATION
+        elif kind == ActionType.BLOCK_LANE and snap.possessing_player is None:
+            kind = ActionType.FORMATION
+        if kind == ActionType.PASS and receiver is None:
+            option = best_pass(player, snap, table)
+            if option is None:
+                kind = ActionType.DRIBBLE
+            else:
+                receiver = table.players[table.row[option.receiver_id]]
+        action = action_for(kind, player, snap, table, receiver, choice.utility)
+        if choice.dive is not None:
+            action.dive = choice.dive
+        return action
+
+
+class _Recorder(Policy):
+    """Passes through to `policy`, keeping (obs row, Choice) for every row."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.samples = []
+
+    def act(self, batch):
+        choices = self.policy.act(batch)
+        self.samples.extend((batch.row(i), c) for i, c in enumerate(choices))
+        return choices
+
+
+# --------------------
+# Command line
+# --------------------
+# bins used by `tabulate`
+TABLE_FEATURES = ("has_puck", "opp_has_puck", "is_chaser", "goal_side", "dist_puck", "dist_opp_goal")
+TABLE_EDGES = ((0.5,), (0.5,), (0.5,), (0.5,), (0.1, 0.25, 0.5), (0.25, 0.5, 0.75))
+
+
+def _play(policy, args):
+    from sim import Simulation
+    random.seed(args.seed)
+    sim = Simulation(green_formations=load_formations(args.green),
+                     blue_formations=load_formations(args.blue),
+                     planner=PolicyPlanner(policy), seed=args.seed)
+    ticks = int(args.seconds * 1000 / UPDATE_INTERVAL)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        sim.advance(UPDATE_INTERVAL / 1000.0)
+    dt = time.perf_counter() - t0
+    print(f"{ticks} ticks in {dt:.2f} s ({ticks / dt:,.0f} ticks/s), "
+          f"{sim.scoreboard.text(sim.time)}", file=sys.stderr)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Drive the AI players with a batched policy.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="play a headless match with a policy")
+    run.add_argument("--policy", default="scripted", help="scripted, table:PATH or mlp:PATH")
+
+    tab = sub.add_parser("tabulate", help="distil the scripted AI into a lookup table")
+    tab.add_argument("out")
+
+    mlp = sub.add_parser("init-mlp", help="write an untrained network")
+    mlp.add_argument("out")
+    mlp.add_argument("--hidden", type=int, nargs="*", default=[32])
+
+    for p in (run, tab, mlp):
+        p.add_argument("--seed", type=int, default=0)
+    for p in (run, tab):
+        p.add_argument("--seconds", type=float, default=60.0)
+        p.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+        p.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "run":
+        _play(load_policy(args.policy), args)
+    elif args.cmd == "tabulate":
+        recorder = _Recorder(ScriptedPolicy())
+        _play(recorder, args)
+        policy = LookupPolicy.fit(recorder.samples, TABLE_FEATURES, TABLE_EDGES)
+        policy.save(args.out)
+        print(f"{len(policy.table)} cells from {len(recorder.samples)} decisions → {args.out}",
+              file=sys.stderr)
+    else:
+        MLPPolicy.random(args.hidden, args.seed).save(args.out)
+
+
+if __name__ == "__main__":
+    main()
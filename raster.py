@@ -0,0 +1,186 @@
+# raster.py
+
+import math
+import struct
+import zlib
+
+# A few Tk color names the court and players use, as RGB
+COLORS = {
+    "white":      (255, 255, 255),
+    "black":      (0, 0, 0),
+    "red":        (255, 0, 0),
+    "green":      (0, 128, 0),
+    "blue":       (0, 0, 255),
+    "orange":     (255, 165, 0),
+    "lightblue":  (173, 216, 230),
+    "lightgreen": (144, 238, 144),
+}
+
+
+def rgb(color):
+    """'#rrggbb', a name from COLORS, or an (r, g, b) tuple → (r, g, b)."""
+    if isinstance(color, tuple):
+        return color
+    if color.startswith("#"):
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    return COLORS[color]
+
+
+class Framebuffer:
+    """
+    RGB image in one bytearray (3 bytes per pixel, rows top to bottom)
+    with just the primitives the court and players need. Coordinates are
+    canvas pixels; anything off the edge is clipped.
+    """
+
+    def __init__(self, width: int, height: int, bg="white"):
+        self.width = int(width)
+        self.height = int(height)
+        self.pixels = bytearray(bytes(rgb(bg)) * (self.width * self.height))
+
+    def copy_from(self, other):
+        """Overwrite this frame with another of the same size (one memcpy)."""
+        self.pixels[:] = other.pixels
+
+    def blit(self, other, x: int, y: int):
+        """Copy all of `other` in with its top-left at (x, y), one row at a time."""
+        x, y = int(x), int(y)
+        x0, x1 = max(0, x), min(self.width, x + other.width)
+        if x1 <= x0:
+            return
+        for row in range(max(0, y), min(self.height, y + other.height)):
+            src = ((row - y) * other.width + (x0 - x)) * 3
+            dst = (row * self.width + x0) * 3
+            self.pixels[dst:dst + (x1 - x0) * 3] = other.pixels[src:src + (x1 - x0) * 3]
+
+    # --- Pixels & spans ---
+    def _span(self, y, x0, x1, color):
+        """Fill row y from x0 to x1 inclusive."""
+        if y < 0 or y >= self.height:
+            return
+        x0 = max(0, int(x0))
+        x1 = min(self.width - 1, int(x1))
+        if x1 < x0:
+            return
+        i = (y * self.width + x0) * 3
+        self.pixels[i:i + (x1 - x0 + 1) * 3] = bytes(color) * (x1 - x0 + 1)
+
+    def _dot(self, x, y, color, width=1):
+        """Square brush of `width` px centred on (x, y)."""
+        half = (width - 1) / 2
+        y0 = int(round(y - half))
+        for yy in range(y0, y0 + width):
+            self._span(yy, round(x - half), round(x - half) + width - 1, color)
+
+    # --- Shapes ---
+    def fill_rect(self, x0, y0, x1, y1, color):
+        """Pixels whose centres lie inside [x0, x1) × [y0, y1)."""
+        c = rgb(color)
+        for y in range(_px(y0), _px(y1)):
+            self._span(y, _px(x0), _px(x1) - 1, c)
+
+    def rect_outline(self, x0, y0, x1, y1, color, width=1):
+        for (ax, ay, bx, by) in ((x0, y0, x1, y0), (x1, y0, x1, y1),
+                                 (x1, y1, x0, y1), (x0, y1, x0, y0)):
+            self.line(ax, ay, bx, by, color, width)
+
+    def line(self, x0, y0, x1, y1, color, width=1, dash=None):
+        """Straight line; `dash` is a Tk-style (on, off) pattern in px."""
+        c = rgb(color)
+        length = math.hypot(x1 - x0, y1 - y0)
+        if not dash and length > 0:
+            half = width / 2
+            if x0 == x1 or y0 == y1:
+                # axis-aligned: a filled box, square caps like the dot brush
+                self.fill_rect(min(x0, x1) - half, min(y0, y1) - half,
+                               max(x0, x1) + half, max(y0, y1) + half, c)
+                return
+            if width > 1:
+                # thick diagonal: the stroke's quad, one span per row
+                nx, ny = -(y1 - y0) / length * half, (x1 - x0) / length * half
+                self.fill_polygon([(x0 + nx, y0 + ny), (x1 + nx, y1 + ny),
+                                   (x1 - nx, y1 - ny), (x0 - nx, y0 - ny)], c)
+                return
+        steps = max(1, int(math.ceil(length)))
+        for k in range(steps + 1):
+            t = k / steps
+            if dash and not _dash_on(t * length, dash):
+                continue
+            self._dot(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, c, width)
+
+    def arc(self, cx, cy, r, start_deg, extent_deg, color, width=1, dash=None):
+        """Tk-style arc: degrees counter-clockwise from 3 o'clock."""
+        c = rgb(color)
+        length = abs(math.radians(extent_deg)) * r
+        steps = max(1, int(math.ceil(length)))
+        for k in range(steps + 1):
+            t = k / steps
+            if dash and not _dash_on(t * length, dash):
+                continue
+            a = math.radians(start_deg + extent_deg * t)
+            self._dot(cx + r * math.cos(a), cy - r * math.sin(a), c, width)
+
+    def circle_outline(self, cx, cy, r, color, width=1):
+        self.arc(cx, cy, r, 0, 360, color, width)
+
+    def fill_circle(self, cx, cy, r, color):
+        c = rgb(color)
+        for y in range(int(math.floor(cy - r)), int(math.ceil(cy + r)) + 1):
+            dy = y + 0.5 - cy
+            if abs(dy) > r:
+                continue
+            dx = math.sqrt(r * r - dy * dy)
+            self._span(y, round(cx - dx), round(cx + dx) - 1, c)
+
+    def fill_polygon(self, points, color):
+        """Even-odd scanline fill of a polygon given as [(x, y), …]."""
+        c = rgb(color)
+        ys = [p[1] for p in points]
+        n = len(points)
+        for y in range(int(math.floor(min(ys))), int(math.ceil(max(ys))) + 1):
+            sy = y + 0.5
+            xs = []
+            for i in range(n):
+                (ax, ay), (bx, by) = points[i], points[(i + 1) % n]
+                if (ay <= sy < by) or (by <= sy < ay):
+                    xs.append(ax + (sy - ay) * (bx - ax) / (by - ay))
+            xs.sort()
+            for k in range(0, len(xs) - 1, 2):
+                self._span(y, round(xs[k]), round(xs[k + 1]) - 1, c)
+
+    def polygon_outline(self, points, color, width=1):
+        n = len(points)
+        for i in range(n):
+            (ax, ay), (bx, by) = points[i], points[(i + 1) % n]
+            self.line(ax, ay, bx, by, color, width)
+
+    # --- Encoding ---
+    def to_ppm(self) -> bytes:
+        """Binary PPM (P6): what Tk's PhotoImage(data=…) and most tools read directly."""
+        return b"P6\n%d %d\n255\n" % (self.width, self.height) + bytes(self.pixels)
+
+    def to_png(self) -> bytes:
+        """8-bit RGB PNG, no filtering."""
+        stride = self.width * 3
+        raw = bytearray()
+        for y in range(self.height):
+            raw.append(0)
+            raw += self.pixels[y * stride:(y + 1) * stride]
+
+        def chunk(kind, data):
+            body = kind + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+                + chunk(b"IDAT", zlib.compress(bytes(raw), 6)) + chunk(b"IEND", b""))
+
+
+def _px(v):
+    """Round half up (round() goes to even, which loses 1 px wide boxes)."""
+    return int(math.floor(v + 0.5))
+
+
+def _dash_on(distance, dash):
+    on, off = dash
+    return (distance % (on + off)) < on
@@ -1,20 +1,23 @@
 # render.py
 
 import tkinter as tk
+import court
+from renderers import Renderer, depth_shade
 from config import (
-    SCALE,
-    POOL_WIDTH, POOL_HEIGHT,
-    MARGIN,
-    GOAL_WIDTH_M, GOAL_THICKNESS_PX,
-    GOAL_ARC_RADIUS_M, PENALTY_ARC_RADIUS_M,
-    PENALTY_SPOT_M,
+    RENDER_LOD_PX,
+    COSMETIC_INTERVAL,
+    GOAL_THICKNESS_PX,
+    CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX,
+    STATUS_WIDTH_PX,
+    POOL_LEFT_PX, POOL_RIGHT_PX,
+    POOL_TOP_PX, POOL_BOTTOM_PX,
+    GOAL_X1_PX, GOAL_X2_PX,
 )
-from physiology import BASE_MAX_BREATH
 
 def setup_window(game):
     """
-    Create root, canvases, and draw all the static court elements:
-    pool rectangle, goals, arcs, center lines, penalty spots, benches.
+    Create root and canvases, and show the static court (pool, goals,
+    arcs, center lines, penalty spots, benches) as a single cached image.
     """
     # 1) Root + container
     game.root = tk.Tk()
@@ -24,8 +27,8 @@ def setup_window(game):
     container.pack(fill="both", expand=True)
 
     # 2) Main game canvas
-    game.canvas_width  = int(POOL_WIDTH  * SCALE + MARGIN*2 + game.BENCH_WIDTH_PX)
-    game.canvas_height = int(POOL_HEIGHT * SCALE + MARGIN*2)
+    game.canvas_width  = CANVAS_WIDTH_PX
+    game.canvas_height = CANVAS_HEIGHT_PX
     game.canvas = tk.Canvas(
         container,
         width=game.canvas_width,
@@ -37,156 +40,140 @@ def setup_window(game):
     # 3) Status canvas (for gauges, score, etc.)
     game.status_canvas = tk.Canvas(
         container,
-        width=300,
+        width=STATUS_WIDTH_PX,
         height=game.canvas_height,
         bg="white"
     )
     game.status_canvas.pack(side="right", fill="y")
 
     # Precompute boundaries
-    L = MARGIN
-    T = MARGIN
-    R = MARGIN + POOL_WIDTH * SCALE
-    B = MARGIN + POOL_HEIGHT * SCALE
+    L, T = POOL_LEFT_PX, POOL_TOP_PX
+    R, B = POOL_RIGHT_PX, POOL_BOTTOM_PX
     game.pool_left, game.pool_top = L, T
     game.pool_right, game.pool_bottom = R, B
-
-    # 4) Pool rectangle
-    game.canvas.create_rectangle(L, T, R, B,
-        outline="black", width=2, fill="lightblue", tag="static")
-
-    # 5) Goals (top and bottom)
-    gx1 = L + (POOL_WIDTH*SCALE - GOAL_WIDTH_M*SCALE)/2
-    gx2 = gx1 + GOAL_WIDTH_M * SCALE
-    # top goal
-    game.canvas.create_rectangle(
-        gx1, T,
-        gx2, T + GOAL_THICKNESS_PX,
-        fill="black", outline="white", width=2,
-        tag="static"
-    )
-    # record top goal bounds
-    game.goal_x1, game.goal_x2 = gx1, gx2
+    game.goal_x1, game.goal_x2 = GOAL_X1_PX, GOAL_X2_PX
     game.goal_top_y1, game.goal_top_y2 = T, T + GOAL_THICKNESS_PX
-
-    # bottom goal
-    game.canvas.create_rectangle(
-        gx1, B - GOAL_THICKNESS_PX,
-        gx2, B,
-        fill="black", outline="white", width=2,
-        tag="static"
-    )
-    # record bottom goal bounds
     game.goal_bottom_y1, game.goal_bottom_y2 = B - GOAL_THICKNESS_PX, B
 
-    # 6) Goal arcs & penalty arcs
-    ga_px = GOAL_ARC_RADIUS_M * SCALE
-    pa_px = PENALTY_ARC_RADIUS_M * SCALE
-    cx = (gx1 + gx2)/2
-
-    # top arcs
-    game.canvas.create_arc(
-        cx - ga_px, T - ga_px, cx + ga_px, T + ga_px,
-        start=180, extent=180, style=tk.ARC,
-        outline="white", width=2, tag="static"
-    )
-    game.canvas.create_arc(
-        cx - pa_px, T - pa_px, cx + pa_px, T + pa_px,
-        start=180, extent=180, style=tk.ARC,
-        outline="white", width=2, dash=(4,2), tag="static"
-    )
-    # bottom arcs
-    game.canvas.create_arc(
-        cx - ga_px, B - ga_px, cx + ga_px, B + ga_px,
-        start=0, extent=180, style=tk.ARC,
-        outline="white", width=2, tag="static"
-    )
-    game.canvas.create_arc(
-        cx - pa_px, B - pa_px, cx + pa_px, B + pa_px,
-        start=0, extent=180, style=tk.ARC,
-        outline="white", width=2, dash=(4,2), tag="static"
-    )
-
-    # 7) Center lines & spot
-    game.canvas.create_line(L, (T+B)/2, R, (T+B)/2,
-        fill="white", dash=(4,2), tag="static")
-    game.canvas.create_line((L+R)/2, T, (L+R)/2, B,
-        fill="white", dash=(4,2), tag="static")
-    spot_r = 0.3 * SCALE
-    game.canvas.create_oval(
-        (L+R)/2 - spot_r, (T+B)/2 - spot_r,
-        (L+R)/2 + spot_r, (T+B)/2 + spot_r,
-        outline="white", width=2, tag="static"
-    )
-
-    # 8) Penalty spots (top & bottom)
-    ps_px = PENALTY_SPOT_M * SCALE
-    for y in (T + GOAL_THICKNESS_PX + ps_px, B - GOAL_THICKNESS_PX - ps_px):
-        game.canvas.create_oval(
-            cx - spot_r, y - spot_r,
-            cx + spot_r, y + spot_r,
-            fill="white", tag="static"
-        )
+    # 4) Static court: one pre-rendered image (cached on disk per geometry)
+    #    instead of ~20 items Tk would hit-test and repaint on every damage.
+    #    Keep a reference or Tk drops the pixels.
+    game.court_image = tk.PhotoImage(file=court.court_image_path())
+    game.canvas.create_image(0, 0, anchor="nw", image=game.court_image, tag="static")
 
-    # 9) Benches (just rectangles on left/right outside pool)
-    bench_gap = 10
-    bench_w = game.BENCH_WIDTH_PX
-    # right side benches
-    bx1 = R + bench_gap
-    bx2 = bx1 + bench_w
-    top_bench_y1 = T + 3.5 * SCALE
-    game.canvas.create_rectangle(
-        bx1, top_bench_y1,
-        bx2, top_bench_y1 + game.BENCH_LENGTH_PX,
-        outline="black", fill="lightgreen", width=2,
-        tag="static"
-    )
+    # 5) Bench labels (text stays with Tk's font renderer)
+    (tx1, ty1, tx2, _), (bx1, _, bx2, by2) = court.bench_boxes()
     game.canvas.create_text(
-        (bx1+bx2)/2, top_bench_y1 - 10,
+        (tx1+tx2)/2, ty1 - 10,
         text="Blue Bench", font=("Helvetica",10,"bold"),
         tag="static"
     )
-    bot_bench_y2 = B - 3.5 * SCALE
-    game.canvas.create_rectangle(
-        bx1, bot_bench_y2 - game.BENCH_LENGTH_PX,
-        bx2, bot_bench_y2,
-        outline="black", fill="lightgreen", width=2,
-        tag="static"
-    )
     game.canvas.create_text(
-        (bx1+bx2)/2, bot_bench_y2 + 10,
+        (bx1+bx2)/2, by2 + 10,
         text="Green Bench", font=("Helvetica",10,"bold"),
         tag="static"
     )
 
-    # 10) Score text
+    # 6) Score text
     game.score_text = game.canvas.create_text(
         (L+R)/2, T - 30,
         text="Score: 0", font=("Helvetica",16,"bold"), fill="black"
     )
 
 
+class TkRenderer(Renderer):
+    """
+    Draws onto the game's Tk canvas. Players own their canvas items (see
+    Player.draw) and are only redrawn once they have moved RENDER_LOD_PX;
+    depth shading is refreshed every COSMETIC_INTERVAL frames.
+    """
+
+    def __init__(self, canvas, sim):
+        self.canvas = canvas
+        self.frame  = 0
+        self.outlined_player = None
+        self._base_rgb = {}   # base color → (r, g, b), looked up once
+
+        r = sim.puck_radius
+        self.puck = canvas.create_oval(
+            sim.puck_x - r, sim.puck_y - r,
+            sim.puck_x + r, sim.puck_y + r,
+            fill="orange", outline="black", width=2
+        )
+        self._highlight_controlled(sim)
+
+    def _highlight_controlled(self, sim):
+        """Red outline on the controlled player, black on whoever had it before."""
+        ctrl = sim.controlled_player
+        if ctrl is self.outlined_player:
+            return
+        if self.outlined_player:
+            self.canvas.itemconfig(self.outlined_player.polygon, outline="black", width=2)
+        if ctrl is not None:
+            self.canvas.itemconfig(ctrl.polygon, outline="red", width=3)
+        self.outlined_player = ctrl
+
+    def _shade_players(self, sim):
+        """Shade each player by how deep they are (applied on their next draw)."""
+        for p in sim.players.values():
+            base = self._base_rgb.get(p.base_color)
+            if base is None:
+                r16, g16, b16 = self.canvas.winfo_rgb(p.base_color)
+                base = self._base_rgb[p.base_color] = (r16>>8, g16>>8, b16>>8)
+            r, g, b = depth_shade(base, p.depth, p is sim.possessing_player, sim.config.max_depth)
+            p.update_color(f"#{r:02x}{g:02x}{b:02x}")
+
+    def draw_frame(self, sim):
+        # puck, players & control highlight every frame; shading less often
+        self.frame += 1
+        if self.frame % COSMETIC_INTERVAL == 0:
+            self._shade_players(sim)
+
+        r = sim.puck_radius
+        self.canvas.coords(
+            self.puck,
+            sim.puck_x - r, sim.puck_y - r,
+            sim.puck_x + r, sim.puck_y + r
+        )
+        for p in sim.players.values():
+            p.draw(min_move=RENDER_LOD_PX)
+        self._highlight_controlled(sim)
+
+
 def update_status_bar(game):
-    """Draw one gauge per green field player showing dive/stamina."""
+    """
+    Draw one gauge per green field player showing dive/stamina.
+    Skipped entirely while the displayed numbers haven't changed.
+    """
     c = game.status_canvas
-    c.delete("all")
 
     # collect just the 6 green field players
     green_players = [
-        p for p in game.players.values()
+        p for p in game.sim.players.values()
         if p.color == "green"
     ]
 
-    # layout constants
+    shown = tuple(
+        (round(p.current_dive_time, 1), round(p.short_term_stamina, 1),
+         round(p.long_term_stamina, 3))
+        for p in green_players
+    )
+    if shown == getattr(game, "status_shown", None):
+        return
+    game.status_shown = shown
+    c.delete("all")
+
+    # layout constants; the gauge's full height is this match's breath cap
+    max_breath = game.sim.config.base_max_breath
     gauge_w     = 30
-    gauge_h     = BASE_MAX_BREATH * 10    # 10 px per second
+    gauge_h     = max_breath * 10    # 10 px per second
     spacing     = 10
     start_x     = 10
     top_margin  = 20
 
     def time_to_y(t):
-        # t=0 at bottom of gauge; t=BASE_MAX_BREATH at top
-        return (top_margin + gauge_h) - (t / BASE_MAX_BREATH * gauge_h)
+        # t=0 at bottom of gauge; t=max_breath at top
+        return (top_margin + gauge_h) - (t / max_breath * gauge_h)
 
     for i, p in enumerate(green_players):
         x0 = start_x + i * (gauge_w + spacing)
@@ -197,11 +184,11 @@ def update_status_bar(game):
         # border
         c.create_rectangle(x0, y0, x1, y1, outline="black")
 
-        # effective max = min(short_term, long_term×BASE_MAX_BREATH)
+        # effective max = min(short_term, long_term×max_breath)
         effective_max = min(p.short_term_stamina,
-                            BASE_MAX_BREATH * p.long_term_stamina)
+                            max_breath * p.long_term_stamina)
         # potential max line
-        pot_y = time_to_y(BASE_MAX_BREATH * p.long_term_stamina)
+        pot_y = time_to_y(max_breath * p.long_term_stamina)
         c.create_line(x0, pot_y, x1, pot_y, fill="green", width=2)
 
         # effective max line
@@ -0,0 +1,208 @@
+# renderers.py
+#
+# Drawing a Simulation is pluggable: the Tk canvas (render.TkRenderer) is
+# one backend and SoftwareRenderer below, which rasterises into a bytearray
+# and needs no display or GPU, is the other.
+
+import math
+import os
+
+from config import (
+    CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX, STATUS_WIDTH_PX,
+    MAX_DEPTH, BASE_MAX_BREATH,
+    PLAYER_RADIUS,
+)
+from raster import Framebuffer, rgb
+import court
+
+# how pale at max depth: 0 = true color, 1 = full fade (toward white)
+FADE_RATIO = 0.7
+
+
+# --------------------
+# Shared drawing helpers
+# --------------------
+def depth_shade(base_rgb, depth, carrying=False, max_depth=MAX_DEPTH):
+    """
+    Blend a team color toward white the deeper the player is (fully faded
+    at `max_depth`); the puck carrier always shows full color. Returns (r, g, b).
+    """
+    r0, g0, b0 = base_rgb
+
+    # precompute the “faded–white” end
+    r_f = int(r0 + (255 - r0) * FADE_RATIO)
+    g_f = int(g0 + (255 - g0) * FADE_RATIO)
+    b_f = int(b0 + (255 - b0) * FADE_RATIO)
+
+    # normalized “freshness”: 1.0 at surface, 0.0 at max depth
+    if carrying:
+        freshness = 1.0
+    else:
+        freshness = max(0.0, min(1.0, 1.0 - depth / max_depth))
+
+    # blend: faded→true by freshness
+    return (int(r_f + (r0 - r_f) * freshness),
+            int(g_f + (g0 - g_f) * freshness),
+            int(b_f + (b0 - b_f) * freshness))
+
+
+def player_points(x, y, angle):
+    """The drawn triangle (tip, base left, base right), as in Player.draw."""
+    R = PLAYER_RADIUS
+    fx, fy = math.sin(angle), -math.cos(angle)
+    rx, ry = math.cos(angle), math.sin(angle)
+    return [(x + R * fx, y + R * fy),
+            (x - (R / 4) * fx + (R / 4) * rx, y - (R / 4) * fy + (R / 4) * ry),
+            (x - (R / 4) * fx - (R / 4) * rx, y - (R / 4) * fy - (R / 4) * ry)]
+
+
+def draw_gauges(fb, players, x0=0, max_breath=BASE_MAX_BREATH):
+    """
+    Breath gauges for the green field players, laid out like
+    render.update_status_bar, with the strip's left edge at x0 and
+    max_breath seconds at the top.
+    """
+    gauge_w = 30
+    gauge_h = max_breath * 10    # 10 px per second
+    spacing = 10
+    top_margin = 20
+
+    def time_to_y(t):
+        return (top_margin + gauge_h) - (t / max_breath * gauge_h)
+
+    for i, p in enumerate(q for q in players if q.color == "green"):
+        gx0 = x0 + 10 + i * (gauge_w + spacing)
+        gx1 = gx0 + gauge_w
+        gy0, gy1 = top_margin, top_margin + gauge_h
+
+        effective_max = min(p.short_term_stamina, max_breath * p.long_term_stamina)
+        fb.rect_outline(gx0, gy0, gx1, gy1, "black")
+        pot_y = time_to_y(max_breath * p.long_term_stamina)
+        fb.line(gx0, pot_y, gx1, pot_y, "green", width=2)
+        eff_y = time_to_y(effective_max)
+        fb.line(gx0, eff_y, gx1, eff_y, "blue", width=2)
+        fb.fill_rect(gx0, time_to_y(p.current_dive_time), gx1, gy1, "red")
+
+
+# --------------------
+# Interface
+# --------------------
+class Renderer:
+    """
+    A place frames of a Simulation go. Front ends call draw_frame(sim) once
+    per sim frame and close() when done; what "drawing" means is up to the
+    backend.
+    """
+
+    def draw_frame(self, sim):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# --------------------
+# Software backend
+# --------------------
+class SoftwareRenderer(Renderer):
+    """
+    Rasterises each frame into a Framebuffer: the cached court is copied in
+    with one memcpy, then players and puck are drawn over it. Every finished
+    frame is handed to `sink(framebuffer)` (see the sinks below), so the
+    whole pipeline runs headless.
+
+    With status=True the frame is widened by STATUS_WIDTH_PX and the breath
+    gauges are drawn to the right of the court, as in the Tk window.
+    Text (player labels, score) is not drawn; there is no font rasteriser.
+
+    Anything with the attributes draw_frame reads can stand in for `sim`
+    (e.g. export.FrameView for a recorded frame).
+    """
+
+    def __init__(self, sink=None, status=False):
+        width = CANVAS_WIDTH_PX + (STATUS_WIDTH_PX if status else 0)
+        self.background = Framebuffer(width, CANVAS_HEIGHT_PX)
+        self.background.blit(court.render_court(), 0, 0)
+        self.frame = Framebuffer(width, CANVAS_HEIGHT_PX)
+        self.status = status
+        self.sink = sink
+        self.count = 0
+        self._base_rgb = {}
+
+    def draw_frame(self, sim):
+        fb = self.frame
+
+        # 1) Static court
+        fb.copy_from(self.background)
+
+        # 2) Players, shaded by depth; human-driven ones outlined in red
+        for p in sim.players.values():
+            base = self._base_rgb.get(p.base_color)
+            if base is None:
+                base = self._base_rgb[p.base_color] = rgb(p.base_color)
+            pts = player_points(p.x, p.y, p.angle)
+            fb.fill_polygon(pts, depth_shade(base, p.depth, p is sim.possessing_player,
+                                             sim.config.max_depth))
+            if sim.is_human(p):
+                fb.polygon_outline(pts, "red", width=3)
+            else:
+                fb.polygon_outline(pts, "black", width=2)
+
+        # 3) Puck
+        fb.fill_circle(sim.puck_x, sim.puck_y, sim.puck_radius, "orange")
+        fb.circle_outline(sim.puck_x, sim.puck_y, sim.puck_radius, "black", width=2)
+
+        # 4) Breath gauges
+        if self.status:
+            draw_gauges(fb, sim.players.values(), CANVAS_WIDTH_PX, sim.config.base_max_breath)
+
+        # 5) Hand off
+        if self.sink is not None:
+            self.sink(fb)
+        self.count += 1
+        return fb
+
+    def close(self):
+        close = getattr(self.sink, "close", None)
+        if close is not None:
+            close()
+
+
+# --------------------
+# Frame sinks
+# --------------------
+class ImageSequenceSink:
+    """Writes each frame to `directory/frame_000000.png` (or .ppm, which is faster)."""
+
+    def __init__(self, directory, fmt="png", start=0):
+        if fmt not in ("png", "ppm"):
+            raise ValueError(f"unknown image format {fmt!r}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.index = start
+
+    def path_for(self, index):
+        return os.path.join(self.directory, f"frame_{index:06d}.{self.fmt}")
+
+    def __call__(self, fb):
+        data = fb.to_png() if self.fmt == "png" else fb.to_ppm()
+        with open(self.path_for(self.index), "wb") as f:
+            f.write(data)
+        self.index += 1
+
+
+class RawStreamSink:
+    """
+    Appends raw rgb24 frames to a binary file object, e.g. a pipe into
+    `ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -i - out.mp4`.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __call__(self, fb):
+        self.stream.write(fb.pixels)
+
+    def close(self):
+        self.stream.flush()
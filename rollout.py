@@ -0,0 +1,246 @@
+# rollout.py
+#
+# Monte Carlo rollouts: estimate, for each action open to one player right
+# now, how likely their team is to score (or concede) in the next few
+# seconds if they take it. Each rollout plays the sim on from a checkpoint
+# with fresh AI dive thresholds and a little noise in every AI choice.
+# Rollouts run in forked workers, one per core, round-robin over the
+# candidates until a wall-time budget runs out; a candidate left with fewer
+# than MIN_ROLLOUTS is reported as low-confidence.
+#
+#   python rollout.py match.ckpt --player 5 --budget 2
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+
+import checkpoint
+from ai import ActionType, action_for, candidate_actions, plan_actions, score_actions
+from features import compute_features
+from planner import Planner, take_snapshot
+
+ROLLOUT_BUDGET = 0.5   # s of wall time per decision
+ROLLOUT_HORIZON = 6.0  # s of play per rollout
+ROLLOUT_COMMIT = 1.5   # s the player sticks to the candidate before the AI takes over
+CHOICE_NOISE = 0.1     # chance an AI player takes a lesser option on a tick
+MIN_ROLLOUTS = 3       # per candidate for an estimate to be trusted
+
+Candidate = namedtuple("Candidate", "kind receiver")   # ActionType, unique_id or None
+
+
+class Estimate(namedtuple("Estimate", "candidate action rollouts scored conceded")):
+    """
+    Outcome counts for one candidate; `action` is how it looked at the
+    start. With no rollouts the probabilities and value are None (unknown).
+    """
+    __slots__ = ()
+
+    @property
+    def p_score(self):
+        return self.scored / self.rollouts if self.rollouts else None
+
+    @property
+    def p_concede(self):
+        return self.conceded / self.rollouts if self.rollouts else None
+
+    @property
+    def value(self):
+        return self.p_score - self.p_concede if self.rollouts else None
+
+    @property
+    def insufficient(self) -> bool:
+        """Fewer than MIN_ROLLOUTS behind it: too few samples to trust."""
+        return self.rollouts < MIN_ROLLOUTS
+
+
+# --------------------
+# One rollout
+# --------------------
+class RolloutPlanner(Planner):
+    """
+    Plans like the AI, except that the focal player carries out
+    `candidate` for the first `commit_ticks` ticks (or until a candidate
+    pass is played), and every other AI player takes a random lesser
+    option with probability `noise` each tick.
+    """
+
+    def __init__(self, focal, candidate, commit_ticks, noise, rng):
+        super().__init__()
+        self.focal = focal
+        self.candidate = candidate
+        self.until = None
+        self.commit = commit_ticks
+        self.noise = noise
+        self.rng = rng
+
+    def submit(self, snap):
+        table = compute_features(snap)
+        plan = plan_actions(snap, budget=None, table=table)
+        by_id = {p.unique_id: p for p in snap.players}
+
+        if self.noise:
+            for uid in plan:
+                if uid != self.focal and self.rng.random() < self.noise:
+                    options = score_actions(by_id[uid], snap, table)[1:]
+                    if options:
+                        utility, kind, receiver = self.rng.choice(options)
+                        plan[uid] = action_for(kind, by_id[uid], snap, table, receiver, utility)
+
+        if self.until is None:
+            self.until = snap.tick + self.commit
+        action = self._committed(by_id[self.focal], snap, table, by_id)
+        if action is not None:
+            plan[self.focal] = action
+        self._plan = plan
+
+    def _committed(self, player, snap, table, by_id):
+        kind, receiver = self.candidate
+        if snap.tick > self.until:
+            return None
+        if kind == ActionType.PASS and snap.possessing_player is not player:
+            self.until = -1                      # the pass has been played
+            return None
+        if kind == ActionType.BLOCK_LANE and snap.possessing_player is None:
+            return None
+        return action_for(kind, player, snap, table, by_id.get(receiver))
+
+
+def rollout(state, focal, candidate, seed, horizon=ROLLOUT_HORIZON, commit=ROLLOUT_COMMIT,
+            noise=CHOICE_NOISE, deadline=None):
+    """
+    Play on from checkpoint `state` with `focal` committed to `candidate`.
+    Returns +1 if the focal player's team scores within `horizon` s, -1 if
+    it concedes, 0 otherwise; None if `deadline` (time.monotonic) passed
+    first. Humans are handed to the AI.
+    """
+    dt = state["config"].dt
+    rng = random.Random(seed)
+    random.seed(rng.getrandbits(64))             # physiology's draws
+    planner = RolloutPlanner(focal, candidate, int(commit / dt), noise, rng)
+    sim = checkpoint.restore(state, planner=planner, global_rng=False)
+    for team in sim.controlled:
+        sim.release_human(team)
+    for p in sim.players.values():
+        if p.dive_threshold is not None:
+            p.dive_threshold = random.uniform(*sim.config.dive_threshold_range)
+
+    team = sim.players[focal].color
+    board = sim.scoreboard
+    goals = board.total
+    for _ in range(int(horizon / dt)):
+        if deadline is not None and time.monotonic() > deadline:
+            return None
+        sim.advance(dt)
+        if board.total != goals:
+            return 1 if board.last_scorer == team else -1
+    return 0
+
+
+# --------------------
+# Estimates
+# --------------------
+def _candidates(sim, player):
+    """(Candidate, Action) for everything `player` could do now, best first."""
+    snap = take_snapshot(sim, sim.tick, sim.puck_x, sim.puck_y)
+    # a chaser's plan is fixed to the puck; ask what else it could do
+    snap = snap._replace(chaser=None, blue_chaser=None)
+    me = next(p for p in snap.players if p.unique_id == player.unique_id)
+    seen, out = set(), []
+    for action in candidate_actions(me, snap):
+        c = Candidate(action.type, action.receiver)
+        if c not in seen:
+            seen.add(c)
+            out.append((c, action))
+    return out
+
+
+def evaluate(sim, player, budget=ROLLOUT_BUDGET, horizon=ROLLOUT_HORIZON,
+             commit=ROLLOUT_COMMIT, noise=CHOICE_NOISE, workers=None, seed=None) -> list:
+    """
+    Estimate every action open to `player` by rollouts from `sim`'s
+    current state. Candidates are tried round-robin until `budget` s of
+    wall time have passed; a rollout still running then is dropped.
+    Returns Estimates, best value first: trusted ones (MIN_ROLLOUTS or
+    more) ahead of insufficient ones, and unknown ones (no rollouts) last,
+    in the AI's own order. `sim` itself is left untouched.
+    """
+    deadline = time.monotonic() + budget
+    candidates = _candidates(sim, player)
+    state = checkpoint.capture(sim)
+    base = seed if seed is not None else random.getrandbits(32)
+    workers = workers or os.cpu_count() or 1
+
+    def work(_sim, worker):
+        tally = [[0, 0, 0] for _ in candidates]    # rollouts, scored, conceded
+        n = worker
+        while time.monotonic() < deadline:
+            i = n % len(candidates)
+            out = rollout(state, player.unique_id, candidates[i][0], base + n,
+                          horizon, commit, noise, deadline)
+            if out is None:
+                break
+            tally[i][0] += 1
+            tally[i][1] += out > 0
+            tally[i][2] += out < 0
+            n += workers
+        return tally
+
+    totals = [[0, 0, 0] for _ in candidates]
+    for tally in checkpoint.fork_map(sim, work, range(workers), workers):
+        for t, part in zip(totals, tally):
+            for k in range(3):
+                t[k] += part[k]
+    estimates = [Estimate(c, a, *t) for (c, a), t in zip(candidates, totals)]
+    estimates.sort(key=lambda e: (e.rollouts > 0, not e.insufficient, e.value or 0.0, e.rollouts),
+                   reverse=True)
+    return estimates
+
+
+def best_action(sim, player, **kwargs):
+    """The Action with the best estimated value for `player` (see evaluate)."""
+    return evaluate(sim, player, **kwargs)[0].action
+
+
+# --------------------
+# Command line
+# --------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Estimate a player's options by rollouts.")
+    ap.add_argument("checkpoint", help="saved with checkpoint.py or the game's F5")
+    ap.add_argument("--player", type=int, default=None,
+                    help="unique_id (default: green's human, else whoever has the puck)")
+    ap.add_argument("--budget", type=float, default=ROLLOUT_BUDGET, help="wall-time seconds")
+    ap.add_argument("--horizon", type=float, default=ROLLOUT_HORIZON)
+    ap.add_argument("--commit", type=float, default=ROLLOUT_COMMIT)
+    ap.add_argument("--noise", type=float, default=CHOICE_NOISE)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    sim = checkpoint.restore(checkpoint.load(args.checkpoint))
+    if args.player is not None:
+        player = sim.players[args.player]
+    else:
+        player = sim.controlled["green"] or sim.possessing_player or sim.players[1]
+
+    t0 = time.monotonic()
+    estimates = evaluate(sim, player, args.budget, args.horizon, args.commit,
+                         args.noise, args.workers, args.seed)
+    spent = time.monotonic() - t0
+    print(f"{player.color} {player.label} (#{player.unique_id}) at {sim.time:.1f} s; "
+          f"{sum(e.rollouts for e in estimates)} rollouts in {spent:.2f} s", file=sys.stderr)
+    for e in estimates:
+        who = f" → #{e.candidate.receiver}" if e.candidate.receiver is not None else ""
+        if not e.rollouts:
+            print(f"{e.candidate.kind.name + who:<16}     0 rollouts  unknown")
+            continue
+        note = "  (low confidence)" if e.insufficient else ""
+        print(f"{e.candidate.kind.name + who:<16} {e.rollouts:5d} rollouts  "
+              f"score {e.p_score:5.1%}  concede {e.p_concede:5.1%}  value {e.value:+.2f}{note}")
+
+
+if __name__ == "__main__":
+    main()
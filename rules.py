@@ -0,0 +1,267 @@
+# rules.py
+#
+# Fouls and restarts. Once everyone has moved, the RuleEngine looks at the
+# tick and calls at most one infraction:
+#
+#   contact      opposing bodies meet away from the puck; whoever swam
+#                into the other is penalised
+#   obstruction  a player without the puck parks between an opponent and
+#                the puck, body to body, for OBSTRUCTION_TIME
+#   offside      a pass is picked up by a teammate who was nearer the goal
+#                than the puck and every opponent when it was played
+#
+# Checks only look at each player's neighbours in the sim's body index and
+# carry their state over from the last tick (who was touching, how long a
+# screen has lasted), so they cost O(N) a tick, not O(N²).
+#
+# A foul stops play for RESTART_DELAY and restarts with the fouled team's
+# taker over the puck and the offenders held off: a free puck where it
+# happened, or a penalty shot from the penalty spot when a defender fouled
+# inside their own penalty arc.
+
+import math
+from collections import namedtuple
+
+from config import (
+    SPRINT_SPEED,
+    PENALTY_ARC_RADIUS_M,
+    PENALTY_SPOT_M,
+    PLAYER_RADIUS,
+)
+import contact
+from avoidance import AGENT_RADIUS
+
+
+# --------------------
+# Tuning
+# --------------------
+CONTACT_RADIUS = PLAYER_RADIUS         # px between centres at which bodies are clearly into each other
+CONTACT_SPEED = SPRINT_SPEED / 2       # px/frame into the other player that makes contact a foul
+OBSTRUCT_RADIUS = PLAYER_RADIUS * 1.5  # px from the opponent a screen must be within
+OBSTRUCTION_TIME = 1.0                 # s a screen has to last before it is called
+RESTART_DELAY = 2.0                    # s play stays stopped before the restart
+FREE_PUCK_DISTANCE_M = 3               # m the offenders must give the taker
+PENALTY_CLEAR_M = 3                    # m behind the spot everyone else waits at a penalty
+
+KINDS = ("contact", "obstruction", "offside")
+
+# One infraction. offender/victim are unique_ids (victim None if nobody in
+# particular was fouled); `team` restarts with the puck from (x, y).
+Call = namedtuple("Call", "tick kind offender victim team x y penalty")
+
+
+def goal_line(sim, color):
+    """y of the goal line `color` defends. Green defends the bottom."""
+    return sim.pool_bottom if color == "green" else sim.pool_top
+
+
+def _other(color):
+    return "blue" if color == "green" else "green"
+
+
+def in_penalty_arc(sim, color, x, y) -> bool:
+    """Inside the penalty arc in front of the goal `color` defends."""
+    cx = (sim.pool_left + sim.pool_right) / 2
+    return math.hypot(x - cx, y - goal_line(sim, color)) <= PENALTY_ARC_RADIUS_M * sim.config.scale
+
+
+# --------------------
+# Engine
+# --------------------
+class RuleEngine:
+    """
+    Per-match infraction state. check() once a tick, on_pass() whenever a
+    pass is played, reset() when play restarts.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._touching = set()       # (uid, uid) pairs in contact last tick
+        self._screens = {}           # (blocker, opponent) → tick the screen began
+        self._offside = frozenset()  # uids offside when the last pass was played
+
+    def state(self) -> dict:
+        return {"touching": set(self._touching), "screens": dict(self._screens),
+                "offside": self._offside}
+
+    def restore(self, state: dict):
+        self._touching = set(state["touching"])
+        self._screens = dict(state["screens"])
+        self._offside = state["offside"]
+
+    # --- Events ---
+    def on_pass(self, sim, passer):
+        """Note which of the passer's teammates are offside as the pass leaves."""
+        line = goal_line(sim, _other(passer.color))
+        level = abs(sim.puck_y - line)
+        for p in sim.players.values():
+            if p.color != passer.color:
+                level = min(level, abs(p.y - line))
+        self._offside = frozenset(
+            p.unique_id for p in sim.players.values()
+            if p.color == passer.color and p is not passer and abs(p.y - line) < level
+        )
+
+    def check(self, sim):
+        """The Call for this tick, or None. Needs sim.bodies rebuilt this tick."""
+        return self._check_offside(sim) or self._check_contact(sim) or self._check_obstruction(sim)
+
+    # --- Offside ---
+    def _check_offside(self, sim):
+        holder = sim.possessing_player
+        if not self._offside or holder is None:
+            return None
+        offside, self._offside = self._offside, frozenset()    # the first touch settles it
+        if holder.unique_id not in offside:
+            return None
+        team = _other(holder.color)
+        return Call(sim.tick, "offside", holder.unique_id, None, team,
+                    holder.x, holder.y, False)
+
+    # --- Contact ---
+    def _check_contact(self, sim):
+        carrier = sim.possessing_player
+        touching, call = set(), None
+        for p in sim.players.values():
+            for q in sim.bodies.neighbours(p, CONTACT_RADIUS, contact.BODY_THICKNESS_M):
+                if q.unique_id <= p.unique_id or q.color == p.color:
+                    continue
+                # challenging the carrier, or both on the bottom contesting, is play
+                if carrier is p or carrier is q or (contact.on_bottom(p, sim.config)
+                                                    and contact.on_bottom(q, sim.config)):
+                    continue
+                pair = (p.unique_id, q.unique_id)
+                touching.add(pair)
+                if call is None and pair not in self._touching:
+                    call = self._contact_call(sim, p, q)
+        self._touching = touching
+        return call
+
+    def _contact_call(self, sim, p, q):
+        dx, dy = q.x - p.x, q.y - p.y
+        d = math.hypot(dx, dy) or 1.0
+        into_q = (p.vx * dx + p.vy * dy) / d      # p's speed towards q
+        into_p = -(q.vx * dx + q.vy * dy) / d
+        if max(into_q, into_p) < CONTACT_SPEED:
+            return None                           # drifted together; play on
+        offender, victim = (p, q) if into_q >= into_p else (q, p)
+        x, y = (p.x + q.x) / 2, (p.y + q.y) / 2
+        return Call(sim.tick, "contact", offender.unique_id, victim.unique_id, victim.color,
+                    x, y, in_penalty_arc(sim, offender.color, x, y))
+
+    # --- Obstruction ---
+    def _check_obstruction(self, sim):
+        carrier = sim.possessing_player
+        px, py = sim.puck_x, sim.puck_y
+        screens, call = {}, None
+        for b in sim.players.values():
+            if b is carrier:
+                continue                         # shielding your own puck is allowed
+            for v in sim.bodies.neighbours(b, OBSTRUCT_RADIUS, contact.BODY_THICKNESS_M):
+                if v.color == b.color or v is carrier:
+                    continue
+                if not _screening(b, v, px, py):
+                    continue
+                key = (b.unique_id, v.unique_id)
+                since = self._screens.get(key, sim.tick)
+                screens[key] = since
+                if call is None and (sim.tick - since) * sim.dt >= OBSTRUCTION_TIME:
+                    call = Call(sim.tick, "obstruction", b.unique_id, v.unique_id, v.color,
+                                b.x, b.y, in_penalty_arc(sim, b.color, b.x, b.y))
+        self._screens = screens
+        return call
+
+
+def _screening(b, v, px, py) -> bool:
+    """`b` stands in `v`'s way to the puck and isn't going for it themselves."""
+    ux, uy = px - v.x, py - v.y
+    length = math.hypot(ux, uy)
+    if length == 0:
+        return False
+    ux, uy = ux / length, uy / length
+    along = (b.x - v.x) * ux + (b.y - v.y) * uy
+    across = abs((b.x - v.x) * uy - (b.y - v.y) * ux)
+    if not 0 < along < length or across > AGENT_RADIUS:
+        return False
+    return b.vx * ux + b.vy * uy <= 0.0
+
+
+# --------------------
+# Restarts
+# --------------------
+def _clamp(sim, x, y):
+    cfg = sim.config
+    margin = cfg.player_radius
+    top = sim.pool_top + cfg.goal_thickness_px + margin
+    bottom = sim.pool_bottom - cfg.goal_thickness_px - margin
+    return (max(sim.pool_left + margin, min(sim.pool_right - margin, x)),
+            max(top, min(bottom, y)))
+
+
+def plan_restart(sim, call):
+    """
+    Where everything goes for the restart after `call`:
+    (puck (x, y), taker, {unique_id: (x, y, angle)} for every player who moves).
+    The taker starts over the puck, facing the goal their team attacks,
+    with nobody else nearer it.
+    """
+    team = call.team
+    attack = goal_line(sim, _other(team))
+    facing = 0.0 if team == "green" else math.pi
+    cx = (sim.pool_left + sim.pool_right) / 2
+    cfg = sim.config
+    moves = {}
+
+    if call.penalty:
+        # from the spot in front of the offenders' goal; their keeper on the line
+        away = 1 if attack == sim.pool_top else -1     # +y runs away from that goal
+        spot = (cx, attack + away * (cfg.goal_thickness_px + PENALTY_SPOT_M * cfg.scale))
+        taker = sim.players[call.victim] if call.victim is not None else _nearest(sim, team, *spot)
+        keeper = min((p for p in sim.players.values() if p.color != team),
+                     key=lambda p: abs(p.y - attack))
+        moves[keeper.unique_id] = (cx, attack + away * (cfg.goal_thickness_px + cfg.player_radius),
+                                   facing + math.pi)
+        wait = spot[1] + away * PENALTY_CLEAR_M * cfg.scale
+        for p in sim.players.values():
+            if p is not taker and p is not keeper and (p.y - wait) * away < 0:
+                moves[p.unique_id] = (*_clamp(sim, p.x, wait), p.angle)
+    else:
+        # a free puck where it happened; the offenders back off
+        spot = _clamp(sim, call.x, call.y)
+        taker = sim.players[call.victim] if call.victim is not None else _nearest(sim, team, *spot)
+        clear = FREE_PUCK_DISTANCE_M * cfg.scale
+        for p in sim.players.values():
+            if p.color != team and math.hypot(p.x - spot[0], p.y - spot[1]) < clear:
+                moves[p.unique_id] = (*_clear_of(sim, spot, p, clear), p.angle)
+
+    moves[taker.unique_id] = (*spot, facing)
+    return spot, taker, moves
+
+
+def _clear_of(sim, spot, p, clear):
+    """
+    A place `clear` px from `spot` for `p`: straight out from the spot if
+    the pool allows, else towards their own goal, else towards the middle.
+    """
+    sx, sy = spot
+    mid = ((sim.pool_left + sim.pool_right) / 2, (sim.pool_top + sim.pool_bottom) / 2)
+    best, best_d = (p.x, p.y), 0.0
+    for tx, ty in ((p.x, p.y), (mid[0], goal_line(sim, p.color)), mid):
+        dx, dy = tx - sx, ty - sy
+        d = math.hypot(dx, dy)
+        if d == 0:
+            continue
+        x, y = _clamp(sim, sx + dx / d * clear, sy + dy / d * clear)
+        gap = math.hypot(x - sx, y - sy)
+        if gap >= clear - 1e-6:
+            return x, y
+        if gap > best_d:
+            best, best_d = (x, y), gap
+    return best
+
+
+def _nearest(sim, team, x, y):
+    return min((p for p in sim.players.values() if p.color == team),
+               key=lambda p: math.hypot(p.x - x, p.y - y))
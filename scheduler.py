@@ -0,0 +1,94 @@
+# scheduler.py
+
+import heapq
+
+# s past the target time an event may be and still count as due, so a
+# target reached by adding up frame lengths doesn't miss the frame that
+# lands a rounding error after it
+TIME_EPSILON = 1e-9
+
+
+class ScheduledEvent:
+    """
+    Handle for one pending callback. Returned by EventScheduler.schedule();
+    keep it if you may want to cancel() the event later.
+    """
+    __slots__ = ("time", "seq", "callback", "args", "cancelled")
+
+    def __init__(self, time: float, seq: int, callback, args: tuple):
+        self.time = time
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        # earlier time first; ties broken by scheduling order
+        return (self.time, self.seq) < (other.time, other.seq)
+
+
+class EventScheduler:
+    """
+    Priority queue of callbacks keyed on simulation time (seconds).
+
+    - Events with the same time fire in the order they were scheduled,
+      so a run is fully deterministic.
+    - Time only moves when events are run: run_until() jumps straight
+      from one event to the next instead of polling.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        self.now = start_time
+        self._queue = []
+        self._seq = 0
+
+    def schedule(self, delay: float, callback, *args) -> ScheduledEvent:
+        """Run callback(*args) `delay` seconds after the current time."""
+        return self.schedule_at(self.now + max(0.0, delay), callback, *args)
+
+    def schedule_at(self, time: float, callback, *args) -> ScheduledEvent:
+        """Run callback(*args) at absolute sim time `time`."""
+        event = ScheduledEvent(max(time, self.now), self._seq, callback, args)
+        self._seq += 1
+        heapq.heappush(self._queue, event)
+        return event
+
+    def cancel(self, event):
+        """Cancel a pending event. Safe to call with None or an already-fired event."""
+        if event is not None:
+            event.cancelled = True
+
+    def _drop_cancelled(self):
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue)
+
+    def next_time(self):
+        """Time of the next live event, or None if nothing is pending."""
+        self._drop_cancelled()
+        return self._queue[0].time if self._queue else None
+
+    def step(self):
+        """Jump to and fire the next live event. Returns it, or None if idle."""
+        self._drop_cancelled()
+        if not self._queue:
+            return None
+        event = heapq.heappop(self._queue)
+        self.now = event.time
+        event.callback(*event.args)
+        return event
+
+    def run_until(self, time: float):
+        """Fire every event due at or before `time`, then set the clock to `time`."""
+        while True:
+            nxt = self.next_time()
+            if nxt is None or nxt > time + TIME_EPSILON:
+                break
+            self.step()
+        self.now = max(self.now, time)
+
+    def pending(self):
+        """Live events in firing order (for inspection and debugging)."""
+        return sorted(e for e in self._queue if not e.cancelled)
+
+    def __len__(self):
+        return sum(1 for e in self._queue if not e.cancelled)
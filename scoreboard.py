@@ -0,0 +1,201 @@
+# scoreboard.py
+#
+# Match state: goals for each team, which half it is, timeouts and the
+# game clock. The clock is sim time: the Simulation schedules the end of
+# every half, break and timeout on its event scheduler, so a headless
+# batch keeps exactly the same clock as a windowed game.
+#
+#   python scoreboard.py --matches 8 --half 120     # seeded headless matches, one line each
+#   python scoreboard.py --set max_depth=2.5 --set ai_dive_range=200
+
+import argparse
+import random
+import sys
+import time
+
+from config import (
+    HALF_LENGTH,
+    HALVES,
+    HALFTIME_BREAK,
+    TIMEOUT_LENGTH,
+    TIMEOUTS_PER_HALF,
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+    SimConfig,
+    parse_settings,
+)
+
+TEAMS = ("green", "blue")
+PLAY, TIMEOUT, HALFTIME, FULL_TIME = "play", "timeout", "halftime", "full_time"
+PHASES = (PLAY, TIMEOUT, HALFTIME, FULL_TIME)
+
+
+class Scoreboard:
+    """
+    Goals, halves and timeouts for one match. The clock counts the time
+    played in the current half; it runs through goals and fouls and stops
+    only for timeouts and breaks.
+
+    The Simulation drives the changes (goal, end_half, start_half,
+    start_timeout, end_timeout) from its events. `version` goes up with
+    each one, so a display can redraw only when something changed.
+    """
+
+    def __init__(self, half_length=HALF_LENGTH, halves=HALVES, halftime=HALFTIME_BREAK,
+                 timeout_length=TIMEOUT_LENGTH, timeouts=TIMEOUTS_PER_HALF):
+        self.half_length = half_length
+        self.halves = halves
+        self.halftime = halftime
+        self.timeout_length = timeout_length
+        self.timeouts = timeouts
+
+        self.goals = dict.fromkeys(TEAMS, 0)
+        self.half = 1
+        self.phase = PLAY
+        self.last_scorer = None
+        self.timeouts_left = dict.fromkeys(TEAMS, timeouts)
+        self.timeout_team = None
+        self.version = 0
+
+        self._half_start = 0.0   # sim time this half kicked off
+        self._stopped = 0.0      # s of this half spent in timeouts
+        self._stop_start = None  # sim time the running timeout began
+
+    @property
+    def running(self) -> bool:
+        return self.phase == PLAY
+
+    @property
+    def finished(self) -> bool:
+        return self.phase == FULL_TIME
+
+    @property
+    def total(self) -> int:
+        return sum(self.goals.values())
+
+    def clock(self, now: float) -> float:
+        """Seconds played in the current half."""
+        if self.phase in (HALFTIME, FULL_TIME):
+            return self.half_length
+        stopped = self._stopped
+        if self._stop_start is not None:
+            stopped += now - self._stop_start
+        return min(self.half_length, max(0.0, now - self._half_start - stopped))
+
+    def remaining(self, now: float) -> float:
+        return self.half_length - self.clock(now)
+
+    # --- Changes ---
+    def goal(self, team: str):
+        self.goals[team] += 1
+        self.last_scorer = team
+        self.version += 1
+
+    def end_half(self, now: float) -> bool:
+        """Blow for the end of the half. True if another half follows."""
+        self.phase = HALFTIME if self.half < self.halves else FULL_TIME
+        self.version += 1
+        return self.phase == HALFTIME
+
+    def start_half(self, now: float):
+        self.half += 1
+        self.phase = PLAY
+        self.timeouts_left = dict.fromkeys(TEAMS, self.timeouts)
+        self._half_start, self._stopped = now, 0.0
+        self.version += 1
+
+    def start_timeout(self, team: str, now: float) -> bool:
+        """Stop the clock for `team`'s timeout, if play is on and they have one left."""
+        if not self.running or self.timeouts_left[team] <= 0:
+            return False
+        self.timeouts_left[team] -= 1
+        self.phase, self.timeout_team = TIMEOUT, team
+        self._stop_start = now
+        self.version += 1
+        return True
+
+    def end_timeout(self, now: float):
+        self._stopped += now - self._stop_start
+        self._stop_start = None
+        self.phase, self.timeout_team = PLAY, None
+        self.version += 1
+
+    # --- Reporting ---
+    def winner(self):
+        """The team ahead, or None for a draw."""
+        g, b = self.goals["green"], self.goals["blue"]
+        return "green" if g > b else "blue" if b > g else None
+
+    def result(self) -> dict:
+        return {"goals": dict(self.goals), "winner": self.winner(),
+                "half": self.half, "finished": self.finished}
+
+    def text(self, now: float) -> str:
+        """One line for a display, e.g. "Green 2 – 1 Blue   2nd half 07:42"."""
+        return describe(self.goals["green"], self.goals["blue"], self.half, self.phase,
+                        self.clock(now), self.timeout_team)
+
+
+def describe(green, blue, half, phase, clock, timeout_team=None) -> str:
+    """The scoreboard line for these values (see Scoreboard.text)."""
+    score = f"Green {green} – {blue} Blue"
+    if phase == FULL_TIME:
+        return f"{score}   Full time"
+    if phase == HALFTIME:
+        return f"{score}   Half time"
+    minutes, seconds = divmod(int(clock), 60)
+    ordinal = {1: "1st", 2: "2nd", 3: "3rd"}.get(half, f"{half}th")
+    line = f"{score}   {ordinal} half {minutes:02d}:{seconds:02d}"
+    if phase == TIMEOUT:
+        line += f"   Timeout {timeout_team}" if timeout_team else "   Timeout"
+    return line
+
+
+# --------------------
+# Batch
+# --------------------
+def play_match(seed, green, blue, scoreboard, planner=None, config=None) -> dict:
+    """One seeded headless match played to full time; its result and length."""
+    from sim import Simulation
+    random.seed(seed)
+    sim = Simulation(green_formations=green, blue_formations=blue,
+                     planner=planner, seed=seed, scoreboard=scoreboard, config=config)
+    try:
+        result = sim.play_match()
+    finally:
+        sim.planner.close()
+    result.update(seed=seed, ticks=sim.tick, seconds=sim.time)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Play seeded headless matches to full time.")
+    ap.add_argument("--matches", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=0, help="first seed; one per match")
+    ap.add_argument("--half", type=float, default=HALF_LENGTH, help="length of a half (s)")
+    ap.add_argument("--halves", type=int, default=HALVES)
+    ap.add_argument("--halftime", type=float, default=HALFTIME_BREAK, help="break between halves (s)")
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    ap.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                    help="override a SimConfig setting, e.g. max_depth=2.5 (repeatable)")
+    args = ap.parse_args(argv)
+
+    config = SimConfig(**parse_settings(args.set))
+    green, blue = load_formations(args.green), load_formations(args.blue)
+    wins = dict.fromkeys(TEAMS, 0)
+    t0 = time.perf_counter()
+    for seed in range(args.seed, args.seed + args.matches):
+        r = play_match(seed, green, blue, Scoreboard(args.half, args.halves, args.halftime),
+                       config=config)
+        if r["winner"]:
+            wins[r["winner"]] += 1
+        print(f"seed {seed}: green {r['goals']['green']} – {r['goals']['blue']} blue "
+              f"({r['ticks']} ticks)")
+    print(f"green won {wins['green']}, blue won {wins['blue']}, "
+          f"{args.matches - sum(wins.values())} drawn in {time.perf_counter() - t0:.1f} s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# server.py
+#
+# Authoritative match server: runs the headless Simulation on an asyncio
+# loop, takes key state from up to one human per team and streams
+# delta-compressed snapshots (snapcodec) to every client, spectators too.
+#
+#   python server.py --port 5555
+#   python client.py --port 5555 --role blue --gui
+
+import argparse
+import asyncio
+import struct
+from collections import OrderedDict
+
+from config import (
+    UPDATE_INTERVAL,
+    GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE,
+    load_formations,
+)
+import snapcodec
+
+
+# --------------------
+# Wire protocol
+# --------------------
+# Every message is a u16 length then the payload; the payload's first byte
+# says what it is.
+#   client → server   b"H" role                     hello
+#                     b"I" seq ack_tick key_mask    input (every tick)
+#   server → client   b"W" role interval_ms         welcome
+#                     snapcodec.encode(...)         snapshot (b"F"/b"D")
+ROLES = ("green", "blue", "spectator")
+KEY_BITS = ("Up", "Left", "Right", "s", "space", "d", "p")
+
+_LEN = struct.Struct("<H")
+_HELLO = struct.Struct("<cB")
+_WELCOME = struct.Struct("<cBH")
+_INPUT = struct.Struct("<cIIH")
+
+SNAPSHOT_HISTORY = 64          # ticks of snapshots kept as delta bases
+MAX_WRITE_BUFFER = 64 * 1024   # skip a tick's snapshot for clients this far behind
+
+
+def keys_to_mask(keys) -> int:
+    return sum(1 << i for i, k in enumerate(KEY_BITS) if k in keys)
+
+
+def mask_to_keys(mask: int) -> set:
+    return {k for i, k in enumerate(KEY_BITS) if mask & (1 << i)}
+
+
+async def read_message(reader) -> bytes:
+    (n,) = _LEN.unpack(await reader.readexactly(_LEN.size))
+    return await reader.readexactly(n)
+
+
+def write_message(writer, payload: bytes):
+    writer.write(_LEN.pack(len(payload)) + payload)
+
+
+# --------------------
+# Server
+# --------------------
+class Session:
+    """One connected client."""
+
+    def __init__(self, writer, role: str):
+        self.writer = writer
+        self.role = role
+        self.keys = set()
+        self.acked_tick = None  # newest snapshot the client has confirmed
+        self.input_seq = 0      # newest input received
+        self.bytes_sent = 0
+
+
+class MatchServer:
+    """
+    Owns the Simulation and is the only thing that advances it. Each tick:
+    apply everyone's keys, advance, capture one WorldState and send every
+    client a delta against the snapshot it last acknowledged (or a full one).
+    A team with no human client is played by the AI.
+    """
+
+    def __init__(self, sim, history=SNAPSHOT_HISTORY):
+        self.sim = sim
+        self.sessions = []
+        self.teams = {"green": None, "blue": None}
+        self.history = OrderedDict()  # tick → WorldState
+        self.limit = history
+        self.server = None
+        self.handlers = set()         # one task per connected client
+        for team in self.teams:
+            sim.release_human(team)
+
+    async def start(self, host="127.0.0.1", port=0) -> int:
+        """Listen on (host, port); returns the port actually bound."""
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and end every client's handler before returning."""
+        if self.server is not None:
+            self.server.close()
+        for task in list(self.handlers):
+            task.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    # --- Clients ---
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            await self._session(reader, writer)
+        finally:
+            self.handlers.discard(task)
+            writer.close()
+
+    async def _session(self, reader, writer):
+        try:
+            _, wanted = _HELLO.unpack(await read_message(reader))
+        except (asyncio.IncompleteReadError, struct.error):
+            return
+
+        role = ROLES[min(wanted, len(ROLES) - 1)]
+        if role != "spectator" and self.teams[role] is not None:
+            role = "spectator"            # that team already has its human
+        session = Session(writer, role)
+        if role != "spectator":
+            self.teams[role] = session
+            self.sim.enable_human(role)
+        self.sessions.append(session)
+        write_message(writer, _WELCOME.pack(b"W", ROLES.index(role), UPDATE_INTERVAL))
+
+        try:
+            while True:
+                msg = await read_message(reader)
+                if msg[:1] == b"I":
+                    _, seq, ack, mask = _INPUT.unpack(msg)
+                    session.input_seq = seq
+                    session.acked_tick = ack
+                    if role != "spectator":
+                        self._apply_keys(session, mask_to_keys(mask))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.sessions.remove(session)
+            if role != "spectator":
+                self.teams[role] = None
+                self.sim.release_human(role)
+
+    def _apply_keys(self, session, keys):
+        """Turn a key-state update into the press/release calls the sim expects."""
+        for k in keys - session.keys:
+            self.sim.press_key(k, session.role)
+        for k in session.keys - keys:
+            self.sim.release_key(k, session.role)
+        session.keys = keys
+
+    # --- Ticks ---
+    def step(self):
+        """Advance one tick and send everyone their snapshot."""
+        acks = {s: s.input_seq for s in self.sessions}   # inputs this tick will have applied
+        self.sim.advance(UPDATE_INTERVAL / 1000.0)
+        state = snapcodec.capture(self.sim)
+        self.history[state.tick] = state
+        while len(self.history) > self.limit:
+            self.history.popitem(last=False)
+
+        for s in self.sessions:
+            if s.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                continue                  # slow client: it will catch up from its last ack
+            data = snapcodec.encode(state, self.history.get(s.acked_tick), acks.get(s, 0))
+            write_message(s.writer, data)
+            s.bytes_sent += len(data)
+
+    async def run(self, seconds=None):
+        """Tick at UPDATE_INTERVAL of wall time, forever or for `seconds`."""
+        loop = asyncio.get_running_loop()
+        dt = UPDATE_INTERVAL / 1000.0
+        start = loop.time()
+        n = 0
+        while seconds is None or n * dt < seconds:
+            self.step()
+            n += 1
+            await asyncio.sleep(max(0.0, start + n * dt - loop.time()))
+
+
+# --------------------
+# Command line
+# --------------------
+async def _serve(args):
+    from sim import Simulation
+    sim = Simulation(green_formations=load_formations(args.green),
+                     blue_formations=load_formations(args.blue), seed=args.seed)
+    server = MatchServer(sim)
+    port = await server.start(args.host, args.port)
+    print(f"serving on {args.host}:{port}", flush=True)
+    try:
+        await server.run(args.seconds)
+    finally:
+        await server.close()
+        sim.planner.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run an authoritative match server.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=5555)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--seconds", type=float, default=None, help="stop after this long")
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    asyncio.run(_serve(ap.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
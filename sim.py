@@ -0,0 +1,666 @@
+# sim.py
+
+import math
+import random
+import physiology
+import contact
+import physics
+from config import (
+    DEFAULT_CONFIG,
+    FORMATION_THRESHOLD,
+    load_formations,
+    GREEN_FORMATIONS_FILE,
+    BLUE_FORMATIONS_FILE,
+    PASS_FREEZE,
+    PASS_COOLDOWN,
+    PASS_ANIM_STEPS,
+    PASS_ANIM_INTERVAL,
+    GOAL_RESET_DELAY,
+    TACKLE_COOLDOWN,
+    NAV_CELL_M,
+)
+
+from player import Player
+from scheduler import EventScheduler
+from planner import Planner, take_snapshot
+from ai import ActionType
+from rules import RuleEngine, RESTART_DELAY, plan_restart
+from scoreboard import Scoreboard
+from navigation import NavGrid
+from spatial import SpatialHash
+from avoidance import solve_velocities, NEIGHBOUR_DIST
+
+
+# (unique_id, label) left to right: green along the bottom, blue along the top
+GREEN_ORDER = [(1, "FB"), (2, "LB"), (4, "LF"),
+               (5, "C"),  (6, "RF"), (3, "RB")]
+BLUE_ORDER = [(13, "RB"), (16, "RF"), (15, "C"),
+              (14, "LF"), (12, "LB"), (11, "FB")]
+
+
+class Simulation:
+    """
+    The game itself, without a window.
+
+    Everything that happens over time is an event on `self.scheduler`:
+    the frame tick, pass animation steps, the pass freeze and cooldown,
+    AI surface locks, restarts after fouls, the post-goal reset and the
+    ends of halves and timeouts. A front end only has to
+    call advance() once per frame and draw the result.
+
+    Pass a canvas to have players draw themselves; leave it None to run headless.
+    Every player starts with the AI; a front end hands one to a human with
+    enable_human().
+    AI targets come from `planner` (a synchronous planner.Planner by default).
+    `seed` fixes the outcome of contested pickups and tackles.
+    `telemetry` (a telemetry.TelemetryStream) is fed every tick.
+    `scoreboard` sets the match format (a full-length match by default).
+    `config` (a config.SimConfig) holds the pool geometry, tick length and
+    physiology settings; config.DEFAULT_CONFIG if not given.
+    """
+
+    def __init__(self, canvas=None, green_formations=None, blue_formations=None,
+                 planner=None, seed=None, telemetry=None, scoreboard=None, config=None):
+        self.config = cfg = config if config is not None else DEFAULT_CONFIG
+        self.canvas = canvas
+        self.planner = planner if planner is not None else Planner()
+        self.telemetry = telemetry
+        self.rng = random.Random(seed)
+
+        # -- 1) Load free‐play formations (JSON) unless given directly --
+        self.free_green = (green_formations if green_formations is not None
+                           else load_formations(GREEN_FORMATIONS_FILE))
+        self.free_blue = (blue_formations if blue_formations is not None
+                          else load_formations(BLUE_FORMATIONS_FILE))
+
+        # Pool & goal bounds (pixels), worked out by the config
+        self.pool_left,  self.pool_right = cfg.pool_left, cfg.pool_right
+        self.pool_top,   self.pool_bottom = cfg.pool_top,  cfg.pool_bottom
+        self.goal_x1,    self.goal_x2 = cfg.goal_x1,   cfg.goal_x2
+        self.goal_top_y1, self.goal_top_y2 = cfg.goal_top_y1, cfg.goal_top_y2
+        self.goal_bottom_y1, self.goal_bottom_y2 = cfg.goal_bottom_y1, cfg.goal_bottom_y2
+        self.nav = NavGrid(self.pool_left, self.pool_top, self.pool_right, self.pool_bottom,
+                           NAV_CELL_M * cfg.scale)
+        self.spatial = SpatialHash(NEIGHBOUR_DIST)
+        self.bodies = SpatialHash(contact.PICKUP_RADIUS * 2, depth_cell=contact.BODY_THICKNESS_M)
+
+        # Game state
+        self.dt = cfg.dt
+        self.tick = 0
+        self.possessing_player = None
+        self.chaser = None          # green player sent after the puck
+        self.blue_chaser = None
+        self.scoreboard = scoreboard if scoreboard is not None else Scoreboard()
+        self.pass_frozen = False    # controlled movement frozen after a pass
+        self.pass_cooldown = False  # pickup blocked after a pass
+        self.tackle_locked = False  # no tackles just after possession changes
+        self.game_paused = False    # pause while “Goal!” is displayed
+        self.green_form = "center_court"
+        self.blue_form = "center_court"
+        self.actions = {}           # unique_id → ai.Action last applied
+        self.rules = RuleEngine()
+        self.pass_lanes = {}        # the AI's pass-lane cache; outlives a tick
+        self.last_call = None       # rules.Call of the last foul
+
+        # pending events we may need to cancel
+        self.scheduler = EventScheduler()
+        self._pass_anim_event = None
+        self._freeze_event = None
+        self._cooldown_event = None
+        self._tackle_event = None
+        self._period_event = None    # end of the half, or of halftime
+        self._timeout_event = None
+        self._goal_event = None      # kickoff after a goal
+        self._restart_event = None   # restart after a foul
+
+        # puck starts on the centre spot
+        self.puck_radius = cfg.puck_radius
+        self.puck_x = (self.pool_left + self.pool_right) / 2
+        self.puck_y = (self.pool_top + self.pool_bottom) / 2
+
+        # create players **and record their spawn positions**
+        self.players = {}
+        self._create_field_players()
+
+        # humans: at most one per team, each with their own keys and pass
+        # charge; a team without one is played entirely by the AI
+        self.controlled = {"green": None, "blue": None}
+        self.keys = {"green": set(), "blue": set()}
+        self.pass_hold = {"green": 0.0, "blue": 0.0}   # seconds charged so far
+
+        # first frame, and the end of the first half
+        self.scheduler.schedule_at(self.dt, self._tick)
+        self._period_event = self.scheduler.schedule(self.scoreboard.half_length, self._end_half)
+
+    def _create_field_players(self):
+        # 1) Left-to-right ordering for green (bottom) and blue (top)
+        green_order, blue_order = GREEN_ORDER, BLUE_ORDER
+
+        # 2) Compute horizontal spacing and Y positions
+        n = len(green_order)
+        spacing = (self.pool_right - self.pool_left) / (n - 1)
+        y_green = self.pool_bottom - self.config.player_radius
+        y_blue = self.pool_top + self.config.player_radius
+
+        # 3) Green players face “up” (angle=0), blue face “down” (angle=π)
+        for color, order, y, angle in (("green", green_order, y_green, 0.0),
+                                       ("blue",  blue_order,  y_blue,  math.pi)):
+            for i, (uid, label) in enumerate(order):
+                x = self.pool_left + i * spacing
+                p = Player(
+                    self.canvas,
+                    x, y,
+                    color=color,
+                    unique_id=uid,
+                    label=label,
+                    angle=angle
+                )
+                # record spawn for resets
+                p.start_x, p.start_y = x, y
+
+                # initialize physiology for this player
+                physiology.init_player_phys(p, self.config)
+
+                self.players[uid] = p
+
+    # --- Clock ---
+    @property
+    def time(self) -> float:
+        """Current simulation time in seconds."""
+        return self.scheduler.now
+
+    def advance(self, dt: float):
+        """Run every event due in the next `dt` seconds of sim time."""
+        self.scheduler.run_until(self.scheduler.now + dt)
+
+    def run_until(self, t: float):
+        """Run every event up to absolute sim time `t`."""
+        self.scheduler.run_until(t)
+
+    def play_match(self) -> dict:
+        """Run to full time; returns the scoreboard's result."""
+        while not self.scoreboard.finished:
+            self.advance(self.dt)
+        return self.scoreboard.result()
+
+    # --- Match clock ---
+    def call_timeout(self, team: str) -> bool:
+        """Stop play and the clock for `team`'s timeout, if they have one left."""
+        if not self.scoreboard.start_timeout(team, self.time):
+            return False
+        self.scheduler.cancel(self._period_event)
+        self._period_event = None
+        self.scheduler.cancel(self._pass_anim_event)
+        self._pass_anim_event = None
+        self._timeout_event = self.scheduler.schedule(self.scoreboard.timeout_length,
+                                                      self._end_timeout)
+        return True
+
+    def _end_timeout(self):
+        self._timeout_event = None
+        self.scoreboard.end_timeout(self.time)
+        self._period_event = self.scheduler.schedule(self.scoreboard.remaining(self.time),
+                                                     self._end_half)
+
+    def _end_half(self):
+        self._period_event = None
+        self.scheduler.cancel(self._pass_anim_event)
+        self._pass_anim_event = None
+        # a goal or foul stoppage still running is overtaken by the next kickoff
+        self.scheduler.cancel(self._goal_event)
+        self._goal_event = None
+        self.scheduler.cancel(self._restart_event)
+        self._restart_event = None
+        self.game_paused = False
+        if self.scoreboard.end_half(self.time):
+            self._period_event = self.scheduler.schedule(self.scoreboard.halftime,
+                                                         self._start_half)
+
+    def _start_half(self):
+        self.scoreboard.start_half(self.time)
+        self._kickoff()
+        self._period_event = self.scheduler.schedule(self.scoreboard.half_length, self._end_half)
+
+    # --- Humans ---
+    # The single-player front end only ever drives green, through these.
+    @property
+    def controlled_player(self):
+        return self.controlled["green"]
+
+    @controlled_player.setter
+    def controlled_player(self, player):
+        self.controlled["green"] = player
+
+    @property
+    def keys_pressed(self):
+        return self.keys["green"]
+
+    @property
+    def pass_hold_time(self):
+        return self.pass_hold["green"]
+
+    def is_human(self, player) -> bool:
+        return player is not None and self.controlled.get(player.color) is player
+
+    def enable_human(self, team: str, unique_id=None):
+        """Hand `team`'s player `unique_id` (by default the one nearest the puck) to a human."""
+        if self.controlled[team] is not None:
+            return
+        p = (self.players[unique_id] if unique_id is not None
+             else self.find_nearest_teammate_to_puck(team))
+        self.controlled[team] = p
+        self.keys[team].clear()
+        self.pass_hold[team] = 0.0
+        if self.chaser is p:
+            self.chaser = None
+        if self.blue_chaser is p:
+            self.blue_chaser = None
+
+    def release_human(self, team: str):
+        """Give `team`'s human player back to the AI."""
+        self.controlled[team] = None
+        self.keys[team].clear()
+        self.pass_hold[team] = 0.0
+
+    # --- Input ---
+    def press_key(self, keysym: str, team: str = "green"):
+        # only record the key — do NOT fire passes here
+        self.keys[team].add(keysym)
+        if keysym.lower() == 'p':
+            self.switch_control(team)
+        elif keysym.lower() == 't':
+            self.call_timeout(team)
+
+    def release_key(self, keysym: str, team: str = "green"):
+        # if you let go of space—trigger a pass with whatever you've charged
+        p = self.controlled[team]
+        if (keysym == "space"
+            and p is not None
+            and self.possessing_player is p
+            and self.pass_hold[team] > 0.0
+                and not self.pass_cooldown):
+            self.trigger_pass(self.pass_hold[team], passer=p)
+
+        # always drop the key
+        self.keys[team].discard(keysym)
+
+    def find_nearest_teammate_to_puck(self, team: str = "green"):
+        """Return the Player of `team` (not its current human) closest to the puck."""
+        best = None
+        best_dist = float('inf')
+        for p in self.players.values():
+            if p.color == team and p is not self.controlled[team]:
+                d = math.hypot(p.x - self.puck_x, p.y - self.puck_y)
+                if d < best_dist:
+                    best_dist, best = d, p
+        return best
+
+    def switch_control(self, team: str = "green"):
+        """Switch `team`'s human to the teammate nearest the puck."""
+        if self.controlled[team] is None:
+            return
+        new_ctrl = self.find_nearest_teammate_to_puck(team)
+        if not new_ctrl:
+            return
+        self.controlled[team] = new_ctrl
+        # ensure they drop any AI‐chaser status
+        if self.chaser is new_ctrl:
+            self.chaser = None
+        if self.blue_chaser is new_ctrl:
+            self.blue_chaser = None
+
+    def handle_input(self):
+        """Move every human's player by their keys (see physics.human_move)."""
+        for team, p in self.controlled.items():
+            if p is not None:
+                physics.human_move(
+                    p, self.keys[team],
+                    self.pool_left, self.pool_right,
+                    self.pool_top, self.pool_bottom
+                )
+
+    # --- Puck ---
+    def contest_puck(self):
+        """
+        Possession is decided on the bottom, where the puck lies:
+        a carrier who rises out of reach leaves it behind, opponents on the
+        bottom next to a carried puck tackle for it, and a loose puck goes
+        to whoever can reach it (a weighted draw if several can).
+        """
+        self.bodies.rebuild(self.players.values())
+        carrier = self.possessing_player
+
+        if carrier is not None:
+            if not contact.on_bottom(carrier, self.config):
+                self.possessing_player = None
+                return
+            if self.tackle_locked:
+                return
+            winner = contact.resolve_tackle(self.bodies, carrier,
+                                            self.puck_x, self.puck_y, self.rng, self.config)
+        elif not self.pass_cooldown:
+            winner = contact.resolve_loose_puck(self.bodies,
+                                                self.puck_x, self.puck_y, self.rng, self.config)
+        else:
+            winner = None
+
+        if winner is not None:
+            self.possessing_player = winner
+            self.tackle_locked = True
+            self.scheduler.cancel(self._tackle_event)
+            self._tackle_event = self.scheduler.schedule(TACKLE_COOLDOWN, self._end_tackle_lock)
+
+    def _end_tackle_lock(self):
+        self.tackle_locked = False
+        self._tackle_event = None
+
+    def clamp_puck_to_player(self, player):
+        """Snap the puck to the tip of the given player."""
+        angle, reach = player.angle, self.config.player_radius + self.puck_radius
+        self.puck_x = player.x + math.sin(angle) * reach
+        self.puck_y = player.y - math.cos(angle) * reach
+
+    def pick_chaser(self):
+        """
+        Unless their own team has the puck, send the nearest player of each
+        team after it, never a human's player.
+        """
+        holder = self.possessing_player.color if self.possessing_player else None
+
+        def nearest(color):
+            if holder == color:
+                return None
+            best = None
+            best_d = float('inf')
+            for p in self.players.values():
+                if p.color != color or self.is_human(p):
+                    continue
+                d = math.hypot(p.x - self.puck_x, p.y - self.puck_y)
+                if d < best_d:
+                    best_d, best = d, p
+            return best
+
+        self.chaser = nearest("green")
+        self.blue_chaser = nearest("blue")
+
+    def trigger_pass(self, t: float, passer=None, toward=None):
+        """
+        t ∈ [0,1] maps linearly to a pass of 2 m → 3 m.
+        Clears possession immediately so you can’t re‐pass mid‐animation.
+
+        `passer` defaults to green's human; AI passes give a `toward`
+        (x, y) and the passer turns to face it first.
+        Only a human's own passes freeze play.
+        """
+        p = passer or self.controlled_player
+        # only if you still have the puck & no cooldown
+        if not p or self.pass_cooldown:
+            return
+        if toward is not None:
+            p.update_angle(math.atan2(toward[1] - p.y, toward[0] - p.x) + math.pi / 2)
+
+        # 1) Clear possession & start timers
+        self.possessing_player = None
+        self.rules.on_pass(self, p)
+        self.pass_hold[p.color] = 0.0
+        self.pass_cooldown = True
+        self.scheduler.cancel(self._cooldown_event)
+        self._cooldown_event = self.scheduler.schedule(PASS_COOLDOWN, self._end_pass_cooldown)
+        if self.is_human(p):
+            self.pass_frozen = True
+            self.scheduler.cancel(self._freeze_event)
+            self._freeze_event = self.scheduler.schedule(PASS_FREEZE, self._end_pass_freeze)
+
+        # 2) Compute pass distance (meters → pixels)
+        t = max(0.0, min(1.0, t))
+        pass_dist_m = 2 + t           # 2 m base + up to 1 m extra = max 3 m
+        dist_px = pass_dist_m * self.config.scale
+
+        # **NB** — **do not** add PLAYER_RADIUS here!
+        tx = p.x + math.sin(p.angle) * dist_px
+        ty = p.y - math.cos(p.angle) * dist_px
+
+        # 3) Animate in PASS_ANIM_STEPS steps
+        dx = (tx - p.x) / PASS_ANIM_STEPS
+        dy = (ty - p.y) / PASS_ANIM_STEPS
+        self.scheduler.cancel(self._pass_anim_event)
+        self._pass_step(0, dx, dy)
+
+    def _pass_step(self, i, dx, dy):
+        if i >= PASS_ANIM_STEPS:
+            self._pass_anim_event = None
+            return
+        self.puck_x += dx
+        self.puck_y += dy
+        self._pass_anim_event = self.scheduler.schedule(
+            PASS_ANIM_INTERVAL, self._pass_step, i + 1, dx, dy
+        )
+
+    def _end_pass_freeze(self):
+        self.pass_frozen = False
+        self._freeze_event = None
+
+    def _end_pass_cooldown(self):
+        self.pass_cooldown = False
+        self._cooldown_event = None
+
+    # --- Main Loop ---
+    def _tick(self):
+        # schedule the next frame first so same-time events keep a stable order;
+        # frame n is due at n × dt exactly, so rounding never piles up
+        self.tick += 1
+        self.scheduler.schedule_at((self.tick + 1) * self.dt, self._tick)
+        self._step(self.dt)
+        if self.telemetry is not None:
+            self.telemetry.record(self)
+
+    def _step(self, dt):
+        cfg = self.config
+
+        # --- 0) Update each player’s breath‐hold ---
+        for p in self.players.values():
+            is_ctrl = self.is_human(p)
+            want_dive = is_ctrl and ("s" in self.keys[p.color])
+            physiology.update_player_breath_hold(
+                p,
+                dt,
+                is_ctrl,
+                want_dive,
+                puck_pos=(self.puck_x, self.puck_y),
+                scheduler=self.scheduler,
+                config=cfg
+            )
+
+        # still paused by goal banner, frozen after a pass, or the clock stopped?
+        if self.game_paused or self.pass_frozen or not self.scoreboard.running:
+            return
+
+        # --- 1) Human input & movement ---
+        start = {uid: (p.x, p.y) for uid, p in self.players.items()}
+        self.handle_input()
+
+        # --- 1a) Charge & auto-fire pass on full charge ---
+        for team, p in self.controlled.items():
+            if (p is not None
+                and self.possessing_player is p
+                and "space" in self.keys[team]
+                    and not self.pass_cooldown):
+                self.pass_hold[team] = min(1.0, self.pass_hold[team] + dt)
+                if self.pass_hold[team] >= 1.0:
+                    self.trigger_pass(self.pass_hold[team], passer=p)
+                    self.keys[team].discard("space")
+
+        # --- 3) Carry or drop puck ---
+        if self.possessing_player:
+            self.clamp_puck_to_player(self.possessing_player)
+            # a human can only drop the puck their own player is carrying
+            if any(p is self.possessing_player and "d" in self.keys[team]
+                   for team, p in self.controlled.items()):
+                self.possessing_player = None
+
+        # --- 4) One chaser per team for a puck they don't hold ---
+        self.pick_chaser()
+
+        # --- 5) Compute reference points ---
+        puck_cx, puck_cy = self.puck_x, self.puck_y
+
+        # green team reference & formation name
+        if self.possessing_player and self.possessing_player.color == "green":
+            P = self.possessing_player
+            ref_x = P.x + math.sin(P.angle) * cfg.player_radius
+            ref_y = P.y - math.cos(P.angle) * cfg.player_radius
+            if ref_x < cfg.wall_left:
+                suffix = "_leftwall"
+            elif ref_x > cfg.wall_right:
+                suffix = "_rightwall"
+            else:
+                suffix = ""
+            green_form = f"{P.label}teammate_possession{suffix}"
+        elif self.chaser:
+            P = self.chaser
+            ref_x = P.x + math.sin(P.angle) * cfg.player_radius
+            ref_y = P.y - math.cos(P.angle) * cfg.player_radius
+            green_form = f"{P.label}teammate_possession"
+        else:
+            ref_x, ref_y = puck_cx, puck_cy
+            if ref_x < cfg.wall_left:
+                green_form = "left_wall"
+            elif ref_x > cfg.wall_right:
+                green_form = "right_wall"
+            else:
+                green_form = "center_court"
+
+        # blue team always free-play around puck
+        if puck_cx < cfg.wall_left:
+            blue_form = "left_wall"
+        elif puck_cx > cfg.wall_right:
+            blue_form = "right_wall"
+        else:
+            blue_form = "center_court"
+
+        self.green_form, self.blue_form = green_form, blue_form
+
+        # --- 6) Plan, then move every AI player toward its target ---
+        # An async planner may hand back the plan from an earlier tick.
+        # Chasers and attackers share one flow field per target (puck, each goal),
+        # then one avoidance solve turns every wish into a collision-free velocity.
+        self.planner.submit(take_snapshot(self, self.tick, ref_x, ref_y))
+        self.nav.set_occupancy(self.players.values())
+        preferred = {}
+        self.actions = self.planner.collect()
+        for uid, action in self.actions.items():
+            player = self.players[uid]
+            if self.is_human(player) or action.target is None:
+                continue
+            player.dive_intent = action.dive
+            tx, ty = action.target
+
+            # an AI pass: strength from the distance to the receiver
+            if action.type == ActionType.PASS:
+                if player is self.possessing_player and not self.pass_cooldown:
+                    t = math.hypot(tx - player.x, ty - player.y) / cfg.scale - 2
+                    self.trigger_pass(t, passer=player, toward=(tx, ty))
+                continue
+
+            field = None
+            if action.type in (ActionType.DEFEND, ActionType.SCORE_GOAL):
+                field = self.nav.flow_field(tx, ty)
+            preferred[uid] = physics.preferred_velocity(
+                player, tx, ty, FORMATION_THRESHOLD, field
+            )
+
+        self.spatial.rebuild(self.players.values())
+        for uid, (vx, vy) in solve_velocities(self.players, preferred, self.spatial).items():
+            physics.steer(
+                self.players[uid], vx, vy,
+                self.pool_left, self.pool_right,
+                self.pool_top, self.pool_bottom
+            )
+
+        # remember how far everyone moved, for next frame's avoidance
+        for uid, (x0, y0) in start.items():
+            p = self.players[uid]
+            p.vx, p.vy = p.x - x0, p.y - y0
+
+        # --- 6a) Pickups & tackles on the bottom ---
+        self.contest_puck()
+
+        # --- 7) Fouls stop play; otherwise check for a goal ---
+        call = self.rules.check(self)
+        if call is not None:
+            self._stop_for_foul(call)
+        else:
+            self._check_goal()
+
+    def _check_goal(self):
+        # puck bounds & center
+        cx, cy = self.puck_x, self.puck_y
+        r = self.puck_radius
+        x1, y1, x2, y2 = cx - r, cy - r, cx + r, cy + r
+
+        scored = False
+        # Goal at top (green scores)
+        if (x1 >= self.goal_x1 and x2 <= self.goal_x2 and
+            y1 >= self.goal_top_y1 and y2 <= self.goal_top_y2) \
+            or (self.goal_x1 <= cx <= self.goal_x2 and
+                self.goal_top_y1 <= cy <= self.goal_top_y2):
+            scorer = "green"
+            scored = True
+
+        # Goal at bottom (blue scores)
+        if not scored and (
+            x1 >= self.goal_x1 and x2 <= self.goal_x2 and
+            y1 >= self.goal_bottom_y1 and y2 <= self.goal_bottom_y2
+        ) or (self.goal_x1 <= cx <= self.goal_x2 and
+              self.goal_bottom_y1 <= cy <= self.goal_bottom_y2):
+            scorer = "blue"
+            scored = True
+
+        if scored:
+            self.scoreboard.goal(scorer)
+            # stop any pass still in flight, pause, and schedule the reset
+            self.scheduler.cancel(self._pass_anim_event)
+            self._pass_anim_event = None
+            self.game_paused = True
+            self._goal_event = self.scheduler.schedule(GOAL_RESET_DELAY, self._reset_after_goal)
+
+    def _stop_for_foul(self, call):
+        """Stop play and restart from the right spot after RESTART_DELAY."""
+        self.last_call = call
+        self.scheduler.cancel(self._pass_anim_event)
+        self._pass_anim_event = None
+        self.possessing_player = None
+        self.game_paused = True
+        self._restart_event = self.scheduler.schedule(RESTART_DELAY, self._restart, call)
+
+    def _restart(self, call):
+        self._restart_event = None
+        (self.puck_x, self.puck_y), _, moves = plan_restart(self, call)
+        for uid, (x, y, angle) in moves.items():
+            p = self.players[uid]
+            p.update_position(x - p.x, y - p.y)
+            p.update_angle(angle)
+        self.chaser = None
+        self.blue_chaser = None
+        self.rules.reset()
+        self.game_paused = False
+
+    def _reset_after_goal(self):
+        self._goal_event = None
+        self._kickoff()
+        self.game_paused = False
+
+    def _kickoff(self):
+        # reset puck
+        self.puck_x = (self.pool_left + self.pool_right)/2
+        self.puck_y = (self.pool_top + self.pool_bottom)/2
+        # reset players to their spawn
+        for p in self.players.values():
+            dx = p.start_x - p.x
+            dy = p.start_y - p.y
+            p.update_position(dx, dy)
+        # clear possession
+        self.possessing_player = None
+        self.chaser = None
+        self.blue_chaser = None
+        self.rules.reset()
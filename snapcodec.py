@@ -0,0 +1,279 @@
+# snapcodec.py
+#
+# Compact binary snapshots of the full game state: players, puck, timers,
+# possession and chasers. Snapshots are delta-encoded against the last
+# one the receiver acknowledged.
+#
+# A snapshot is quantised into a fixed-layout frame (a header, then one
+# record per player). A delta is the frame XOR-ed against the base frame,
+# sent as a bitmask of the bytes that differ plus those bytes only.
+# Unchanged fields XOR to zero and a small move only touches the low bytes
+# of a coordinate, so a 12-player tick is ~120 bytes against ~370 for a
+# full frame; no message is ever larger than that (see max_message_size).
+#
+#   python snapcodec.py --seconds 30      # bytes/tick and encode/decode speed
+
+import argparse
+import math
+import random
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from scoreboard import PHASES
+
+POS_SCALE = 16         # fixed point: positions and velocities in 1/16 px
+ANGLE_STEPS = 1 << 16  # a full turn in 16 bits
+DEPTH_SCALE = 1000     # depth in mm
+TIME_SCALE = 1000      # timers in ms
+UNIT_SCALE = 0xFFFF    # 0‥1 fractions (long-term stamina)
+NO_PLAYER = 255
+NO_TIMER = 0xFFFF      # a timer that is not set (dive_threshold None)
+TEAMS = ("green", "blue")
+
+# flag bits of WorldState.flags
+PAUSED, PASS_FROZEN, PASS_COOLDOWN, TACKLE_LOCKED = 1, 2, 4, 8
+GREEN_SCORED_LAST, BLUE_SCORED_LAST = 16, 32
+
+# Quantised (integer) state; what goes on the wire
+PlayerState = namedtuple(
+    "PlayerState",
+    "uid team x y angle depth vx vy breath stamina dive_time surface_lock threshold"
+)
+WorldState = namedtuple(
+    "WorldState",
+    "tick time puck_x puck_y possessing chaser blue_chaser green_human blue_human "
+    "flags green_goals blue_goals half phase clock pass_hold_green pass_hold_blue players"
+)
+
+# Frame layout
+#   tick, time, puck x, puck y, possessing, chaser, blue chaser, green human,
+#   blue human, flags, green goals, blue goals, half, phase (index into
+#   scoreboard.PHASES), clock, green pass hold, blue pass hold, player count
+_WORLD = struct.Struct("<IIiiBBBBBBBBBBIHHB")
+#   uid, team, x, y, angle, depth, vx, vy, breath, stamina, dive time,
+#   surface lock, dive threshold
+_PLAYER = struct.Struct("<BBiiHHhhHHHHH")
+# kind, base tick, input ack
+_MESSAGE = struct.Struct("<cII")
+FULL, DELTA = b"F", b"D"
+
+# XOR-ed byte → "1" if it changed, for building the bitmask in one go
+_CHANGED = bytes(b"0" + b"1" * 255)
+
+
+def q_pos(v: float) -> int:
+    return int(round(v * POS_SCALE))
+
+
+def dq_pos(q: int) -> float:
+    return q / POS_SCALE
+
+
+def q_angle(a: float) -> int:
+    return int(round((a % (2 * math.pi)) / (2 * math.pi) * ANGLE_STEPS)) % ANGLE_STEPS
+
+
+def dq_angle(q: int) -> float:
+    return q / ANGLE_STEPS * 2 * math.pi
+
+
+def q_time(t) -> int:
+    if t is None:
+        return NO_TIMER
+    return min(NO_TIMER - 1, max(0, int(round(t * TIME_SCALE))))
+
+
+def dq_time(q: int):
+    return None if q == NO_TIMER else q / TIME_SCALE
+
+
+def frame_size(n_players: int) -> int:
+    return _WORLD.size + n_players * _PLAYER.size
+
+
+def _mask_size(n_players: int) -> int:
+    return (frame_size(n_players) + 7) // 8
+
+
+def max_message_size(n_players: int) -> int:
+    """Upper bound on an encoded snapshot: a full frame and its header."""
+    return _MESSAGE.size + frame_size(n_players)
+
+
+# --------------------
+# Capture
+# --------------------
+def capture(sim) -> WorldState:
+    """Quantise the current tick of `sim`."""
+    def uid(p):
+        return p.unique_id if p is not None else NO_PLAYER
+    board = sim.scoreboard
+    players = tuple(
+        PlayerState(
+            p.unique_id, TEAMS.index(p.color), q_pos(p.x), q_pos(p.y),
+            q_angle(p.angle), int(round(p.depth * DEPTH_SCALE)),
+            q_pos(p.vx), q_pos(p.vy),
+            q_time(p.short_term_stamina),
+            int(round(min(1.0, max(0.0, p.long_term_stamina)) * UNIT_SCALE)),
+            q_time(p.current_dive_time), q_time(p.surface_lock_timer),
+            q_time(p.dive_threshold),
+        )
+        for _, p in sorted(sim.players.items())
+    )
+    flags = ((PAUSED if sim.game_paused else 0) |
+             (PASS_FROZEN if sim.pass_frozen else 0) |
+             (PASS_COOLDOWN if sim.pass_cooldown else 0) |
+             (TACKLE_LOCKED if sim.tackle_locked else 0) |
+             {"green": GREEN_SCORED_LAST, "blue": BLUE_SCORED_LAST}.get(board.last_scorer, 0))
+    return WorldState(
+        sim.tick, int(round(sim.time * TIME_SCALE)), q_pos(sim.puck_x), q_pos(sim.puck_y),
+        uid(sim.possessing_player), uid(sim.chaser), uid(sim.blue_chaser),
+        uid(sim.controlled["green"]), uid(sim.controlled["blue"]),
+        flags, board.goals["green"], board.goals["blue"], board.half,
+        PHASES.index(board.phase), int(round(board.clock(sim.time) * TIME_SCALE)),
+        q_time(sim.pass_hold["green"]), q_time(sim.pass_hold["blue"]),
+        players,
+    )
+
+
+# --------------------
+# Frames
+# --------------------
+def pack(state: WorldState, buf=None, offset=0) -> memoryview:
+    """
+    Write `state`'s frame into `buf` (a bytearray, allocated if None) at
+    `offset`; returns a view of just the frame.
+    """
+    size = frame_size(len(state.players))
+    if buf is None:
+        buf = bytearray(offset + size)
+    _WORLD.pack_into(buf, offset, *state[:-1], len(state.players))
+    pos = offset + _WORLD.size
+    for p in state.players:
+        _PLAYER.pack_into(buf, pos, *p)
+        pos += _PLAYER.size
+    return memoryview(buf)[offset:offset + size]
+
+
+def unpack(frame) -> WorldState:
+    """The WorldState in `frame` (any buffer); nothing is copied up front."""
+    *world, n = _WORLD.unpack_from(frame, 0)
+    players = tuple(PlayerState._make(_PLAYER.unpack_from(frame, _WORLD.size + i * _PLAYER.size))
+                    for i in range(n))
+    return WorldState(*world, players)
+
+
+# --------------------
+# Messages
+# --------------------
+def encode(state: WorldState, base: WorldState = None, input_ack: int = 0) -> bytes:
+    """
+    `state` as one message. With a `base` the receiver is known to hold,
+    only the bytes that differ from it are sent; a full frame is sent
+    instead when there is no compatible base or the delta would not be
+    any smaller.
+    """
+    n = len(state.players)
+    size = frame_size(n)
+    out = bytearray(_MESSAGE.size + size)
+    cur = pack(state, out, _MESSAGE.size)
+
+    if base is not None and [p.uid for p in base.players] == [p.uid for p in state.players]:
+        # 1) XOR the frames as two big integers
+        diff = (int.from_bytes(cur, "little") ^ int.from_bytes(pack(base), "little")
+                ).to_bytes(size, "little")
+        # 2) bit i of the mask says byte i changed; only those bytes are sent
+        changed = diff.replace(b"\0", b"")
+        mask_bytes = _mask_size(n)
+        length = _MESSAGE.size + mask_bytes + len(changed)
+        if length < len(out):
+            mask = int(diff.translate(_CHANGED)[::-1], 2)
+            return b"".join((_MESSAGE.pack(DELTA, base.tick, input_ack),
+                             mask.to_bytes(mask_bytes, "little"), changed))
+
+    _MESSAGE.pack_into(out, 0, FULL, 0, input_ack)
+    return bytes(out)
+
+
+def decode(data, bases) -> tuple:
+    """
+    Returns (WorldState, input_ack). `bases` maps tick → WorldState the
+    receiver already holds; a delta needs its base tick in there.
+    """
+    view = memoryview(data)
+    kind, base_tick, input_ack = _MESSAGE.unpack_from(view, 0)
+    if kind == FULL:
+        return unpack(view[_MESSAGE.size:]), input_ack
+
+    base = bases.get(base_tick)
+    if base is None:
+        raise KeyError(f"delta against tick {base_tick}, which this receiver does not hold")
+    # 1) scatter the changed bytes back into a zeroed frame-sized XOR
+    size = frame_size(len(base.players))
+    mask_end = _MESSAGE.size + _mask_size(len(base.players))
+    mask = int.from_bytes(view[_MESSAGE.size:mask_end], "little")
+    changed = view[mask_end:]
+    diff = bytearray(size)
+    j = 0
+    while mask:
+        low = mask & -mask
+        diff[low.bit_length() - 1] = changed[j]
+        mask ^= low
+        j += 1
+    # 2) XOR it onto the base frame
+    frame = (int.from_bytes(pack(base), "little") ^ int.from_bytes(diff, "little")
+             ).to_bytes(size, "little")
+    return unpack(frame), input_ack
+
+
+# --------------------
+# Benchmark
+# --------------------
+def main(argv=None):
+    from config import (UPDATE_INTERVAL, GREEN_FORMATIONS_FILE,
+                        BLUE_FORMATIONS_FILE, load_formations)
+    from sim import Simulation
+
+    ap = argparse.ArgumentParser(description="Measure snapshot size and codec throughput.")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    args = ap.parse_args(argv)
+
+    # 1) Capture every tick of a seeded headless match
+    random.seed(args.seed)
+    sim = Simulation(green_formations=load_formations(args.green),
+                     blue_formations=load_formations(args.blue), seed=args.seed)
+    states = []
+    try:
+        for _ in range(int(args.seconds * 1000 / UPDATE_INTERVAL)):
+            sim.advance(UPDATE_INTERVAL / 1000.0)
+            states.append(capture(sim))
+    finally:
+        sim.planner.close()
+    n = len(sim.players)
+
+    # 2) Encode each tick against the previous one, then decode it back
+    t0 = time.perf_counter()
+    fulls = [encode(s) for s in states]
+    t1 = time.perf_counter()
+    deltas = [encode(s, prev) for prev, s in zip(states, states[1:])]
+    t2 = time.perf_counter()
+    bases = {s.tick: s for s in states}
+    decoded = [decode(d, bases)[0] for d in deltas]
+    t3 = time.perf_counter()
+    assert decoded == states[1:], "delta round trip changed the state"
+
+    sizes = [len(d) for d in deltas]
+    print(f"{len(states)} ticks, {n} players", file=sys.stderr)
+    print(f"full   {len(fulls[0])} bytes, {len(fulls) / (t1 - t0):,.0f} encodes/s", file=sys.stderr)
+    print(f"delta  mean {sum(sizes) / len(sizes):.0f} bytes, max {max(sizes)} "
+          f"(bound {max_message_size(n)}), {len(deltas) / (t2 - t1):,.0f} encodes/s, "
+          f"{len(deltas) / (t3 - t2):,.0f} decodes/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
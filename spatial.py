@@ -0,0 +1,76 @@
+# spatial.py
+
+import math
+
+
+class SpatialHash:
+    """
+    Uniform-grid bucket index over (x, y), or (x, y, depth) when
+    `depth_cell` is given, for neighbour queries.
+
+    rebuild() once per tick, then query() returns every item in the cells
+    overlapping a circle (and depth band). Callers still check exact
+    distances; the hash only keeps them from looking at the whole pool.
+    """
+
+    def __init__(self, cell_px: float, depth_cell: float = None):
+        self.cell = cell_px
+        self.depth_cell = depth_cell
+        self.buckets = {}
+        self._layers = range(0)   # depth buckets in use (3D only)
+
+    def _key(self, x: float, y: float, depth: float = 0.0):
+        if self.depth_cell is None:
+            return int(x // self.cell), int(y // self.cell)
+        return int(x // self.cell), int(y // self.cell), int(depth // self.depth_cell)
+
+    def rebuild(self, items):
+        """Index `items` (anything with .x and .y, plus .depth for a 3D hash)."""
+        self.buckets = {}
+        for item in items:
+            key = self._key(item.x, item.y, getattr(item, "depth", 0.0))
+            self.buckets.setdefault(key, []).append(item)
+        if self.depth_cell is not None and self.buckets:
+            zs = [k[2] for k in self.buckets]
+            self._layers = range(min(zs), max(zs) + 1)
+
+    def query(self, x: float, y: float, radius: float,
+              depth_min: float = None, depth_max: float = None):
+        """Items whose bucket overlaps the circle at (x, y) and, in 3D, the depth band."""
+        c0, r0 = int((x - radius) // self.cell), int((y - radius) // self.cell)
+        c1, r1 = int((x + radius) // self.cell), int((y + radius) // self.cell)
+        if self.depth_cell is not None and depth_min is not None:
+            layers = range(int(depth_min // self.depth_cell),
+                           int(depth_max // self.depth_cell) + 1)
+        else:
+            layers = self._layers
+
+        found = []
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                if self.depth_cell is None:
+                    found.extend(self.buckets.get((c, r), ()))
+                else:
+                    for z in layers:
+                        found.extend(self.buckets.get((c, r, z), ()))
+        return found
+
+    def neighbours(self, item, radius: float, depth_range: float = None):
+        """
+        Other items within `radius` of `item` (exact distance check) and,
+        if `depth_range` is given, within that much depth of it.
+        """
+        if depth_range is None:
+            near = self.query(item.x, item.y, radius)
+        else:
+            near = self.query(item.x, item.y, radius,
+                              item.depth - depth_range, item.depth + depth_range)
+        out = []
+        for other in near:
+            if other is item:
+                continue
+            if depth_range is not None and abs(other.depth - item.depth) >= depth_range:
+                continue
+            if math.hypot(other.x - item.x, other.y - item.y) <= radius:
+                out.append(other)
+        return out
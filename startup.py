@@ -0,0 +1,67 @@
+# startup.py
+#
+# Import-time benchmark. Each module is imported in a fresh interpreter
+# with `-X importtime`, several times over, and the best cumulative time is
+# reported. Headless modules must not load tkinter, so a batch job, the
+# server or a training run never pays for it; any that do make this exit
+# non-zero, so it doubles as a check.
+#
+#   python startup.py                     # every headless module, plus game for comparison
+#   python startup.py sim env --runs 10
+
+import argparse
+import os
+import subprocess
+import sys
+
+# The simulation core and the tools built on it: none of these may touch Tk.
+HEADLESS = (
+    "config", "physics", "player", "physiology", "ai", "planner", "rules",
+    "scoreboard", "sim", "checkpoint", "snapcodec", "telemetry", "export",
+    "analytics", "rollout", "env", "policy", "optimize", "server",
+)
+GUI_MODULES = ("tkinter", "_tkinter")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(module: str, runs: int = 5):
+    """(best cumulative import time in ms, GUI modules it loaded) for `module`."""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {GUI_MODULES!r} if m in sys.modules))")
+    best, gui = None, ()
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=HERE, capture_output=True, text=True, check=True)
+        # lines look like "import time:   self |  cumulative | name"
+        for line in proc.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                us = int(parts[1])
+                best = us if best is None else min(best, us)
+        gui = tuple(filter(None, proc.stdout.strip().split(",")))
+    return (best or 0) / 1000.0, gui
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure module import times; fail if headless modules load Tk.")
+    ap.add_argument("modules", nargs="*", help="modules to time (default: headless modules and game)")
+    ap.add_argument("--runs", type=int, default=5, help="fresh interpreters per module; the best is kept")
+    args = ap.parse_args(argv)
+
+    modules = args.modules or HEADLESS + ("game",)
+    leaks = []
+    for module in modules:
+        ms, gui = measure(module, args.runs)
+        note = f"   loads {', '.join(gui)}" if gui else ""
+        print(f"{module:<12} {ms:7.1f} ms{note}")
+        if gui and module in HEADLESS:
+            leaks.append(module)
+    if leaks:
+        print(f"headless modules load Tk: {', '.join(leaks)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# telemetry.py
+#
+# Per-tick, per-player telemetry streamed out of the sim. The sim thread
+# only appends rows to a bounded ring buffer; a background writer drains it
+# in batches and hands each batch, as columns, to every sink.
+
+import argparse
+import array
+import csv
+import json
+import os
+import socket
+import sys
+import threading
+
+
+# --------------------
+# Schema
+# --------------------
+# (column, type): array typecodes, or "cat" for strings stored as codes
+FIELDS = (
+    ("tick",               "q"),
+    ("time",               "d"),
+    ("uid",                "q"),
+    ("team",               "cat"),
+    ("label",              "cat"),
+    ("x",                  "d"),
+    ("y",                  "d"),
+    ("angle",              "d"),
+    ("depth",              "d"),
+    ("short_term_stamina", "d"),
+    ("long_term_stamina",  "d"),
+    ("current_dive_time",  "d"),
+    ("action",             "cat"),    # ai.ActionType name, "" for human players
+    ("formation",          "cat"),    # the team's formation this tick
+    ("has_puck",           "B"),
+    ("event",              "cat"),    # "goal" on the tick a goal goes in, the foul's
+                                      # kind on the tick one is called, else ""
+)
+COLUMNS = tuple(name for name, _ in FIELDS)
+TYPES = dict(FIELDS)
+CATEGORY_CODE = "H"                   # on-disk typecode of "cat" columns
+
+
+def player_rows(sim, event=""):
+    """One row (in COLUMNS order) per player for the sim's current tick."""
+    rows = []
+    t = sim.time
+    for uid, p in sim.players.items():
+        action = sim.actions.get(uid)
+        rows.append((
+            sim.tick, t, uid, p.color, p.label,
+            p.x, p.y, p.angle, p.depth,
+            p.short_term_stamina, p.long_term_stamina, p.current_dive_time,
+            action.type.name if action is not None and not sim.is_human(p) else "",
+            sim.green_form if p.color == "green" else sim.blue_form,
+            1 if p is sim.possessing_player else 0,
+            event,
+        ))
+    return rows
+
+
+# --------------------
+# Ring buffer
+# --------------------
+class RingBuffer:
+    """
+    Fixed-capacity FIFO of rows. Pushing never blocks the sim: when the
+    writer falls behind, the oldest rows are overwritten and counted in
+    `dropped`.
+    """
+
+    def __init__(self, capacity: int):
+        self.slots = [None] * capacity
+        self.capacity = capacity
+        self.head = 0        # oldest row
+        self.size = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def push_many(self, rows):
+        with self.lock:
+            for row in rows:
+                tail = (self.head + self.size) % self.capacity
+                self.slots[tail] = row
+                if self.size == self.capacity:
+                    self.head = (self.head + 1) % self.capacity
+                    self.dropped += 1
+                else:
+                    self.size += 1
+
+    def drain(self):
+        """Remove and return every buffered row, oldest first."""
+        with self.lock:
+            end = self.head + self.size
+            if end <= self.capacity:
+                rows = self.slots[self.head:end]
+            else:
+                rows = self.slots[self.head:] + self.slots[:end - self.capacity]
+            self.head = self.size = 0
+        return rows
+
+
+# --------------------
+# Stream
+# --------------------
+class TelemetryStream:
+    """
+    Give one of these to Simulation(telemetry=…). record() is called at the
+    end of every tick; a daemon thread wakes once `batch_rows` rows are
+    waiting (or every `flush_interval` s) and writes them to the sinks.
+    close() flushes what is left and closes the sinks.
+    """
+
+    def __init__(self, sinks, capacity=65536, batch_rows=2048, flush_interval=0.5):
+        self.sinks = list(sinks)
+        self.ring = RingBuffer(capacity)
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.batches = 0
+        self._last_score = None
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self):
+        return self.ring.dropped
+
+    def record(self, sim):
+        goals = sim.scoreboard.total
+        event = "goal" if self._last_score is not None and goals != self._last_score else ""
+        call = sim.last_call
+        if not event and call is not None and call.tick == sim.tick:
+            event = call.kind
+        self._last_score = goals
+        self.ring.push_many(player_rows(sim, event))
+        if len(self.ring) >= self.batch_rows:
+            self._wake.set()
+
+    def _flush(self):
+        rows = self.ring.drain()
+        if not rows:
+            return
+        columns = dict(zip(COLUMNS, (list(col) for col in zip(*rows))))
+        for sink in self.sinks:
+            sink.write_batch(columns)
+        self.batches += 1
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+        self._flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+# --------------------
+# Sinks
+# --------------------
+# A sink has write_batch(columns) and close(); `columns` maps every name in
+# COLUMNS to a list of equal length. Sinks run on the writer thread only.
+
+class CsvSink:
+    """One CSV row per player per tick, with a header line."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write_batch(self, columns):
+        self.writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+
+    def close(self):
+        self.file.close()
+
+
+class ColumnarSink:
+    """
+    Parquet-like columnar layout in a directory, one per match:
+
+      <column>.col   raw native-endian array of that column, appended per batch
+      schema.json    column types, category dictionaries, row count and the
+                     row count of every chunk (batch)
+
+    "cat" columns are stored as uint16 codes into their dictionary. The
+    schema is rewritten after each chunk, so a reader only ever sees rows
+    whose data is already on disk. Read back with analytics.MatchTable.
+    """
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.categories = {name: [] for name, kind in FIELDS if kind == "cat"}
+        self._codes = {name: {} for name in self.categories}
+        self.chunks = []
+        self.files = {name: open(os.path.join(directory, f"{name}.col"), "wb")
+                      for name in COLUMNS}
+        self._write_schema()
+
+    def _encode(self, name, values):
+        codes, dictionary = self._codes[name], self.categories[name]
+        out = array.array(CATEGORY_CODE)
+        for v in values:
+            code = codes.get(v)
+            if code is None:
+                code = codes[v] = len(dictionary)
+                dictionary.append(v)
+            out.append(code)
+        return out
+
+    def write_batch(self, columns):
+        for name, kind in FIELDS:
+            if kind == "cat":
+                data = self._encode(name, columns[name])
+            else:
+                data = array.array(kind, columns[name])
+            data.tofile(self.files[name])
+            self.files[name].flush()
+        self.chunks.append(len(columns["tick"]))
+        self._write_schema()
+
+    def _write_schema(self):
+        schema = {
+            "byteorder":  sys.byteorder,
+            "columns":    [{"name": n, "type": CATEGORY_CODE if k == "cat" else k,
+                            "category": k == "cat"} for n, k in FIELDS],
+            "categories": self.categories,
+            "rows":       sum(self.chunks),
+            "chunks":     self.chunks,
+        }
+        path = os.path.join(self.directory, "schema.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(schema, f)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class SocketSink:
+    """
+    Sends each batch as one JSON line ({"columns": {...}}) over a local UNIX
+    stream socket. If nobody is listening the batch is skipped (counted in
+    `skipped`) and the connection is retried on the next one.
+    """
+
+    def __init__(self, path: str, timeout: float = 1.0):
+        self.path = path
+        self.timeout = timeout
+        self.sock = None
+        self.skipped = 0
+
+    def _connect(self):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(self.timeout)
+        s.connect(self.path)
+        return s
+
+    def write_batch(self, columns):
+        line = (json.dumps({"columns": columns}, separators=(",", ":")) + "\n").encode()
+        try:
+            if self.sock is None:
+                self.sock = self._connect()
+            self.sock.sendall(line)
+        except OSError:
+            self.skipped += 1
+            self.close()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+# --------------------
+# Command line
+# --------------------
+def main(argv=None):
+    from config import GREEN_FORMATIONS_FILE, BLUE_FORMATIONS_FILE, load_formations
+    from sim import Simulation
+
+    ap = argparse.ArgumentParser(description="Record telemetry of a headless match.")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--green", default=GREEN_FORMATIONS_FILE, help="green formations JSON")
+    ap.add_argument("--blue",  default=BLUE_FORMATIONS_FILE,  help="blue formations JSON")
+    ap.add_argument("--csv", metavar="PATH")
+    ap.add_argument("--columnar", metavar="DIR")
+    ap.add_argument("--socket", metavar="PATH", help="UNIX socket to stream batches to")
+    args = ap.parse_args(argv)
+
+    sinks = []
+    if args.csv:
+        sinks.append(CsvSink(args.csv))
+    if args.columnar:
+        sinks.append(ColumnarSink(args.columnar))
+    if args.socket:
+        sinks.append(SocketSink(args.socket))
+    if not sinks:
+        ap.error("give at least one of --csv, --columnar, --socket")
+
+    stream = TelemetryStream(sinks)
+    sim = Simulation(green_formations=load_formations(args.green),
+                     blue_formations=load_formations(args.blue),
+                     seed=args.seed, telemetry=stream)
+    try:
+        sim.run_until(args.seconds)
+    finally:
+        sim.planner.close()
+        stream.close()
+    print(f"{sim.tick} ticks, {stream.batches} batches, {stream.dropped} rows dropped",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
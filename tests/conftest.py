@@ -0,0 +1,46 @@
+# tests/conftest.py
+#
+# The modules live at the top of the repo, not in a package; put it on the
+# path so the tests import them the way the entry points do.
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# --------------------
+# Formations
+# --------------------
+# Small inline formation sets, so the tests don't depend on the data files.
+LABELS = ("FB", "LB", "RB", "LF", "C", "RF")
+
+GREEN = {
+    "center_court": {"FB": [0, 6], "LB": [-3, 4], "RB": [3, 4], "LF": [-3, -1], "C": [0, 1], "RF": [3, -1]},
+    "left_wall":    {"FB": [2, 6], "LB": [1, 4],  "RB": [5, 4], "LF": [1, -1],  "C": [3, 1], "RF": [6, -1]},
+    "right_wall":   {"FB": [-2, 6], "LB": [-5, 4], "RB": [-1, 4], "LF": [-6, -1], "C": [-3, 1], "RF": [-1, -1]},
+}
+for _label in LABELS:
+    GREEN[f"{_label}teammate_possession"] = {
+        "FB": [0, 5], "LB": [-3, 3], "RB": [3, 3], "LF": [-3, -2], "C": [0, -1], "RF": [3, -2],
+    }
+BLUE = {name: {label: [-x, -y] for label, (x, y) in roles.items()}
+        for name, roles in GREEN.items() if name in ("center_court", "left_wall", "right_wall")}
+
+
+@pytest.fixture
+def formations():
+    return GREEN, BLUE
+
+
+@pytest.fixture
+def make_sim():
+    """Build a seeded headless Simulation, with the global `random` seeded too."""
+    from sim import Simulation
+
+    def make(seed=0, **kwargs):
+        random.seed(seed)                  # physiology draws from `random`
+        return Simulation(green_formations=GREEN, blue_formations=BLUE, seed=seed, **kwargs)
+    return make
@@ -0,0 +1,255 @@
+# tests/reference.py
+#
+# The hot kernels exactly as they stood in the baseline commit (b42246c),
+# before any of them were reworked: get_triangle_vertices from player.py,
+# polygons_collide and compute_target_for_player from physics.py, and
+# update_player_breath_hold from physiology.py with its own constants.
+# test_kernels.py fuzzes the live versions against these. Nothing here
+# imports the live modules; don't edit these to match a newer version.
+
+import math
+import random
+
+from config import SCALE
+
+PLAYER_RADIUS = (1.82 * SCALE) / 1.5
+
+
+# --------------------
+# player.py
+# --------------------
+def get_triangle_vertices(player, center_x=None, center_y=None, angle=None):
+    """
+    Return the three (x,y) vertices of a player's triangle, matching `draw()`.
+
+    If center_x/center_y/angle are omitted, uses the player's current state.
+    """
+    if center_x is None:
+        center_x = player.x
+    if center_y is None:
+        center_y = player.y
+    if angle is None:
+        angle = player.angle
+
+    R = PLAYER_RADIUS
+    fx = math.sin(angle)
+    fy = -math.cos(angle)
+    rx = math.cos(angle)
+    ry = math.sin(angle)
+
+    tip = (
+        center_x + R * fx,
+        center_y + R * fy
+    )
+    bl = (
+        center_x - (R / 2) * fx + (R / 2) * rx,
+        center_y - (R / 2) * fy + (R / 2) * ry
+    )
+    br = (
+        center_x - (R / 2) * fx - (R / 2) * rx,
+        center_y - (R / 2) * fy - (R / 2) * ry
+    )
+
+    return [tip, bl, br]
+
+
+# --------------------
+# physics.py
+# --------------------
+def project_polygon(polygon, axis):
+    """Projects all vertices onto the given normalized axis."""
+    projections = [v[0]*axis[0] + v[1]*axis[1] for v in polygon]
+    return min(projections), max(projections)
+
+
+def polygons_collide(poly1, poly2, epsilon=1.5):
+    """
+    SAT collision check with margin (epsilon). Returns True if polygons collide.
+    Allows slight overlap to avoid jitter/sticking.
+    """
+    for polygon in (poly1, poly2):
+        n = len(polygon)
+        for i in range(n):
+            p1 = polygon[i]
+            p2 = polygon[(i + 1) % n]
+            edge = (p2[0] - p1[0], p2[1] - p1[1])
+            axis = (-edge[1], edge[0])
+            length = math.hypot(*axis)
+            if length == 0:
+                continue
+            axis = (axis[0] / length, axis[1] / length)
+            min1, max1 = project_polygon(poly1, axis)
+            min2, max2 = project_polygon(poly2, axis)
+
+            # Allow slight overlap using epsilon margin
+            if max1 < min2 - epsilon or max2 < min1 - epsilon:
+                return False
+    return True
+
+
+def compute_target_for_player(
+    player,
+    formation_name,
+    formation,
+    ref_x, ref_y,
+    pool_left, pool_right,
+    pool_top, pool_bottom,
+    SCALE
+):
+    def get_offside_back_position(player, ref_x, ref_y, defending_side):
+        goal_center_x = (pool_left + pool_right) / 2
+        goal_center_y = pool_bottom if defending_side == "bottom" else pool_top
+        vec_x, vec_y = goal_center_x - ref_x, goal_center_y - ref_y
+        norm = math.hypot(vec_x, vec_y)
+        if norm == 0:
+            return ref_x, ref_y
+        # push 3*radius behind the offside line
+        return (
+            ref_x + (5 * PLAYER_RADIUS / norm) * vec_x,
+            ref_y + (5 * PLAYER_RADIUS / norm) * vec_y
+        )
+
+    # --- 1) Offside‐backs (only the single back on the wrong side) ---
+    if "leftwall" in formation_name:
+        # on left wall we only offside the back furthest from the wall
+        if player.color == "green" and player.label == "RB":
+            return get_offside_back_position(player, ref_x, ref_y, "bottom")
+        if player.color == "blue" and player.label == "LB":
+            return get_offside_back_position(player, ref_x, ref_y, "top")
+
+    elif "rightwall" in formation_name:
+        # on right wall we only offside the back furthest from the wall
+        if player.color == "green" and player.label == "LB":
+            return get_offside_back_position(player, ref_x, ref_y, "bottom")
+        if player.color == "blue" and player.label == "RB":
+            return get_offside_back_position(player, ref_x, ref_y, "top")
+
+    # --- 2) Everyone else (forwards, center, the other back) just follow JSON offsets ---
+    # Ensure the label exists in this formation
+    if player.label not in formation:
+        # no entry → hold current spot
+        return player.x, player.y
+
+    offset_x_m, offset_y_m = formation[player.label]
+    tx = ref_x + offset_x_m * SCALE
+    ty = ref_y + offset_y_m * SCALE
+
+    # --- 3) Clamp inside pool bounds (so no one ever swims out) ---
+    tx = max(pool_left + PLAYER_RADIUS, min(pool_right - PLAYER_RADIUS, tx))
+    ty = max(pool_top + PLAYER_RADIUS, min(pool_bottom - PLAYER_RADIUS, ty))
+
+    return tx, ty
+
+
+# --------------------
+# physiology.py
+# --------------------
+MAX_DEPTH = 2.0  # meters
+DEPTH_STEP = 0.1  # m per frame
+BASE_MAX_BREATH = 20.0  # seconds at long_term_stamina=1
+SHORT_TERM_REGEN_RATE = 0.2  # sec recovered per sec on surface
+LONG_TERM_PENALTY_RATE = 0.02  # fraction lost per full dive
+EXTRA_DIVE_PENALTY_FACTOR = 1.5
+MIN_SHORT_TERM = 5.0
+MIN_LONG_TERM = 0.5
+SURFACE_LOCK_DURATION = 3.0  # seconds
+
+
+def update_player_breath_hold(player,
+                              dt: float,
+                              is_controlled: bool,
+                              want_to_dive: bool,
+                              canvas=None,
+                              puck=None,
+                              keys_pressed=None,
+                              controlled_player=None):
+    """
+    - dt: seconds since last frame
+    - is_controlled: True if user is controlling this player
+    - want_to_dive: for controlled only, True if 's' held
+    - canvas, puck, keys_pressed, controlled_player only needed for AI logic
+    """
+
+    # 1) Bench players (if you ever tag one with player.role="bench")
+    if getattr(player, "role", "field") == "bench":
+        return
+
+    # 2) Surface‐lock countdown: force surfaced while >0
+    if player.surface_lock_timer > 0:
+        player.surface_lock_timer = max(0.0, player.surface_lock_timer - dt)
+        player.submerging = False
+    else:
+        # 3) Decide submerging
+        if is_controlled:
+            # user: dive only while holding 's' and have breath
+            player.submerging = want_to_dive and player.short_term_stamina > 0
+        else:
+            # AI: dive if near puck (and have breath)
+            # must pass in canvas, puck, etc. into this call
+            if canvas is None or puck is None:
+                raise RuntimeError("AI breath logic needs canvas & puck")
+            x1, y1, x2, y2 = canvas.coords(puck)
+            puck_x, puck_y = (x1+x2)/2, (y1+y2)/2
+            dist = math.hypot(player.x - puck_x, player.y - puck_y)
+            player.submerging = dist < 150 and player.short_term_stamina > 0
+
+            # if starting a new dive, give them a random threshold
+            if player.submerging and (player.dive_threshold is None or player.current_dive_time == 0):
+                player.dive_threshold = random.uniform(6, 14)
+
+    # 4) If submerging → descend & deplete breath
+    if player.submerging:
+        player.current_dive_time += dt
+        player.depth = min(MAX_DEPTH, player.depth + DEPTH_STEP)
+        player.short_term_stamina = max(0.0, player.short_term_stamina - dt)
+
+        # decide threshold: user uses their effective_max, AI uses own threshold
+        if is_controlled:
+            threshold = min(player.short_term_stamina,
+                            BASE_MAX_BREATH * player.long_term_stamina)
+        else:
+            threshold = player.dive_threshold
+
+        if player.current_dive_time >= threshold:
+            # force them to surface
+            player.submerging = False
+            player.surface_lock_timer = SURFACE_LOCK_DURATION
+            if not is_controlled:
+                # re-roll for next AI dive
+                player.dive_threshold = random.uniform(6, 14)
+
+    else:
+        # 5) Surfacing behaviour
+        # float upward
+        player.depth = max(0.0, player.depth - DEPTH_STEP)
+
+        # if just surfaced fully after a dive
+        if player.depth == 0.0 and player.current_dive_time > 0:
+            # extra‐dive penalty
+            if player.current_dive_time > 10:
+                penalty = (player.current_dive_time - 10) * EXTRA_DIVE_PENALTY_FACTOR
+            else:
+                penalty = (player.current_dive_time / 10) * EXTRA_DIVE_PENALTY_FACTOR
+
+            player.short_term_stamina = max(
+                MIN_SHORT_TERM,
+                player.short_term_stamina - penalty
+            )
+            player.long_term_stamina = max(
+                MIN_LONG_TERM,
+                player.long_term_stamina
+                - LONG_TERM_PENALTY_RATE * (player.current_dive_time / BASE_MAX_BREATH)
+            )
+            player.current_dive_time = 0.0
+
+        # regen short‐term up to new potential max
+        potential_max = BASE_MAX_BREATH * player.long_term_stamina
+        player.short_term_stamina = min(
+            potential_max,
+            player.short_term_stamina + SHORT_TERM_REGEN_RATE * dt
+        )
+
+    # 6) (Optional) update their color/shading if you want here,
+    #     or call player.update_color() back in game.update()
+    if hasattr(player, "update_color"):
+        player.update_color(player.color)
@@ -0,0 +1,58 @@
+# tests/test_analytics.py
+
+import analytics
+from config import POOL_LEFT_PX, POOL_TOP_PX, SCALE
+from telemetry import COLUMNS, ColumnarSink, TelemetryStream
+
+
+def _row(tick, uid, team, dive, has=0, event="", formation="center_court",
+         x=POOL_LEFT_PX + 1, y=POOL_TOP_PX + 1, st=30.0, lt=1.0):
+    values = dict(tick=tick, time=tick * 0.05, uid=uid, team=team, label="FB",
+                  x=x, y=y, angle=0.0, depth=0.0, short_term_stamina=st,
+                  long_term_stamina=lt, current_dive_time=dive, action="",
+                  formation=formation, has_puck=has, event=event)
+    return tuple(values[name] for name in COLUMNS)
+
+
+def _record(directory, batches):
+    sink = ColumnarSink(str(directory))
+    for rows in batches:
+        sink.write_batch(dict(zip(COLUMNS, (list(c) for c in zip(*rows)))))
+    sink.close()
+
+
+def test_aggregates(tmp_path):
+    _record(tmp_path, [
+        [_row(1, 1, "green", 0.5, has=1), _row(1, 2, "blue", 0.0)],
+        [_row(2, 1, "green", 1.0, has=1, event="goal", st=10.0),
+         _row(2, 2, "blue", 0.0, event="goal", st=20.0, x=POOL_LEFT_PX + 2.5 * SCALE)],
+        [_row(3, 1, "green", 0.0, formation="left_wall"), _row(3, 2, "blue", 0.0)],
+    ])
+    with analytics.MatchTable(str(tmp_path)) as t:
+        assert t.rows == 6 and list(t.column("tick")) == [1, 1, 2, 2, 3, 3]
+        assert analytics.possession_share([t]) == {
+            "green": {"center_court": 1.0, "left_wall": 0.0},
+            "blue":  {"center_court": 0.0},
+        }
+        assert analytics.dive_lengths([t]) == {"green": [1.0]}
+        assert analytics.stamina_at_goals([t]) == {"green": (10.0, 1.0, 1), "blue": (20.0, 1.0, 1)}
+        grid = analytics.heatmap([t], team="blue").grid()
+        assert grid[0][2] == 1 and grid[0][0] == 2
+        assert sum(map(sum, analytics.heatmap([t]).grid())) == 6
+        assert sum(map(sum, analytics.heatmap([t], label="C").grid())) == 0
+
+
+def test_reads_what_a_match_recorded(make_sim, tmp_path):
+    stream = TelemetryStream([ColumnarSink(str(tmp_path / "m1"))], flush_interval=0.01)
+    sim = make_sim(telemetry=stream)
+    sim.run_until(3.0)
+    stream.close()
+    (tmp_path / "notes").mkdir()
+    paths = list(analytics.match_dirs(str(tmp_path)))
+    assert paths == [str(tmp_path / "m1")]
+    for t in analytics.iter_matches(paths):
+        assert t.rows == sim.tick * len(sim.players)
+        assert list(t.column("x"))[-len(sim.players):] == [p.x for p in sim.players.values()]
+        share = analytics.possession_share([t])
+        assert set(share) == {"green", "blue"}
+        assert all(0.0 <= v <= 1.0 for forms in share.values() for v in forms.values())
@@ -0,0 +1,64 @@
+# tests/test_avoidance.py
+
+import math
+from types import SimpleNamespace
+
+from avoidance import AGENT_RADIUS, NEIGHBOUR_DIST, solve_velocities
+from config import COLLISION_DEPTH_THRESHOLD
+from spatial import SpatialHash
+
+
+def _agent(uid, x, y, depth=1.0):
+    return SimpleNamespace(unique_id=uid, x=x, y=y, depth=depth, vx=0.0, vy=0.0)
+
+
+def _solve(players, preferred, max_speed=3.0):
+    index = SpatialHash(NEIGHBOUR_DIST)
+    index.rebuild(players.values())
+    return solve_velocities(players, preferred, index, max_speed)
+
+
+def _fly(players, preferred, frames=60):
+    """Closest approach of any two agents over `frames` frames."""
+    closest = math.inf
+    for _ in range(frames):
+        for uid, (vx, vy) in _solve(players, preferred).items():
+            p = players[uid]
+            p.vx, p.vy = vx, vy
+            p.x, p.y = p.x + vx, p.y + vy
+        ps = list(players.values())
+        for i, a in enumerate(ps):
+            for b in ps[i + 1:]:
+                closest = min(closest, math.hypot(a.x - b.x, a.y - b.y))
+    return closest
+
+
+def test_lone_agent_keeps_its_preferred_velocity():
+    players = {1: _agent(1, 100, 100)}
+    assert _solve(players, {1: (2.0, 1.0)}) == {1: (2.0, 1.0)}
+
+
+def test_speed_is_capped():
+    players = {1: _agent(1, 100, 100)}
+    vx, vy = _solve(players, {1: (30.0, 40.0)}, max_speed=5.0)[1]
+    assert math.hypot(vx, vy) <= 5.0 + 1e-9
+
+
+def test_head_on_agents_pass_each_other():
+    players = {1: _agent(1, 100, 100), 2: _agent(2, 160, 100.5)}
+    closest = _fly(players, {1: (1.5, 0.0), 2: (-1.5, 0.0)}, frames=150)
+    assert closest >= 2 * AGENT_RADIUS - 0.5
+    assert players[1].x > 160 and players[2].x < 100          # both got by
+
+
+def test_agent_avoids_a_standing_obstacle():
+    players = {1: _agent(1, 100, 100), 2: _agent(2, 150, 100)}
+    preferred = {1: (1.5, 0.0)}
+    assert _fly(players, preferred) >= 2 * AGENT_RADIUS - 0.5
+    assert (players[2].x, players[2].y) == (150, 100)          # not steered: never moves
+
+
+def test_agents_at_other_depths_are_ignored():
+    players = {1: _agent(1, 100, 100),
+               2: _agent(2, 110, 100, depth=1.0 + COLLISION_DEPTH_THRESHOLD * 2)}
+    assert _solve(players, {1: (1.5, 0.0)}) == {1: (1.5, 0.0)}
@@ -0,0 +1,70 @@
+# tests/test_checkpoint.py
+
+import pickle
+import random
+
+import pytest
+
+import checkpoint
+
+
+def _play(sim, ticks):
+    """Run on for `ticks` from a fixed global seed; where everyone ends up."""
+    random.seed(0)
+    for _ in range(ticks):
+        sim.advance(sim.dt)
+    return sim.tick, sim.puck_x, sim.puck_y, [(p.x, p.y, p.depth) for p in sim.players.values()]
+
+
+def _fail(sim, variant):
+    raise ValueError(variant)
+
+
+def test_save_and_load(make_sim, tmp_path):
+    sim = make_sim(5)
+    sim.run_until(4.0)
+    path = str(tmp_path / "match.ckpt")
+    checkpoint.save(sim, path)
+    restored = checkpoint.restore(checkpoint.load(path), global_rng=False)
+    assert _play(restored, 40) == _play(sim, 40)
+
+    state = checkpoint.load(path)
+    state["version"] = checkpoint.VERSION - 1
+    with open(path, "wb") as f:
+        pickle.dump(state, f)
+    with pytest.raises(ValueError):
+        checkpoint.load(path)
+
+
+def test_stoppages_survive_a_restore(make_sim):
+    sim = make_sim(5)
+    sim.run_until(2.0)
+    sim.puck_x = (sim.goal_x1 + sim.goal_x2) / 2
+    sim.puck_y = (sim.goal_top_y1 + sim.goal_top_y2) / 2
+    sim._check_goal()
+    copy = checkpoint.clone(sim)
+    assert copy._goal_event in copy.scheduler.pending()
+    assert copy._goal_event.time == sim._goal_event.time
+    copy._end_half()
+    assert copy._goal_event is None
+    assert all(e.callback != copy._reset_after_goal for e in copy.scheduler.pending())
+
+
+def test_clone_leaves_the_original_alone(make_sim):
+    sim = make_sim(5)
+    sim.run_until(2.0)
+    tick, x = sim.tick, sim.players[2].x
+    copy = checkpoint.clone(sim)
+    copy.run_until(4.0)
+    assert (sim.tick, sim.players[2].x) == (tick, x)
+    assert copy.players[2] is not sim.players[2]
+
+
+def test_fork_map_matches_running_in_process(make_sim):
+    sim = make_sim(5)
+    sim.run_until(2.0)
+    forked = checkpoint.fork_map(sim, _play, [10, 20, 30], workers=2)
+    assert forked == [_play(checkpoint.clone(sim), v) for v in [10, 20, 30]]
+    assert [f[0] for f in forked] == [sim.tick + 10, sim.tick + 20, sim.tick + 30]
+    with pytest.raises(RuntimeError, match="ValueError"):
+        checkpoint.fork_map(sim, _fail, ["boom"])
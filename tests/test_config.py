@@ -0,0 +1,24 @@
+# tests/test_config.py
+
+import pickle
+
+import pytest
+
+from config import DEFAULT_CONFIG, SimConfig, parse_settings
+
+
+def test_replace_and_pickle():
+    cfg = DEFAULT_CONFIG.replace(max_depth=2.5, ai_dive_range=200.0)
+    assert cfg.floor_band_min == 2.5 - (DEFAULT_CONFIG.max_depth - DEFAULT_CONFIG.floor_band_min)
+    assert pickle.loads(pickle.dumps(cfg)) == cfg != DEFAULT_CONFIG
+    with pytest.raises(AttributeError):
+        cfg.max_depth = 3.0
+
+
+def test_settings_nothing_reads_are_refused():
+    with pytest.raises(TypeError):
+        SimConfig(max_dpeth=2.5)
+    with pytest.raises(ValueError):
+        DEFAULT_CONFIG.replace(scale=50)
+    assert parse_settings(["ai_dive_range=200", "dive_threshold_range=[4, 8]"]) == \
+        {"ai_dive_range": 200, "dive_threshold_range": [4, 8]}
@@ -0,0 +1,65 @@
+# tests/test_contact.py
+
+import random
+from types import SimpleNamespace
+
+import contact
+from config import DEFAULT_CONFIG
+from spatial import SpatialHash
+
+FLOOR = DEFAULT_CONFIG.max_depth
+
+
+def _player(uid, color, x, y, depth=FLOOR, breath=None):
+    return SimpleNamespace(unique_id=uid, color=color, x=x, y=y, depth=depth,
+                           short_term_stamina=DEFAULT_CONFIG.base_max_breath
+                           if breath is None else breath)
+
+
+def _index(*players):
+    index = SpatialHash(contact.PICKUP_RADIUS * 2, depth_cell=contact.BODY_THICKNESS_M)
+    index.rebuild(players)
+    return index
+
+
+def test_on_bottom():
+    assert contact.on_bottom(_player(1, "green", 0, 0))
+    assert contact.on_bottom(_player(1, "green", 0, 0, depth=DEFAULT_CONFIG.floor_band_min))
+    assert not contact.on_bottom(_player(1, "green", 0, 0, depth=0.0))
+
+
+def test_loose_puck_goes_to_the_only_player_in_reach():
+    near = _player(1, "green", 100, 100)
+    far = _player(2, "blue", 100 + contact.PICKUP_RADIUS * 3, 100)
+    surfaced = _player(3, "blue", 100, 100, depth=0.0)
+    index = _index(near, far, surfaced)
+    assert contact.resolve_loose_puck(index, 100, 100, random.Random(0)) is near
+    assert contact.resolve_loose_puck(_index(far, surfaced), 100, 100, random.Random(0)) is None
+
+
+def test_contested_pickup_is_seeded_and_weighted():
+    fresh = _player(1, "green", 100, 100)
+    tired = _player(2, "blue", 100, 100, breath=0.0)
+    wins = [contact.resolve_loose_puck(_index(fresh, tired), 100, 100, random.Random(s))
+            for s in range(200)]
+    assert wins == [contact.resolve_loose_puck(_index(tired, fresh), 100, 100, random.Random(s))
+                    for s in range(200)]                     # insertion order doesn't matter
+    assert wins.count(fresh) > 150                           # 10:1 on breath
+
+
+def test_tackle_needs_an_opponent_in_reach():
+    carrier = _player(1, "green", 100, 100)
+    mate = _player(2, "green", 100, 100)
+    assert contact.resolve_tackle(_index(carrier, mate), carrier, 100, 100, random.Random(0)) is None
+    surfaced = _player(3, "blue", 100, 100, depth=0.0)
+    assert contact.resolve_tackle(_index(carrier, surfaced), carrier, 100, 100, random.Random(0)) is None
+
+
+def test_tackles_sometimes_win_the_puck():
+    carrier = _player(1, "green", 100, 100)
+    opp = _player(7, "blue", 100, 100)
+    index = _index(carrier, opp)
+    results = [contact.resolve_tackle(index, carrier, 100, 100, random.Random(s)) for s in range(200)]
+    won = sum(r is opp for r in results)
+    assert results.count(None) + won == len(results)
+    assert 0 < won < len(results) / 2                        # the carrier has the edge
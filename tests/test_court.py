@@ -0,0 +1,71 @@
+# tests/test_court.py
+
+import struct
+import zlib
+
+import court
+from config import CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX, POOL_LEFT_PX, POOL_TOP_PX
+from raster import Framebuffer, rgb
+
+
+def _pixel(fb, x, y):
+    i = (y * fb.width + x) * 3
+    return tuple(fb.pixels[i:i + 3])
+
+
+def _decode_png(data):
+    """(width, height, pixels) of an unfiltered 8-bit RGB PNG."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, = struct.unpack(">I", data[pos:pos + 4])
+        kind, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(kind + body) & 0xFFFFFFFF
+        chunks[kind] = body
+        pos += 12 + length
+    w, h = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    stride = w * 3 + 1
+    assert all(raw[y * stride] == 0 for y in range(h))
+    return w, h, b"".join(raw[y * stride + 1:(y + 1) * stride] for y in range(h))
+
+
+def test_primitives_clip_to_the_frame():
+    fb = Framebuffer(10, 8)
+    fb.fill_rect(-5, -5, 3, 2, "red")
+    fb.fill_circle(9, 7, 4, "blue")
+    assert _pixel(fb, 0, 0) == _pixel(fb, 2, 1) == rgb("red")
+    assert _pixel(fb, 3, 1) == _pixel(fb, 2, 2) == rgb("white")     # [x0, x1) × [y0, y1)
+    assert _pixel(fb, 9, 7) == rgb("blue")
+    assert len(fb.pixels) == 10 * 8 * 3
+
+
+def test_blit_and_png_round_trip():
+    src = Framebuffer(4, 3, bg="orange")
+    fb = Framebuffer(10, 8)
+    fb.blit(src, 8, -1)                      # hangs off two edges
+    assert _pixel(fb, 8, 0) == _pixel(fb, 9, 1) == rgb("orange")
+    assert _pixel(fb, 7, 0) == _pixel(fb, 8, 2) == rgb("white")
+    assert _decode_png(fb.to_png()) == (10, 8, bytes(fb.pixels))
+    assert fb.to_ppm() == b"P6\n10 8\n255\n" + bytes(fb.pixels)
+
+
+def test_court_is_drawn_into_the_pool():
+    fb = court.render_court()
+    assert (fb.width, fb.height) == (CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX)
+    assert _pixel(fb, POOL_LEFT_PX + 20, POOL_TOP_PX + 60) == rgb("lightblue")
+    assert _pixel(fb, 0, 0) == rgb("white")
+
+
+def test_court_image_is_cached(tmp_path, monkeypatch):
+    path = court.court_image_path(str(tmp_path))
+    assert court.court_key() in path
+    with open(path, "rb") as f:
+        assert _decode_png(f.read())[2] == bytes(court.render_court().pixels)
+
+    def fail():
+        raise AssertionError("court rendered again")
+    monkeypatch.setattr(court, "render_court", fail)
+    assert court.court_image_path(str(tmp_path)) == path
+    assert [p.name for p in tmp_path.iterdir()] == [path.rsplit("/", 1)[-1]]
@@ -0,0 +1,81 @@
+# tests/test_env.py
+
+import pytest
+
+from env import GLOBAL_OBS, N_PLAYERS, OBS_SIZE, PLAYER_OBS, HockeyEnv, VecEnv
+
+P = len(PLAYER_OBS)
+HALF = N_PLAYERS // 2 * P
+
+
+def _env(formations, **kwargs):
+    green, blue = formations
+    return HockeyEnv(green_formations=green, blue_formations=blue, **kwargs)
+
+
+def test_reset_puts_the_agent_on_its_team(formations):
+    env = _env(formations, team="blue")
+    obs, _ = env.reset(seed=1)
+    assert len(obs) == OBS_SIZE
+    assert env.sim.controlled["green"] is None and env.sim.controlled["blue"] is not None
+    me = [obs[i * P + PLAYER_OBS.index("me")] for i in range(N_PLAYERS)]
+    own = [obs[i * P + PLAYER_OBS.index("own")] for i in range(N_PLAYERS)]
+    assert sum(me) == 1.0 and me.index(1.0) < N_PLAYERS // 2    # own team comes first
+    assert own == [1.0] * 6 + [0.0] * 6
+    env.close()
+
+
+def test_both_teams_see_the_same_game(formations):
+    green, blue = _env(formations, team="green"), _env(formations, team="blue")
+    g, _ = green.reset(seed=2)
+    b, _ = blue.reset(seed=2)
+    for i in range(N_PLAYERS // 2):
+        for k in (0, 1):                                          # x, y
+            assert b[HALF + i * P + k] == pytest.approx(1.0 - g[i * P + k], abs=1e-6)
+        assert b[HALF + i * P + 4] == pytest.approx(g[i * P + 4])      # depth is not mirrored
+    puck = OBS_SIZE - len(GLOBAL_OBS)
+    assert b[puck] == pytest.approx(1.0 - g[puck], abs=1e-6)
+    green.close()
+    blue.close()
+
+
+def test_episodes_are_seeded_and_truncated(formations):
+    runs = []
+    for _ in range(2):
+        env = _env(formations, seconds=1.0, frame_skip=2)
+        env.reset(seed=3)
+        steps = []
+        done = False
+        while not done:
+            obs, reward, term, trunc, _ = env.step(3)
+            steps.append(list(obs))
+            done = term or trunc
+        assert trunc and reward == 0.0 and obs[-1] == pytest.approx(1.0)
+        runs.append(steps)
+        env.close()
+    assert runs[0] == runs[1] and len(runs[0]) == 10
+
+
+def test_heading_actions_turn_the_agent(formations):
+    env = _env(formations, team="blue", action_mode="heading")
+    env.reset(seed=4)
+    env.step((0.0, 0.0))
+    me = env.sim.controlled["blue"]
+    assert me.angle % 6.283185307179586 == pytest.approx(3.141592653589793, abs=0.2)
+    with pytest.raises(ValueError):
+        _env(formations, action_mode="joystick")
+    env.close()
+
+
+def test_vec_env_shares_one_block(formations):
+    green, blue = formations
+    vec = VecEnv(3, seed=10, green_formations=green, blue_formations=blue, seconds=0.5)
+    obs = vec.reset()
+    assert len(obs) == 3 * OBS_SIZE
+    assert list(obs[OBS_SIZE:2 * OBS_SIZE]) == list(vec.envs[1].obs)
+    for _ in range(10):
+        out = vec.step([1, 2, 3])
+        assert out[0] is obs
+    assert list(vec.truncated) == [1, 1, 1] and vec.episodes == 6
+    assert obs[OBS_SIZE - 1] == 0.0                       # already the next episode
+    vec.close()
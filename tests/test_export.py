@@ -0,0 +1,49 @@
+# tests/test_export.py
+
+import io
+from itertools import islice
+
+import export
+from config import CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX
+from renderers import SoftwareRenderer
+
+
+def test_recording_round_trip(tmp_path, formations):
+    path = str(tmp_path / "match.jsonl")
+    frames = list(export.tee_recording(export.run_match(1.0, 3, *formations), path))
+    assert len(frames) == export.FPS
+    assert list(export.read_recording(path)) == frames
+    assert [f["t"] for f in frames] == sorted(f["t"] for f in frames)
+
+
+def test_a_headless_match_is_seeded(formations):
+    one = list(export.run_match(0.5, 3, *formations))
+    two = list(export.run_match(0.5, 3, *formations))
+    assert one == two
+    assert one[-1]["humans"] == []
+
+
+def test_frame_view_draws_like_the_sim(make_sim):
+    sim = make_sim()
+    sim.run_until(2.0)
+    live = bytes(SoftwareRenderer().draw_frame(sim).pixels)
+    view = export.FrameView(export.snapshot_frame(sim))
+    assert set(view.players) == set(sim.players)
+    replayed = bytes(SoftwareRenderer().draw_frame(view).pixels)
+    differ = sum(a != b for a, b in zip(live, replayed))
+    assert differ < len(live) // 1000          # only rounding of recorded positions
+
+
+def test_export_frames(tmp_path, formations):
+    frames = list(islice(export.run_match(1.0, 3, *formations), 5))
+    assert export.export_frames(frames, str(tmp_path), "ppm", workers=2, chunk=2) == 5
+    assert sorted(p.name for p in tmp_path.iterdir()) == \
+        [f"frame_{i:06d}.ppm" for i in range(5)]
+
+    raw = io.BytesIO()
+    assert export.export_frames(frames, raw, "raw", workers=1, chunk=3, status=False) == 5
+    size = CANVAS_WIDTH_PX * CANVAS_HEIGHT_PX * 3
+    assert len(raw.getvalue()) == 5 * size
+    with open(tmp_path / "frame_000004.ppm", "rb") as f:
+        ppm = f.read()
+    assert len(ppm) > size                      # the status strip makes it wider
@@ -0,0 +1,96 @@
+# tests/test_features.py
+
+import math
+
+from ai import ActionType, decide_dive, plan_actions
+from config import DEFAULT_CONFIG
+from features import compute_features
+from planner import take_snapshot
+
+
+def _snapshot(sim):
+    return take_snapshot(sim, sim.tick, sim.puck_x, sim.puck_y)
+
+
+def test_columns_match_the_snapshot(make_sim):
+    sim = make_sim()
+    sim.run_until(5.0)
+    snap = _snapshot(sim)
+    table = compute_features(snap)
+    for p in snap.players:
+        assert table.get(p, "dist_puck") == math.hypot(p.x - snap.puck_x, p.y - snap.puck_y)
+        for q in snap.players:
+            assert table.distance(p, q) == table.distance(q, p) == math.hypot(p.x - q.x, p.y - q.y)
+        opp = table.nearest_opp[table.row[p.unique_id]]
+        assert opp.color != p.color
+        assert table.get(p, "nearest_opp_dist") == min(
+            table.distance(p, q) for q in snap.players if q.color != p.color)
+
+
+def test_possession_flags(make_sim):
+    sim = make_sim()
+    carrier = sim.players[5]
+    sim.possessing_player = carrier
+    table = compute_features(_snapshot(sim))
+    for p in table.players:
+        mine = p.color == carrier.color
+        assert table.get(p, "has_puck") == (1.0 if p.unique_id == 5 else 0.0)
+        assert table.get(p, "team_has_puck") == (1.0 if mine else 0.0)
+        assert table.get(p, "opp_has_puck") == (0.0 if mine else 1.0)
+
+
+def test_every_call_builds_its_own_table(make_sim):
+    sim = make_sim()
+    snap = _snapshot(sim)
+    a, b = compute_features(snap), compute_features(snap)
+    assert a is not b
+    assert a.columns == b.columns
+
+
+def test_plan_uses_the_table_it_is_given(make_sim):
+    sim = make_sim()
+    snap = _snapshot(sim)
+    table = compute_features(snap)
+    assert plan_actions(snap, budget=None, table=table).keys() == plan_actions(snap, budget=None).keys()
+
+
+def test_only_the_carrier_dribbles_or_passes(make_sim):
+    sim = make_sim()
+    sim.run_until(10.0)
+    plan = plan_actions(_snapshot(sim), budget=None)
+    holder = sim.possessing_player
+    for uid, action in plan.items():
+        if action.type in (ActionType.DRIBBLE, ActionType.PASS, ActionType.SCORE_GOAL):
+            assert holder is not None and uid == holder.unique_id
+
+
+def test_a_short_dive_is_not_cut_off_at_once(make_sim):
+    sim = make_sim()
+    sim.possessing_player = None
+    p = sim.players[3]
+    p.x, p.y = sim.puck_x, sim.puck_y
+    p.submerging, p.dive_threshold, p.current_dive_time = True, 6.0, 1.0
+    table = compute_features(_snapshot(sim))
+    row = next(q for q in table.players if q.unique_id == 3)
+    assert table.get(row, "breath_left") == 5.0
+    assert math.isclose(table.get(row, "breath_frac"), 5.0 / 6.0)
+    assert decide_dive(row, table)             # 5 of its 6 s left: keep going
+
+
+def test_the_ai_reads_the_sims_config(make_sim):
+    def run(config):
+        sim = make_sim(3, config=config)
+        sim.run_until(5.0)
+        return [(p.x, p.y, p.depth) for p in sim.players.values()]
+    assert run(DEFAULT_CONFIG.replace(ai_dive_range=1.0)) != run(DEFAULT_CONFIG)
+
+
+def test_depth_is_normalised_by_the_configs_floor(make_sim):
+    sim = make_sim(config=DEFAULT_CONFIG.replace(max_depth=2.5))
+    for p in sim.players.values():
+        p.depth = 2.5
+    table = compute_features(_snapshot(sim))
+    assert all(table.get(p, "depth_norm") == 1.0 for p in table.players)
+    sim.run_until(5.0)
+    table = compute_features(_snapshot(sim))
+    assert all(0.0 <= table.get(p, "depth_norm") <= 1.0 for p in table.players)
@@ -0,0 +1,248 @@
+# tests/test_kernels.py
+#
+# Fuzz the hot kernels against the baseline versions frozen in
+# tests/reference.py, plus a few properties of their own. Inputs come from
+# a seeded random.Random, so a failure always reproduces; the case number
+# is in the assertion message. Geometry and targets must agree to within
+# TOL px; breath state to within TOL s (or m), with identical flags.
+
+import copy
+import math
+import random
+
+import pytest
+
+import physics
+import physiology
+from config import DEFAULT_CONFIG, SCALE, PLAYER_RADIUS
+from player import Player
+
+import reference
+from conftest import GREEN, BLUE, LABELS
+
+CASES = 2000
+TOL = 1e-9
+
+POOL = (DEFAULT_CONFIG.pool_left, DEFAULT_CONFIG.pool_right,
+        DEFAULT_CONFIG.pool_top, DEFAULT_CONFIG.pool_bottom)
+
+
+def random_player(rng, **attrs):
+    left, right, top, bottom = POOL
+    p = Player(None, rng.uniform(left - 50, right + 50), rng.uniform(top - 50, bottom + 50),
+               color=rng.choice(("green", "blue")), unique_id=rng.randrange(1, 17),
+               label=rng.choice(LABELS), angle=rng.uniform(-4 * math.pi, 4 * math.pi))
+    physiology.init_player_phys(p)
+    for name, value in attrs.items():
+        setattr(p, name, value)
+    return p
+
+
+# --------------------
+# get_triangle_vertices
+# --------------------
+def test_triangle_vertices_match_reference():
+    rng = random.Random(1)
+    for case in range(CASES):
+        p = random_player(rng)
+        if case % 2:
+            args = (rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3))
+        else:
+            args = ()
+        got, want = physics.get_triangle_vertices(p, *args), reference.get_triangle_vertices(p, *args)
+        assert len(got) == 3
+        for g, w in zip(got, want):
+            assert g == pytest.approx(w, abs=TOL), f"case {case}"
+
+
+def test_triangle_shape():
+    rng = random.Random(2)
+    for case in range(200):
+        p = random_player(rng)
+        tip, bl, br = physics.get_triangle_vertices(p)
+        # the tip is PLAYER_RADIUS ahead of the centre, the base half that behind
+        assert math.hypot(tip[0] - p.x, tip[1] - p.y) == pytest.approx(PLAYER_RADIUS), f"case {case}"
+        assert math.hypot(bl[0] - br[0], bl[1] - br[1]) == pytest.approx(PLAYER_RADIUS), f"case {case}"
+
+
+# --------------------
+# polygons_collide
+# --------------------
+def _random_polygon(rng, near):
+    """A triangle: usually a player's, sometimes arbitrary (possibly degenerate)."""
+    if rng.random() < 0.7:
+        x, y = near[0] + rng.uniform(-60, 60), near[1] + rng.uniform(-60, 60)
+        return physics.get_triangle_vertices(None, x, y, rng.uniform(-math.pi, math.pi))
+    pts = [(near[0] + rng.uniform(-60, 60), near[1] + rng.uniform(-60, 60)) for _ in range(3)]
+    if rng.random() < 0.1:
+        pts[2] = pts[1]                  # a zero-length edge
+    return pts
+
+
+def test_polygons_collide_matches_reference():
+    rng = random.Random(3)
+    checked = 0
+    for case in range(CASES * 2):
+        centre = (rng.uniform(0, 400), rng.uniform(0, 700))
+        a, b = _random_polygon(rng, centre), _random_polygon(rng, centre)
+        eps = rng.choice((0.0, 1.5, rng.uniform(0, 5)))
+        # skip cases within TOL of touching, where rounding may fairly go either way
+        if (reference.polygons_collide(a, b, eps - TOL)
+                != reference.polygons_collide(a, b, eps + TOL)):
+            continue
+        assert physics.polygons_collide(a, b, eps) == reference.polygons_collide(a, b, eps), \
+            f"case {case}: {a} {b} eps={eps}"
+        checked += 1
+    assert checked > CASES
+
+
+def test_polygons_collide_properties():
+    rng = random.Random(4)
+    for case in range(CASES):
+        centre = (rng.uniform(0, 400), rng.uniform(0, 700))
+        a, b = _random_polygon(rng, centre), _random_polygon(rng, centre)
+        assert physics.polygons_collide(a, b) == physics.polygons_collide(b, a), f"case {case}"
+        assert physics.polygons_collide(a, a), f"case {case}"
+        far = [(x + 1e4, y) for x, y in b]
+        assert not physics.polygons_collide(a, far), f"case {case}"
+
+
+# --------------------
+# compute_target_for_player
+# --------------------
+FORMATION_NAMES = ("center_court", "left_wall", "right_wall",
+                   "LBteammate_possession_leftwall", "RBteammate_possession_rightwall",
+                   "Cteammate_possession")
+
+
+def test_compute_target_matches_reference():
+    rng = random.Random(5)
+    left, right, top, bottom = POOL
+    for case in range(CASES):
+        p = random_player(rng)
+        name = rng.choice(FORMATION_NAMES)
+        formation = dict(rng.choice(list(GREEN.values()) + list(BLUE.values())))
+        if rng.random() < 0.1:
+            formation.pop(p.label)       # no entry: the player holds their spot
+        ref = (rng.uniform(left - 20, right + 20), rng.uniform(top - 20, bottom + 20))
+        if rng.random() < 0.02:
+            ref = ((left + right) / 2, bottom if rng.random() < 0.5 else top)   # on a goal centre
+        args = (p, name, formation, *ref, *POOL, SCALE)
+        got = physics.compute_target_for_player(*args)
+        assert got == pytest.approx(reference.compute_target_for_player(*args), abs=TOL), f"case {case}"
+
+
+def test_compute_target_stays_in_pool():
+    rng = random.Random(6)
+    left, right, top, bottom = POOL
+    for case in range(CASES):
+        p = random_player(rng)
+        formation = rng.choice(list(GREEN.values()))
+        ref = (rng.uniform(left, right), rng.uniform(top, bottom))
+        tx, ty = physics.compute_target_for_player(p, "center_court", formation, *ref, *POOL, SCALE)
+        assert left + PLAYER_RADIUS - TOL <= tx <= right - PLAYER_RADIUS + TOL, f"case {case}"
+        assert top + PLAYER_RADIUS - TOL <= ty <= bottom - PLAYER_RADIUS + TOL, f"case {case}"
+
+
+# --------------------
+# update_player_breath_hold
+# --------------------
+# The baseline took the puck as a canvas item; the live version takes its
+# position, may hand the surface lock to a scheduler and may follow the
+# planner's dive_intent. They are compared where they overlap: no
+# scheduler, no dive_intent and the default config, whose settings are
+# the baseline's constants.
+STATE = ("depth", "submerging", "current_dive_time", "short_term_stamina", "long_term_stamina",
+         "surface_lock_timer", "dive_threshold")
+
+
+class PuckCanvas:
+    """Stands in for the baseline's Tk canvas: just the puck's bounding box."""
+
+    def __init__(self, x, y, r=DEFAULT_CONFIG.puck_radius):
+        self.box = (x - r, y - r, x + r, y + r)
+
+    def coords(self, item):
+        return self.box
+
+
+def _random_breath_state(rng, p):
+    cfg = DEFAULT_CONFIG
+    p.depth = rng.choice((0.0, cfg.max_depth, rng.uniform(0, cfg.max_depth)))
+    p.submerging = rng.random() < 0.5
+    p.current_dive_time = rng.choice((0.0, rng.uniform(0, 20)))
+    p.short_term_stamina = rng.uniform(0, cfg.base_max_breath)
+    p.long_term_stamina = rng.uniform(cfg.min_long_term, 1.0)
+    p.surface_lock_timer = rng.choice((0.0, 0.0, rng.uniform(0, cfg.surface_lock_duration)))
+    p.dive_threshold = rng.choice((None, rng.uniform(*cfg.dive_threshold_range)))
+    if rng.random() < 0.02:
+        p.role = "bench"
+
+
+def _compare(a, b, case):
+    for name in STATE:
+        x, y = getattr(a, name), getattr(b, name)
+        if isinstance(y, float):
+            assert x == pytest.approx(y, abs=TOL), f"case {case}: {name}"
+        else:
+            assert x == y, f"case {case}: {name}"
+
+
+def _step_both(monkeypatch, p, q, seed, dt, controlled, want, puck):
+    """One live step of `p` and one baseline step of `q`, each drawing from random.Random(seed)."""
+    monkeypatch.setattr(physiology, "random", random.Random(seed))
+    physiology.update_player_breath_hold(p, dt, controlled, want, puck)
+    monkeypatch.setattr(reference, "random", random.Random(seed))
+    reference.update_player_breath_hold(q, dt, controlled, want, PuckCanvas(*puck), "puck")
+
+
+def test_breath_hold_matches_reference(monkeypatch):
+    rng = random.Random(7)
+    for case in range(CASES):
+        p = random_player(rng)
+        _random_breath_state(rng, p)
+        q = copy.copy(p)
+        controlled, want = rng.random() < 0.3, rng.random() < 0.5
+        puck = (rng.uniform(*POOL[:2]), rng.uniform(*POOL[2:]))
+        dt = rng.choice((0.05, rng.uniform(0.001, 0.5)))
+        _step_both(monkeypatch, p, q, rng.getrandbits(32), dt, controlled, want, puck)
+        _compare(p, q, case)
+
+
+def test_breath_hold_sequences_match_reference(monkeypatch):
+    """Whole dives: many steps in a row, so the state drifts through every branch."""
+    rng = random.Random(8)
+    for case in range(40):
+        p = random_player(rng)
+        q = copy.copy(p)
+        controlled = case % 2 == 0
+        for step in range(600):
+            want = (step // 150) % 2 == 0
+            puck = (p.x + rng.uniform(-200, 200), p.y + rng.uniform(-200, 200))
+            _step_both(monkeypatch, p, q, rng.getrandbits(32), 0.05, controlled, want, puck)
+            _compare(p, q, f"{case} step {step}")
+
+
+def test_breath_hold_stays_in_range(monkeypatch):
+    rng = random.Random(9)
+    monkeypatch.setattr(physiology, "random", random.Random(10))
+    cfg = DEFAULT_CONFIG
+    for case in range(40):
+        p = random_player(rng)
+        controlled = case % 2 == 0
+        for step in range(600):
+            want = (step // 150) % 2 == 0
+            if step % 50 == 0:
+                p.dive_intent = rng.choice((None, True, False))
+            puck = (p.x + rng.uniform(-200, 200), p.y + rng.uniform(-200, 200))
+            physiology.update_player_breath_hold(p, 0.05, controlled, want, puck)
+            assert 0.0 <= p.depth <= cfg.max_depth, f"case {case} step {step}"
+            assert cfg.min_long_term <= p.long_term_stamina <= 1.0, f"case {case} step {step}"
+            assert p.short_term_stamina >= 0.0, f"case {case} step {step}"
+            assert p.surface_lock_timer >= 0.0, f"case {case} step {step}"
+
+
+def test_breath_hold_needs_puck_for_ai():
+    p = random_player(random.Random(11))
+    with pytest.raises(RuntimeError):
+        physiology.update_player_breath_hold(p, 0.05, False, False)
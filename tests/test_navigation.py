@@ -0,0 +1,50 @@
+# tests/test_navigation.py
+
+from types import SimpleNamespace
+
+from navigation import NavGrid
+
+
+def _grid():
+    return NavGrid(0, 0, 10, 20, cell_px=1)       # 10 × 20 cells
+
+
+def _walk(grid, field, i, limit=200):
+    """Cells visited following the field from cell i."""
+    path = [i]
+    while field.dir_x[i] or field.dir_y[i]:
+        x, y = grid.center_of(i)
+        i = grid.cell_of(x + field.dir_x[i] * 1.5, y + field.dir_y[i] * 1.5)
+        path.append(i)
+        assert len(path) < limit
+    return path
+
+
+def test_every_cell_leads_to_the_target():
+    grid = _grid()
+    field = grid.flow_field(5.5, 2.5)
+    goal = grid.cell_of(5.5, 2.5)
+    for i in range(grid.cols * grid.rows):
+        path = _walk(grid, field, i)
+        assert path[-1] == goal
+        costs = [field.cost[j] for j in path]
+        assert costs == sorted(costs, reverse=True)
+
+
+def test_fields_route_around_occupied_cells():
+    grid = _grid()
+    grid.set_occupancy([SimpleNamespace(x=5.5, y=y + 0.5) for y in range(5, 9)])
+    path = _walk(grid, grid.flow_field(5.5, 2.5), grid.cell_of(5.5, 15.5))
+    assert not set(path) & set(grid._occupied)
+
+
+def test_fields_are_shared_until_occupancy_changes():
+    grid = _grid()
+    grid.set_occupancy([SimpleNamespace(x=1.5, y=1.5)])
+    a = grid.flow_field(5.2, 2.2)
+    assert grid.flow_field(5.8, 2.8) is a                 # same target cell
+    assert a.target == (5.8, 2.8)
+    grid.set_occupancy([SimpleNamespace(x=1.5, y=1.5)])   # unchanged
+    assert grid.flow_field(5.5, 2.5) is a
+    grid.set_occupancy([SimpleNamespace(x=3.5, y=3.5)])
+    assert grid.flow_field(5.5, 2.5) is not a
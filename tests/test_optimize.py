@@ -0,0 +1,48 @@
+# tests/test_optimize.py
+
+import checkpoint
+import optimize
+from config import DEFAULT_CONFIG
+
+
+def test_formation_space_round_trip(formations):
+    green, _ = formations
+    space = optimize.FormationSpace(green, patterns=("*_wall",))
+    assert len(space) == 2 * 2 * 6
+    vec = [v + 0.123 for v in space.vector()]
+    out = space.formations(vec)
+    assert out["left_wall"]["FB"][0] == round(green["left_wall"]["FB"][0] + 0.12, 6)
+    assert out["center_court"] == green["center_court"]        # not in the space
+    assert space.vector(out) == [round(v, 2) for v in vec]
+
+
+def test_eval_keys(formations, monkeypatch):
+    green, blue = formations
+    key = optimize.eval_key(green, blue, 60.0, 1)
+    assert key == optimize.eval_key(green, blue, 60.0, 1, DEFAULT_CONFIG)
+    assert key != optimize.eval_key(green, blue, 60.0, 2)
+    assert key != optimize.eval_key(green, blue, 60.0, 1, DEFAULT_CONFIG.replace(max_depth=2.5))
+    monkeypatch.setattr(optimize, "EVAL_VERSION", optimize.EVAL_VERSION + 1)
+    assert key != optimize.eval_key(green, blue, 60.0, 1)      # old results are not reused
+
+
+def test_eval_cache_persists(tmp_path):
+    path = str(tmp_path / "evals.jsonl")
+    cache = optimize.EvalCache(path)
+    cache.put("k", {"goals": {"green": 1, "blue": 0}})
+    cache.close()
+    again = optimize.EvalCache(path)
+    assert again.get("k") == {"goals": {"green": 1, "blue": 0}}
+    assert again.get("missing") is None and again.hits == 1
+    again.close()
+
+
+def test_matches_are_all_ai(formations, monkeypatch):
+    seen = []
+
+    def play_on(sim, seconds):
+        seen.append(dict(sim.controlled))
+        return {}
+    monkeypatch.setattr(checkpoint, "play_on", play_on)
+    optimize._match((*formations, 1.0, 1, DEFAULT_CONFIG))
+    assert seen == [{"green": None, "blue": None}]
@@ -0,0 +1,62 @@
+# tests/test_passing.py
+
+import math
+import random
+
+import passing
+from features import compute_features
+from planner import take_snapshot
+
+
+def _sampled_distance(ax, ay, bx, by, tri, steps=400):
+    """Distance from the segment to the triangle, by sampling the segment."""
+    best = math.inf
+    for i in range(steps + 1):
+        t = i / steps
+        x, y = ax + (bx - ax) * t, ay + (by - ay) * t
+        if passing._point_in_triangle(x, y, tri):
+            return 0.0
+        for j in range(3):
+            (cx, cy), (dx, dy) = tri[j], tri[(j + 1) % 3]
+            best = min(best, passing._point_segment_dist(x, y, cx, cy, dx, dy))
+    return best
+
+
+def test_segment_triangle_distance():
+    rng = random.Random(1)
+    for case in range(300):
+        tri = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(3)]
+        a = (rng.uniform(-50, 150), rng.uniform(-50, 150))
+        b = (rng.uniform(-50, 150), rng.uniform(-50, 150))
+        got = passing.segment_triangle_distance(*a, *b, tri)
+        want = _sampled_distance(*a, *b, tri)
+        # sampling only ever overestimates, by at most half a step
+        assert got <= want + 1e-9, f"case {case}"
+        assert want - got <= math.hypot(b[0] - a[0], b[1] - a[1]) / 800 + 1e-9, f"case {case}"
+
+
+def _lane(options, passer, receiver):
+    return next(o for o in options[passer] if o.receiver_id == receiver)
+
+
+def test_an_opponent_on_the_bottom_blocks_the_lane(make_sim):
+    sim = make_sim()
+    a, b, opp = sim.players[4], sim.players[5], sim.players[15]
+    a.x, a.y, b.x, b.y = 150, 400, 200, 400
+    opp.x, opp.y, opp.depth = 175, 400, sim.config.max_depth
+    snap = take_snapshot(sim, 0, sim.puck_x, sim.puck_y)
+    blocked = _lane(passing.evaluate_lanes(snap, "green", compute_features(snap)), 4, 5)
+    assert blocked.clearance == 0.0 and blocked.risk == 1.0 and blocked.score == 0.0
+
+    opp.depth = 0.0                # on the surface it can't touch the puck
+    snap = take_snapshot(sim, 0, sim.puck_x, sim.puck_y)
+    assert _lane(passing.evaluate_lanes(snap, "green", compute_features(snap)), 4, 5).risk == 0.0
+
+
+def test_every_sim_keeps_its_own_lanes(make_sim):
+    one, two = make_sim(1), make_sim(2)
+    snap = take_snapshot(one, one.tick, one.puck_x, one.puck_y)
+    table = compute_features(snap)
+    cached = passing.pass_options(snap, "green", table)
+    assert set(one.pass_lanes) == {"green"} and not two.pass_lanes
+    assert passing.pass_options(snap, "green", table) is cached     # same cells: reused
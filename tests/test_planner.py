@@ -0,0 +1,91 @@
+# tests/test_planner.py
+
+from concurrent.futures import Future
+
+import ai
+from planner import AsyncPlanner, Planner, take_snapshot
+
+
+def _snapshot(sim):
+    return take_snapshot(sim, sim.tick, sim.puck_x, sim.puck_y)
+
+
+class NeverDone:
+    """An executor whose jobs never finish."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        return Future()
+
+
+def test_snapshot_is_a_copy(make_sim):
+    sim = make_sim()
+    snap = _snapshot(sim)
+    p = sim.players[5]
+    x = p.x
+    p.x += 100
+    assert next(s for s in snap.players if s.unique_id == 5).x == x
+
+
+def test_sync_plan_covers_every_ai_player(make_sim):
+    sim = make_sim()
+    sim.enable_human("green", 1)
+    planner = Planner()
+    planner.submit(_snapshot(sim))
+    plan = planner.collect()
+    assert set(plan) == set(sim.players) - {1}
+    assert all(a.target is not None for a in plan.values())
+
+
+def test_sync_plan_depends_only_on_the_snapshot(make_sim):
+    sim = make_sim()
+    sim.run_until(3.0)
+    snap = _snapshot(sim)
+    a, b = Planner(), Planner()
+    a.submit(snap)
+    b.submit(snap)
+    assert {u: (x.type, x.target) for u, x in a.collect().items()} == \
+           {u: (x.type, x.target) for u, x in b.collect().items()}
+
+
+def test_async_planner_delivers_the_plan(make_sim):
+    sim = make_sim()
+    planner = AsyncPlanner(budget=10.0)
+    try:
+        planner.submit(_snapshot(sim))
+        assert set(planner.collect()) == set(sim.players)
+        assert planner.overruns == 0
+    finally:
+        planner.close()
+
+
+def test_async_planner_reuses_the_last_plan_when_late(make_sim):
+    sim = make_sim()
+    executor = NeverDone()
+    planner = AsyncPlanner(budget=0.001, executor=executor)
+    planner.submit(_snapshot(sim))
+    assert planner.collect() == {}             # nothing finished yet
+    planner.submit(_snapshot(sim))             # still busy: no second job
+    planner.collect()
+    assert executor.submitted == 1
+    assert planner.overruns == 2
+    planner.close()                            # not ours to shut down
+
+
+def test_sync_plan_ignores_a_slow_clock(make_sim, monkeypatch):
+    sim = make_sim()
+    decided, decide = [], ai.decide_action
+
+    def counting(player, snap, table):
+        decided.append(player.unique_id)
+        return decide(player, snap, table)
+    clock = iter(range(0, 10 ** 6, 10))         # every reading 10 s later: a loaded machine
+    monkeypatch.setattr(ai.time, "perf_counter", lambda: next(clock))
+    monkeypatch.setattr(ai, "decide_action", counting)
+
+    planner = Planner()
+    planner.submit(_snapshot(sim))
+    assert sorted(decided) == sorted(planner.collect())        # nobody fell back to formation
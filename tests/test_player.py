@@ -0,0 +1,75 @@
+# tests/test_player.py
+
+from player import LOD_ANGLE, Player
+
+
+class FakeCanvas:
+    """Records the canvas calls a Player makes."""
+
+    def __init__(self):
+        self.calls = []
+        self._next = 0
+
+    def _item(self, name, *args, **kw):
+        self.calls.append(name)
+        self._next += 1
+        return self._next
+
+    def create_polygon(self, *args, **kw):
+        return self._item("create_polygon")
+
+    def create_text(self, *args, **kw):
+        return self._item("create_text")
+
+    def coords(self, item, *args):
+        self.calls.append("coords")
+
+    def itemconfig(self, item, **kw):
+        self.calls.append(("itemconfig",) + tuple(sorted(kw)))
+
+
+def _player():
+    canvas = FakeCanvas()
+    p = Player(canvas, 100, 100, "green", 1, "FB")
+    assert canvas.calls == ["create_polygon", "create_text"]
+    canvas.calls.clear()
+    return p, canvas
+
+
+def test_small_moves_are_not_redrawn():
+    p, canvas = _player()
+    p.update_position(0.5, -0.5)
+    p.update_angle(p.angle + LOD_ANGLE / 2)
+    assert canvas.calls == []                  # nothing until draw()
+    p.draw(min_move=1.0)
+    assert canvas.calls == []
+
+
+def test_moves_accumulate_until_they_show():
+    p, canvas = _player()
+    for _ in range(3):
+        p.update_position(0.4, 0.0)
+        p.draw(min_move=1.0)
+    assert canvas.calls == ["coords", "coords"]    # 1.2 px from where it was last drawn
+    canvas.calls.clear()
+    p.update_angle(p.angle + LOD_ANGLE * 2)
+    p.draw(min_move=1.0)
+    assert canvas.calls == ["coords", "coords"]
+
+
+def test_fill_changes_are_redrawn_without_moving():
+    p, canvas = _player()
+    p.update_color("#88cc88")
+    p.draw(min_move=1.0)
+    assert canvas.calls == [("itemconfig", "fill")]
+    assert p.color == "green"                  # shading never changes the team
+    canvas.calls.clear()
+    p.draw(min_move=1.0)
+    assert canvas.calls == []
+
+
+def test_headless_players_never_draw():
+    p = Player(None, 100, 100, "blue", 7, "FB")
+    p.update_position(50, 50)
+    p.draw()
+    assert p.polygon is None
@@ -0,0 +1,64 @@
+# tests/test_renderers.py
+
+import io
+
+from config import CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX, DEFAULT_CONFIG, MAX_DEPTH, STATUS_WIDTH_PX
+from raster import rgb
+from renderers import (FADE_RATIO, ImageSequenceSink, RawStreamSink,
+                       SoftwareRenderer, depth_shade)
+
+
+def _pixel(fb, x, y):
+    i = (int(y) * fb.width + int(x)) * 3
+    return tuple(fb.pixels[i:i + 3])
+
+
+def test_depth_shade():
+    green = rgb("green")
+    assert depth_shade(green, 0.0) == green
+    assert depth_shade(green, MAX_DEPTH, carrying=True) == green
+    faded = depth_shade(green, MAX_DEPTH)
+    assert faded == tuple(int(c + (255 - c) * FADE_RATIO) for c in green)
+    assert depth_shade(green, MAX_DEPTH * 3) == faded          # clamped past the floor
+    half = depth_shade(green, MAX_DEPTH / 2)
+    assert all(min(a, b) <= h <= max(a, b) for a, b, h in zip(green, faded, half))
+
+
+def test_software_renderer_draws_headless(make_sim):
+    sim = make_sim()
+    sim.run_until(1.0)
+    frames = []
+    r = SoftwareRenderer(sink=lambda fb: frames.append(bytes(fb.pixels)), status=True)
+    fb = r.draw_frame(sim)
+    assert (fb.width, fb.height) == (CANVAS_WIDTH_PX + STATUS_WIDTH_PX, CANVAS_HEIGHT_PX)
+    assert _pixel(fb, sim.puck_x, sim.puck_y) == rgb("orange")
+    p = max(sim.players.values(), key=lambda q: abs(q.x - sim.puck_x) + abs(q.y - sim.puck_y))
+    assert _pixel(fb, p.x, p.y) == depth_shade(rgb(p.base_color), p.depth)
+    r.draw_frame(sim)
+    assert r.count == 2 and len(frames) == 2
+    assert frames[0] == frames[1]                  # same sim state, same frame
+
+
+def test_gauges_follow_the_configured_breath(make_sim):
+    x = CANVAS_WIDTH_PX + 10                       # left edge of the first gauge
+    y = 20 + 25 * 10                               # 25 s up a 10 px/s gauge
+    assert DEFAULT_CONFIG.base_max_breath < 25
+    for breath, outline in ((DEFAULT_CONFIG.base_max_breath, False), (30.0, True)):
+        sim = make_sim(config=DEFAULT_CONFIG.replace(base_max_breath=breath))
+        fb = SoftwareRenderer(status=True).draw_frame(sim)
+        assert (_pixel(fb, x, y) == rgb("black")) == outline
+
+
+def test_sinks(tmp_path, make_sim):
+    sim = make_sim()
+    stream = io.BytesIO()
+    r = SoftwareRenderer(sink=RawStreamSink(stream))
+    r.draw_frame(sim)
+    r.draw_frame(sim)
+    r.close()
+    assert len(stream.getvalue()) == 2 * CANVAS_WIDTH_PX * CANVAS_HEIGHT_PX * 3
+
+    sink = ImageSequenceSink(str(tmp_path), fmt="ppm", start=5)
+    SoftwareRenderer(sink=sink).draw_frame(sim)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["frame_000005.ppm"]
+    assert sink.index == 6
@@ -0,0 +1,54 @@
+# tests/test_rollout.py
+
+import time
+
+import pytest
+
+from ai import ActionType
+import checkpoint
+import rollout
+from rollout import Candidate, Estimate
+
+
+def _sim(make_sim):
+    sim = make_sim(4)
+    sim.run_until(3.0)
+    return sim
+
+
+def test_rollouts_are_seeded(make_sim):
+    sim = _sim(make_sim)
+    state = checkpoint.capture(sim)
+    cand = Candidate(ActionType.DEFEND, None)
+    first, second = (rollout.rollout(state, 4, cand, 1, horizon=2.0) for _ in range(2))
+    assert first == second and first in (-1, 0, 1)
+    assert rollout.rollout(state, 4, cand, 1, deadline=0.0) is None
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_evaluate_keeps_to_its_budget(make_sim, workers):
+    sim = _sim(make_sim)
+    tick = sim.tick
+    t0 = time.monotonic()
+    estimates = rollout.evaluate(sim, sim.players[4], budget=0.3, workers=workers, seed=3)
+    assert time.monotonic() - t0 < 1.0                  # the budget plus forking the workers
+    assert len(estimates) > 1
+    ranks = [(e.rollouts > 0, not e.insufficient) for e in estimates]
+    assert ranks == sorted(ranks, reverse=True)         # trusted, then thin, then unknown
+    assert sim.tick == tick
+
+
+def test_no_budget_leaves_the_ai_order(make_sim):
+    sim = _sim(make_sim)
+    estimates = rollout.evaluate(sim, sim.players[4], budget=0.0, workers=2, seed=3)
+    assert all(e.rollouts == 0 for e in estimates)
+    assert [e.candidate for e in estimates] == [c for c, _ in rollout._candidates(sim, sim.players[4])]
+
+
+def test_unvisited_candidates_are_unknown():
+    c = Candidate(ActionType.FORMATION, None)
+    unknown = Estimate(c, None, 0, 0, 0)
+    assert unknown.value is None and unknown.p_score is None and unknown.insufficient
+    losing = Estimate(c, None, rollout.MIN_ROLLOUTS, 0, 1)
+    assert losing.value < 0 and not losing.insufficient
+    assert Estimate(c, None, 1, 1, 0).insufficient
@@ -0,0 +1,150 @@
+# tests/test_rules.py
+
+import math
+
+import pytest
+
+import rules
+from config import GOAL_THICKNESS_PX, PENALTY_SPOT_M, SCALE
+from rules import Call, RuleEngine, plan_restart
+
+
+def _spread(sim):
+    """Everyone apart, still and off the bottom; nothing to call."""
+    cols = 6
+    for i, p in enumerate(sorted(sim.players.values(), key=lambda p: p.unique_id)):
+        p.x = sim.pool_left + 40 + (i % cols) * 60
+        p.y = sim.pool_top + 150 + (i // cols) * 200
+        p.vx = p.vy = 0.0
+        p.depth = 1.0
+    sim.possessing_player = None
+    sim.bodies.rebuild(sim.players.values())
+
+
+def _team(sim, color):
+    return [p for p in sim.players.values() if p.color == color]
+
+
+def test_quiet_play_is_not_called(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    assert RuleEngine().check(sim) is None
+
+
+def test_offside_is_settled_by_the_first_touch(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    engine = RuleEngine()
+    passer, ahead, behind = _team(sim, "green")[:3]
+    passer.y = sim.puck_y = sim.pool_top + 300
+    ahead.y = min([sim.puck_y] + [p.y for p in _team(sim, "blue")]) - 30   # past the puck and every defender
+    behind.y = passer.y + 50
+    sim.bodies.rebuild(sim.players.values())
+
+    engine.on_pass(sim, passer)
+    sim.possessing_player = ahead
+    call = engine.check(sim)
+    assert (call.kind, call.offender, call.team, call.penalty) == ("offside", ahead.unique_id, "blue", False)
+    assert engine.check(sim) is None                          # called once
+
+    engine.on_pass(sim, passer)
+    sim.possessing_player = behind
+    assert engine.check(sim) is None                          # onside receiver
+
+
+def test_swimming_into_an_opponent(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    engine = RuleEngine()
+    g, b = _team(sim, "green")[0], _team(sim, "blue")[0]
+    g.x, g.y = 300, 350
+    b.x, b.y = 300 + rules.CONTACT_RADIUS * 0.8, 350
+    g.vx = rules.CONTACT_SPEED * 1.5
+    sim.bodies.rebuild(sim.players.values())
+
+    call = engine.check(sim)
+    assert (call.kind, call.offender, call.victim, call.team) == \
+        ("contact", g.unique_id, b.unique_id, "blue")
+    assert engine.check(sim) is None                          # still touching: one call
+
+    engine.reset()
+    g.vx = rules.CONTACT_SPEED / 4                            # drifted together
+    assert engine.check(sim) is None
+    engine.reset()
+    g.vx, g.depth, b.depth = rules.CONTACT_SPEED * 1.5, sim.config.max_depth, sim.config.max_depth
+    assert engine.check(sim) is None                          # contesting on the bottom is play
+
+
+def test_contact_in_own_arc_is_a_penalty(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    g, b = _team(sim, "green")[0], _team(sim, "blue")[0]
+    cx = (sim.pool_left + sim.pool_right) / 2
+    g.x, g.y = cx, sim.pool_bottom - 2 * SCALE                # green defends the bottom
+    b.x, b.y = cx, g.y - rules.CONTACT_RADIUS * 0.8
+    g.vy = -rules.CONTACT_SPEED * 1.5
+    sim.bodies.rebuild(sim.players.values())
+    call = RuleEngine().check(sim)
+    assert call.kind == "contact" and call.offender == g.unique_id and call.penalty
+
+
+def test_a_screen_held_too_long_is_obstruction(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    engine = RuleEngine()
+    v, b = _team(sim, "green")[0], _team(sim, "blue")[0]
+    x = (sim.pool_left + sim.pool_right) / 2
+    sim.puck_x, sim.puck_y = x, sim.pool_bottom - 200        # below everyone else
+    v.x, v.y = x, sim.pool_bottom - 80
+    b.x, b.y = x, v.y - rules.OBSTRUCT_RADIUS * 0.8          # between v and the puck
+    sim.bodies.rebuild(sim.players.values())
+    ticks = int(round(rules.OBSTRUCTION_TIME / sim.dt))
+    for _ in range(ticks):
+        assert engine.check(sim) is None
+        sim.tick += 1
+    call = engine.check(sim)
+    assert (call.kind, call.offender, call.victim, call.team) == \
+        ("obstruction", b.unique_id, v.unique_id, "green")
+
+    engine.reset()
+    b.vy = -1.0                                              # going for the puck itself
+    sim.tick += ticks
+    assert engine.check(sim) is None
+
+
+def test_free_puck_restart(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    victim, near = _team(sim, "green")[2], _team(sim, "blue")[1]
+    near.x, near.y = 320, 340
+    call = Call(sim.tick, "contact", 99, victim.unique_id, "green", 300, 350, False)
+    spot, taker, moves = plan_restart(sim, call)
+    assert taker is victim and spot == (300, 350)
+    assert moves[victim.unique_id] == (300, 350, 0.0)       # facing the top goal
+    clear = rules.FREE_PUCK_DISTANCE_M * SCALE
+    for p in _team(sim, "blue"):
+        x, y = moves.get(p.unique_id, (p.x, p.y))[:2]
+        assert math.hypot(x - 300, y - 350) >= clear - 1e-6
+    assert near.unique_id in moves
+    assert all(p.unique_id not in moves for p in _team(sim, "green") if p is not victim)
+
+
+def test_penalty_restart(make_sim):
+    sim = make_sim()
+    _spread(sim)
+    victim = _team(sim, "blue")[0]
+    call = Call(sim.tick, "contact", 1, victim.unique_id, "blue", 0, 0, True)
+    spot, taker, moves = plan_restart(sim, call)
+    cx = (sim.pool_left + sim.pool_right) / 2
+    goal = sim.pool_bottom                                   # blue attacks the bottom
+    assert taker is victim
+    assert spot == pytest.approx((cx, goal - GOAL_THICKNESS_PX - PENALTY_SPOT_M * SCALE))
+    assert moves[victim.unique_id][2] == pytest.approx(math.pi)
+    keepers = [uid for uid, (x, y, _) in moves.items()
+               if sim.players[uid].color == "green" and y > spot[1]]
+    assert len(keepers) == 1                                 # only the keeper is behind the spot
+    wait = spot[1] - rules.PENALTY_CLEAR_M * SCALE
+    for uid, p in sim.players.items():
+        if uid not in keepers and p is not taker:
+            y = moves.get(uid, (p.x, p.y))[1]
+            assert y <= wait + 1e-6
@@ -0,0 +1,64 @@
+# tests/test_scheduler.py
+
+from scheduler import EventScheduler
+
+
+def test_events_fire_in_time_then_scheduling_order():
+    s, fired = EventScheduler(), []
+    s.schedule(2.0, fired.append, "late")
+    s.schedule(1.0, fired.append, "first")
+    s.schedule(1.0, fired.append, "second")     # same time: scheduling order
+    s.schedule_at(0.5, fired.append, "absolute")
+    s.run_until(5.0)
+    assert fired == ["absolute", "first", "second", "late"]
+    assert s.now == 5.0
+
+
+def test_run_until_stops_at_the_target():
+    s, fired = EventScheduler(), []
+    s.schedule(1.0, fired.append, 1)
+    s.schedule(3.0, fired.append, 3)
+    s.run_until(2.0)
+    assert fired == [1] and s.now == 2.0
+    assert s.next_time() == 3.0 and len(s) == 1
+
+
+def test_cancel():
+    s, fired = EventScheduler(), []
+    keep = s.schedule(1.0, fired.append, "keep")
+    drop = s.schedule(1.0, fired.append, "drop")
+    s.cancel(drop)
+    s.cancel(None)                 # harmless
+    assert s.pending() == [keep]
+    s.run_until(2.0)
+    s.cancel(keep)                 # already fired: harmless
+    assert fired == ["keep"] and len(s) == 0
+
+
+def test_events_scheduled_while_running():
+    s, fired = EventScheduler(), []
+
+    def chain(n):
+        fired.append((n, s.now))
+        if n < 3:
+            s.schedule(0.5, chain, n + 1)
+    s.schedule(0.5, chain, 1)
+    s.run_until(10.0)
+    assert fired == [(1, 0.5), (2, 1.0), (3, 1.5)]
+
+
+def test_past_times_fire_now():
+    s, fired = EventScheduler(start_time=4.0), []
+    s.schedule_at(1.0, fired.append, "past")
+    assert s.next_time() == 4.0
+    s.step()
+    assert fired == ["past"]
+
+
+def test_one_tick_per_frame(make_sim):
+    sim = make_sim()
+    sim.run_until(30.0)
+    assert sim.tick == 600          # ticks at n × dt exactly, none dropped to rounding
+    for _ in range(600):
+        sim.advance(sim.dt)
+    assert sim.tick == 1200
@@ -0,0 +1,84 @@
+# tests/test_scoreboard.py
+
+import pytest
+
+from planner import Planner
+from scoreboard import FULL_TIME, HALFTIME, PLAY, TIMEOUT, Scoreboard, describe, play_match
+
+
+class HumanWatch(Planner):
+    """The sync AI, noting which players were left to humans on every tick."""
+
+    def __init__(self):
+        super().__init__()
+        self.humans = set()
+        self.ticks = 0
+
+    def submit(self, snap):
+        self.humans |= set(snap.humans)
+        self.ticks += 1
+        super().submit(snap)
+
+
+def _board():
+    return Scoreboard(half_length=3.0, halves=2, halftime=1.0, timeout_length=0.5, timeouts=1)
+
+
+def test_a_headless_match_is_all_ai(formations):
+    watch = HumanWatch()
+    play_match(5, *formations, _board(), planner=watch)
+    assert watch.ticks > 0 and watch.humans == set()
+
+
+def test_halves_and_breaks_follow_sim_time(formations):
+    result = play_match(5, *formations, _board())
+    assert result["finished"] and result["half"] == 2
+    assert result["ticks"] == 140                     # 3 s + 1 s break + 3 s, at 20 ticks/s
+    assert result["seconds"] == pytest.approx(7.0)
+    g, b = result["goals"]["green"], result["goals"]["blue"]
+    assert result["winner"] == ("green" if g > b else "blue" if b > g else None)
+
+
+def test_timeouts_stop_the_clock(make_sim):
+    board = _board()
+    sim = make_sim(scoreboard=board)
+    sim.run_until(1.0)
+    assert sim.call_timeout("green")
+    assert board.phase == TIMEOUT and board.timeouts_left["green"] == 0
+    sim.run_until(1.4)
+    assert board.clock(sim.time) == pytest.approx(1.0)
+    assert not sim.call_timeout("blue")               # not while one is running
+    sim.run_until(2.0)
+    assert board.phase == PLAY and board.clock(sim.time) == pytest.approx(1.5)
+    assert not sim.call_timeout("green")              # none left this half
+    sim.run_until(3.49)
+    assert board.phase == PLAY
+    sim.run_until(3.5)
+    assert board.phase == HALFTIME and board.clock(sim.time) == 3.0
+    sim.run_until(4.5)
+    assert board.half == 2 and board.timeouts_left == {"green": 1, "blue": 1}
+    sim.run_until(7.5)
+    assert board.phase == FULL_TIME
+
+
+def _score(sim):
+    """Put the puck in the top goal and let the sim notice."""
+    sim.puck_x = (sim.goal_x1 + sim.goal_x2) / 2
+    sim.puck_y = (sim.goal_top_y1 + sim.goal_top_y2) / 2
+    sim._check_goal()
+
+
+def test_the_half_overtakes_a_goal_stoppage(make_sim):
+    board = _board()
+    sim = make_sim(scoreboard=board)
+    sim.run_until(2.0)
+    _score(sim)
+    assert sim.game_paused and sim._goal_event is not None
+    sim.run_until(4.5)                                # the reset was due at 5.0
+    assert board.half == 2 and board.phase == PLAY
+    assert not sim.game_paused and sim._goal_event is None
+    assert all(e.callback != sim._reset_after_goal for e in sim.scheduler.pending())
+
+
+def test_describe():
+    assert describe(2, 1, 2, PLAY, 462.0) == "Green 2 – 1 Blue   2nd half 07:42"
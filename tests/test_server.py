@@ -0,0 +1,68 @@
+# tests/test_server.py
+
+import asyncio
+
+from client import MatchClient
+from server import KEY_BITS, MatchServer, keys_to_mask, mask_to_keys
+
+
+def test_key_masks():
+    assert mask_to_keys(keys_to_mask({"Up", "space"})) == {"Up", "space"}
+    assert keys_to_mask(set(KEY_BITS)) == (1 << len(KEY_BITS)) - 1
+
+
+def test_clients_play_and_close_cleanly(make_sim):
+    sim = make_sim()
+    server = MatchServer(sim)
+    green, blue, extra = MatchClient("green"), MatchClient("blue"), MatchClient("green")
+
+    async def go():
+        port = await server.start()
+        for c in (green, blue, extra):
+            await c.connect(port=port)
+        assert extra.role == "spectator"            # green already has its human
+        assert set(sim.controlled) == {"green", "blue"} and None not in sim.controlled.values()
+
+        receivers = [asyncio.ensure_future(c.receive()) for c in (green, blue, extra)]
+        for _ in range(10):
+            green.send_input({"Up"})
+            blue.send_input(set())
+            extra.send_input(set())
+            await asyncio.sleep(0)
+            server.step()
+            await asyncio.sleep(0.01)
+        assert len(server.handlers) == 3
+
+        await server.close()                         # clients still connected
+        assert not server.handlers and not server.sessions
+        assert sim.controlled == {"green": None, "blue": None}
+        await asyncio.wait_for(asyncio.gather(*receivers), 1.0)    # they see the hang-up
+        for c in (green, blue, extra):
+            c.close()
+
+    asyncio.run(go())
+    for c in (green, blue, extra):
+        assert c.snapshots >= 8 and c.state is not None
+        assert c.full >= 1
+        assert c.snapshots > c.full                  # later ones were deltas
+    assert green.predicted is not None and extra.predicted is None
+    assert green.state.tick == sim.tick
+
+
+def test_only_the_carriers_human_can_drop_the_puck(make_sim):
+    sim = make_sim()
+    sim.enable_human("green")
+    sim.enable_human("blue")
+    sim.run_until(0.5)
+    carrier = next(p for p in sim.players.values() if p.color == "blue" and p is not sim.controlled["blue"])
+    sim.contest_puck = lambda: None                 # nobody wins or loses it any other way
+    sim.possessing_player = carrier
+    sim.press_key("d", "green")                     # green can't knock it off a blue player
+    sim.advance(sim.dt)
+    assert sim.possessing_player is carrier
+
+    sim.release_key("d", "green")
+    sim.possessing_player = sim.controlled["blue"]
+    sim.press_key("d", "blue")
+    sim.advance(sim.dt)
+    assert sim.possessing_player is None
@@ -0,0 +1,71 @@
+# tests/test_snapcodec.py
+
+import math
+
+import pytest
+
+import snapcodec
+
+
+def _states(sim, seconds):
+    """One captured WorldState per tick."""
+    out = []
+    for _ in range(int(seconds / sim.dt)):
+        sim.advance(sim.dt)
+        out.append(snapcodec.capture(sim))
+    return out
+
+
+def test_quantisation_round_trips():
+    for v in (0.0, 12.3, -4.06, 700.0):
+        assert abs(snapcodec.dq_pos(snapcodec.q_pos(v)) - v) <= 0.5 / snapcodec.POS_SCALE
+    for a in (0.0, 1.0, -1.0, 7.0):
+        back = snapcodec.dq_angle(snapcodec.q_angle(a))
+        assert abs(math.remainder(back - a, 2 * math.pi)) < 1e-4
+    assert snapcodec.dq_time(snapcodec.q_time(None)) is None
+    assert abs(snapcodec.dq_time(snapcodec.q_time(1.2345)) - 1.2345) <= 0.5 / snapcodec.TIME_SCALE
+
+
+def test_full_frames_round_trip(make_sim):
+    sim = make_sim()
+    state = _states(sim, 1.0)[-1]
+    data = snapcodec.encode(state, input_ack=7)
+    assert data[:1] == snapcodec.FULL
+    assert len(data) == snapcodec.max_message_size(len(state.players))
+    assert snapcodec.decode(data, {}) == (state, 7)
+    assert snapcodec.unpack(snapcodec.pack(state)) == state
+
+
+def test_deltas_round_trip_and_are_smaller(make_sim):
+    sim = make_sim()
+    states = _states(sim, 5.0)
+    bases = {states[0].tick: states[0]}
+    base = states[0]
+    for i, state in enumerate(states[1:], 1):
+        data = snapcodec.encode(state, base, input_ack=i)
+        assert len(data) <= snapcodec.max_message_size(len(state.players))
+        assert snapcodec.decode(data, bases) == (state, i)
+        bases[state.tick] = state
+        if i % 10 == 0:
+            base = state                     # the receiver acked a newer one
+    one_tick = snapcodec.encode(states[-1], states[-2])
+    assert one_tick[:1] == snapcodec.DELTA
+    assert len(one_tick) < len(snapcodec.encode(states[-1])) / 2
+
+
+def test_unchanged_state_is_an_empty_delta(make_sim):
+    sim = make_sim()
+    state = _states(sim, 0.5)[-1]
+    data = snapcodec.encode(state, state)
+    assert data[:1] == snapcodec.DELTA
+    assert len(data) == snapcodec._MESSAGE.size + snapcodec._mask_size(len(state.players))
+    assert snapcodec.decode(data, {state.tick: state})[0] == state
+
+
+def test_delta_needs_its_base(make_sim):
+    sim = make_sim()
+    a, b = _states(sim, 0.1)
+    with pytest.raises(KeyError):
+        snapcodec.decode(snapcodec.encode(b, a), {})
+    other = a._replace(players=a.players[:-1])      # roster changed: no delta possible
+    assert snapcodec.encode(b, other)[:1] == snapcodec.FULL
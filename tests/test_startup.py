@@ -0,0 +1,16 @@
+# tests/test_startup.py
+
+import pytest
+
+import startup
+
+
+def test_headless_modules_do_not_load_tk():
+    leaks = [m for m in startup.HEADLESS if startup.measure(m, runs=1)[1]]
+    assert leaks == []
+
+
+def test_the_gui_is_flagged():
+    pytest.importorskip("tkinter")
+    ms, gui = startup.measure("game", runs=1)
+    assert ms > 0 and "tkinter" in gui
@@ -0,0 +1,44 @@
+# tests/test_telemetry.py
+
+import csv
+
+from telemetry import COLUMNS, CsvSink, RingBuffer, TelemetryStream
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write_batch(self, columns):
+        self.batches.append(columns)
+
+    def close(self):
+        self.closed = True
+
+
+def test_ring_buffer_drops_the_oldest():
+    ring = RingBuffer(4)
+    ring.push_many(range(3))
+    assert ring.drain() == [0, 1, 2] and len(ring) == 0
+    ring.push_many(range(10, 16))
+    assert ring.dropped == 2
+    assert ring.drain() == [12, 13, 14, 15]       # wrapped around the end
+
+
+def test_every_tick_is_recorded(make_sim, tmp_path):
+    path = str(tmp_path / "t.csv")
+    sink = ListSink()
+    stream = TelemetryStream([sink, CsvSink(path)], batch_rows=64, flush_interval=0.01)
+    sim = make_sim(telemetry=stream)
+    sim.run_until(2.0)
+    stream.close()
+    assert sink.closed and stream.dropped == 0
+
+    ticks = [t for batch in sink.batches for t in batch["tick"]]
+    assert len(ticks) == sim.tick * len(sim.players)
+    assert ticks == sorted(ticks) and ticks[-1] == sim.tick
+    assert all(set(batch) == set(COLUMNS) for batch in sink.batches)
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == COLUMNS and len(rows) == len(ticks) + 1
@@ -0,0 +1,82 @@
+# tests/test_trajectories.py
+#
+# Short seeded headless matches. Each seed must play the match recorded in
+# trajectories.json, and a restored checkpoint must carry on exactly as the
+# original did. If a change is meant to alter play, rerun with
+# RECORD_TRAJECTORIES=1 to write the new trace, and say why in the commit.
+
+import json
+import os
+
+import pytest
+
+import checkpoint
+
+TICKS = 300
+SEEDS = (0, 7)
+EVERY = 20    # ticks between recorded positions
+TOL = 1e-3    # px (and m, rad): Python versions differ in the last bits of math.hypot
+TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trajectories.json")
+
+
+def trajectory(sim, ticks=TICKS):
+    """Per tick: the puck, who holds it, the goals and every player's state."""
+    out = []
+    for _ in range(ticks):
+        sim.advance(sim.dt)
+        holder = sim.possessing_player
+        out.append((
+            sim.tick, sim.puck_x, sim.puck_y,
+            holder.unique_id if holder is not None else None,
+            tuple(sim.scoreboard.goals.values()),
+            tuple((uid, p.x, p.y, p.angle, p.depth, p.short_term_stamina)
+                  for uid, p in sorted(sim.players.items())),
+        ))
+    return out
+
+
+def trace(traj) -> dict:
+    """What is recorded: who held the puck and the score every tick, positions every EVERY ticks."""
+    return {
+        "holders": [row[3] for row in traj],
+        "goals":   [list(row[4]) for row in traj],
+        "samples": [[row[0], round(row[1], 4), round(row[2], 4),
+                     [[uid, *(round(v, 4) for v in rest)] for uid, *rest in row[5]]]
+                    for row in traj[EVERY - 1::EVERY]],
+    }
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_seeded_matches_play_as_recorded(make_sim, seed):
+    got = trace(trajectory(make_sim(seed)))
+    if os.environ.get("RECORD_TRAJECTORIES"):
+        recorded = {}
+        if os.path.exists(TRACE_FILE):
+            with open(TRACE_FILE) as f:
+                recorded = json.load(f)
+        recorded[str(seed)] = got
+        with open(TRACE_FILE, "w") as f:
+            json.dump(recorded, f, separators=(",", ":"))
+        pytest.skip("recorded")
+    with open(TRACE_FILE) as f:
+        want = json.load(f)[str(seed)]
+
+    assert got["holders"] == want["holders"]
+    assert got["goals"] == want["goals"]
+    for g, w in zip(got["samples"], want["samples"]):
+        tick = w[0]
+        assert g[0] == tick
+        assert g[1:3] == pytest.approx(w[1:3], abs=TOL), f"tick {tick}: puck"
+        for gp, wp in zip(g[3], w[3]):
+            assert gp == pytest.approx(wp, abs=TOL), f"tick {tick}: player {wp[0]}"
+    assert len(got["samples"]) == len(want["samples"])
+
+
+def test_checkpoint_restore_carries_on(make_sim):
+    sim = make_sim(3)
+    sim.run_until(10.0)
+    state = checkpoint.capture(sim)       # carries the pass-lane cache too
+    want = trajectory(sim, 200)
+
+    restored = checkpoint.restore(state)
+    assert trajectory(restored, 200) == want